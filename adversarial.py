@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+
+# ----------------------------
+# Adversarial scenario search and the worst-case regression corpus
+# ----------------------------
+# A steady-state genetic search over starting configurations of one grid
+# size and one amount of dirt, scored by running them in the headless
+# simulator: the worst scenarios are those that stall (do not complete within
+# the cycle limit, e.g. deadlocks) and, among those that complete, the ones
+# that take the most cycles. Keeping n and the dirt count fixed makes cycles
+# comparable, so the search finds bad layouts rather than just more work.
+#   mutation:   move an actor anywhere / to a neighbouring cell, turn it,
+#               move a dirt cell anywhere / to a neighbouring cell, or flip
+#               its colour
+#   crossover:  the actors of one parent with the dirt of the other
+#
+# The worst scenarios found are kept in a JSON corpus keyed like the suite
+# baseline ("<part>/n=<n>/<digest>"), each with the scenario and the result
+# it was recorded with (one per actor placement, as the search tends to find
+# many near-copies of the same failure), so that they can be re-run as a
+# regression check (benchmarks.py corpus) and fixes to tail cases show up as
+# improvements. The corpus found for part A at n=5 and n=10 is committed as
+# adversarial_corpus.json, next to this module.
+
+import hashlib
+import json
+import os
+import random
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from vwsim import ACTOR_COLOURS, ORIENTATIONS, Coord, Scenario, random_scenario
+
+Evaluate = Callable[[Scenario], Dict[str, object]]
+Severity = Tuple[int, int]
+Found = Tuple[Severity, Scenario, Dict[str, object]]
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "adversarial_corpus.json")
+
+
+def severity(result: Dict[str, object]) -> Severity:
+    """Stalled runs rank above any run that completes, then more cycles rank higher."""
+    return (0 if result["completed"] else 1, int(result["cycles"]))
+
+
+def scenario_digest(scenario: Scenario) -> str:
+    return hashlib.sha1(json.dumps(scenario.to_dict(), sort_keys=True).encode()).hexdigest()[:12]
+
+
+# ----------------------------
+# Mutation and crossover
+# ----------------------------
+def _free_cells(scenario: Scenario, exclude: Optional[str] = None) -> List[Coord]:
+    taken = {(x, y) for colour, (x, y, _) in scenario.actors.items() if colour != exclude}
+    return [(x, y) for x in range(scenario.n) for y in range(scenario.n) if (x, y) not in taken]
+
+
+def _neighbours(n: int, cell: Coord) -> List[Coord]:
+    x, y = cell
+    return [(cx, cy) for cx, cy in ((x, y - 1), (x + 1, y), (x, y + 1), (x - 1, y)) if 0 <= cx < n and 0 <= cy < n]
+
+
+def mutate(scenario: Scenario, rng: random.Random) -> Scenario:
+    """A copy of scenario with one random change; n and the dirt count are kept."""
+    child = Scenario(scenario.n, scenario.dirt, scenario.actors)
+    kinds = ["move_actor", "step_actor", "turn_actor"]
+    if child.dirt:
+        kinds += ["move_dirt", "shift_dirt", "recolour_dirt"]
+    kind = rng.choice(kinds)
+
+    if kind in ("move_actor", "step_actor", "turn_actor"):
+        colour = rng.choice(ACTOR_COLOURS)
+        x, y, orientation = child.actors[colour]
+        if kind == "turn_actor":
+            child.actors[colour] = (x, y, rng.choice([o for o in ORIENTATIONS if o != orientation]))
+            return child
+        free = set(_free_cells(child, exclude=colour)) - {(x, y)}
+        options = sorted(free) if kind == "move_actor" else [c for c in _neighbours(child.n, (x, y)) if c in free]
+        if options:
+            nx, ny = rng.choice(options)
+            child.actors[colour] = (nx, ny, orientation)
+        return child
+
+    cell = rng.choice(sorted(child.dirt))
+    if kind == "recolour_dirt":
+        child.dirt[cell] = "green" if child.dirt[cell] == "orange" else "orange"
+        return child
+    clean = [(x, y) for x in range(child.n) for y in range(child.n) if (x, y) not in child.dirt]
+    options = clean if kind == "move_dirt" else [c for c in _neighbours(child.n, cell) if c not in child.dirt]
+    if options:
+        child.dirt[rng.choice(options)] = child.dirt.pop(cell)
+    return child
+
+
+def crossover(actors_from: Scenario, dirt_from: Scenario) -> Scenario:
+    return Scenario(actors_from.n, dirt_from.dirt, actors_from.actors)
+
+
+# ----------------------------
+# Search
+# ----------------------------
+def initial_population(n: int, density: float, size: int, rng: random.Random) -> List[Scenario]:
+    """Uniform random scenarios (every other one with the adversarial start), all with the same dirt count."""
+    return [random_scenario(n, density, rng.randrange(1 << 30), start="adversarial" if i % 2 else "random")
+            for i in range(size)]
+
+
+def search(n: int, evaluate: Evaluate, density: float = 0.1, population: int = 12, generations: int = 15,
+           seed: int = 0, crossover_rate: float = 0.3, verbose: bool = True) -> List[Found]:
+    """
+    Evolve scenarios towards the highest severity() under evaluate (which runs
+    one scenario and returns a dict with cycles and completed). Returns the
+    distinct scenarios evaluated, most severe first.
+    """
+    rng = random.Random(seed)
+    evaluated: Dict[str, Found] = {}
+
+    def score(scenario: Scenario) -> Found:
+        digest = scenario_digest(scenario)
+        if digest not in evaluated:
+            result = evaluate(scenario)
+            evaluated[digest] = (severity(result), scenario, result)
+        return evaluated[digest]
+
+    pool = sorted((score(s) for s in initial_population(n, density, population, rng)), key=lambda f: f[0], reverse=True)
+    for generation in range(generations):
+        offspring = []
+        for _ in range(population):
+            # Binary tournaments: the more severe of two random members is a parent
+            first = max(rng.sample(pool, min(2, len(pool))), key=lambda f: f[0])[1]
+            if rng.random() < crossover_rate:
+                second = max(rng.sample(pool, min(2, len(pool))), key=lambda f: f[0])[1]
+                child = crossover(first, second)
+            else:
+                child = mutate(first, rng)
+            offspring.append(score(child))
+        distinct = {scenario_digest(f[1]): f for f in pool + offspring}
+        pool = sorted(distinct.values(), key=lambda f: f[0], reverse=True)[:population]
+        if verbose:
+            worst = pool[0][2]
+            stalled = sum(1 for f in pool if not f[2]["completed"])
+            print(f"n={n} generation {generation + 1:>3}: worst {worst['cycles']} cycles"
+                  f"{'' if worst['completed'] else ' (stalled)'}, {stalled} stalled in population,"
+                  f" {len(evaluated)} scenarios evaluated")
+    return sorted(evaluated.values(), key=lambda f: f[0], reverse=True)
+
+
+# ----------------------------
+# Corpus
+# ----------------------------
+def load_corpus(path: str) -> Dict[str, Dict[str, object]]:
+    """The corpus at path, or an empty one to add to if there is no file yet."""
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_corpus(path: str, corpus: Dict[str, Dict[str, object]]) -> None:
+    with open(path, "w") as f:
+        json.dump(corpus, f, indent=1, sort_keys=True)
+
+
+def add_to_corpus(corpus: Dict[str, Dict[str, object]], part: str, found: List[Found], keep: int) -> List[str]:
+    """
+    Merge the keep most severe of found, at most one per actor placement, into
+    the corpus for part and their grid size, dropping less severe entries
+    beyond keep. Returns the new keys.
+    """
+    added: List[str] = []
+    starts = {json.dumps(entry["scenario"]["actors"], sort_keys=True) for key, entry in corpus.items()
+              if key.startswith(f"{part}/")}
+    sizes: Set[int] = set()
+    for _, scenario, result in found:
+        if len(added) == keep:
+            break
+        # Near-copies of one failure differ only in the dirt: keep one per start
+        start = json.dumps(scenario.to_dict()["actors"], sort_keys=True)
+        if start in starts:
+            continue
+        starts.add(start)
+        sizes.add(scenario.n)
+        key = f"{part}/n={scenario.n}/{scenario_digest(scenario)}"
+        added.append(key)
+        corpus[key] = dict(result, scenario=scenario.to_dict())
+
+    for n in sizes:
+        prefix = f"{part}/n={n}/"
+        keys = sorted((k for k in corpus if k.startswith(prefix)), key=lambda k: severity(corpus[k]), reverse=True)
+        for key in keys[keep:]:
+            del corpus[key]
+            if key in added:
+                added.remove(key)
+    return added
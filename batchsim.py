@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+
+# ----------------------------
+# Lockstep batched simulator for many small environments (NumPy)
+# ----------------------------
+# Advances B independent n x n environments one cycle at a time, all in the
+# same NumPy operations: positions and orientations are (B, 3) arrays, dirt
+# and every per-agent map are (B, n, n) planes, and the rules are looked up
+# in the compiled policy tables of partA.py (WHITE_POLICY, CLEANER_POLICY),
+# turned into dense arrays indexed by the batched state. The cost of a cycle
+# is a few dozen array operations whatever B is, so for parameter sweeps it
+# simulates far more cycles per second than one mind object per environment.
+#
+# It runs a model of the part A team with the default strategies (frontier
+# exploration, nearest cleaning, opportunistic cleaning by white, cooperative
+# exploration off) but cleaners that never yield to each other: the minds'
+# yielding=False, not their default. Priority yielding depends on the intent
+# messages exchanged next to other actors and is not modelled, so
+# BatchSimulator must be given yielding=False explicitly, and its cycle
+# counts describe that team only. What the minds learn from the other
+# messages is derived from the world instead:
+#   - the map reaches orange and green on the cycle after white broadcasts it
+#   - a cell cleaned on one cycle is known to be clean to every agent on the
+#     next, which is when the "cleaned" broadcast arrives
+# Ties between equally near targets go, as in target_index, to the cell added
+# first. White's detours around the actors it has seen are the one per-
+# environment step: they come from partA.exploration_heading() itself, and
+# only for the few environments with an actor between white and its target.
+# benchmarks.py batch and test_batchsim.py compare its cycle counts with
+# vwsim.py running partA minds built with yielding=False.
+#
+# NumPy is needed here; without it use vwsim.py.
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:     # pragma: no cover - depends on the environment
+    np = None
+
+from dimensions import perception_offsets
+from partA import (CLEANER_POLICY, CLEANING_AGENTS, OPPORTUNISTIC_CLEAN_COST, ORIENTATION_INDEX, WHITE_PHASE_INDEX,
+                   WHITE_POLICY, exploration_heading)
+from partA import ORIENTATIONS as MIND_ORIENTATIONS
+from policy_table import MOVE, TURN_LEFT, TURN_RIGHT, IDLE, FREE, ACTOR, WALL, PolicyTable
+from vwsim import ACTOR_COLOURS, ORIENTATIONS, Scenario, SimResult
+
+NUMPY_AVAILABLE: bool = np is not None
+
+CLEAN: int = 4                      # action code next to policy_table's MOVE/TURN_LEFT/TURN_RIGHT/IDLE
+DIRT_CODES: Dict[str, int] = {"orange": 1, "green": 2}
+UNSET: int = 1 << 60                # key of cells not in a target set
+# Perceived cells in ObservationSnapshot.cells() order
+VIEW_SLOTS: Tuple[str, ...] = ("center", "forward", "left", "right", "forwardleft", "forwardright")
+# Arrays with one row per environment still running
+PER_ENV_FIELDS: Tuple[str, ...] = ("x", "y", "orient", "dirt", "observed", "discovered", "actor_seen",
+                                   "size_lower", "size_upper",
+                                   "frontier", "unobserved", "stage", "cleaning", "mapped", "map_cycle",
+                                   "just_turned", "turn", "clean_cost", "completed_cycle", "ids")
+_DX = (0, 1, 0, -1)                 # north, east, south, west
+_DY = (-1, 0, 1, 0)
+
+
+def policy_arrays(table: PolicyTable) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+    """A compiled policy as dense arrays of action, just_turned and turn direction, indexed by the state."""
+    action = np.zeros(table.domains, dtype=np.int64)
+    just_turned = np.zeros(table.domains, dtype=np.int64)
+    turn = np.zeros(table.domains, dtype=np.int64)
+    for state, decision in table.items():
+        action[state], just_turned[state], turn[state] = decision[0], int(decision[1]), decision[2]
+    return action, just_turned, turn
+
+
+class BatchSimulator:
+    """
+    All scenarios must have the same n. clean_cost is white's
+    OPPORTUNISTIC_CLEAN_COST, per environment. yielding must be False: the
+    cleaners of the model never yield, unlike the default minds.
+    """
+
+    def __init__(self, scenarios: Sequence[Scenario], clean_cost: object = OPPORTUNISTIC_CLEAN_COST,
+                 yielding: Optional[bool] = None) -> None:
+        if np is None:
+            raise RuntimeError("BatchSimulator needs NumPy; use vwsim.VWSimulator without it")
+        if yielding is not False:
+            raise ValueError("BatchSimulator models cleaners that never yield: pass yielding=False, "
+                             "or use vwsim.VWSimulator for the default (yielding) minds")
+        sizes = {s.n for s in scenarios}
+        if len(sizes) != 1:
+            raise ValueError(f"all scenarios in a batch must have the same n, got {sorted(sizes)}")
+        n = self.n = sizes.pop()
+        B = self.size = len(scenarios)
+        self.clean_cost = np.broadcast_to(np.asarray(clean_cost, dtype=float), (B,)).copy()
+
+        self.x = np.array([[s.actors[c][0] for c in ACTOR_COLOURS] for s in scenarios], dtype=np.int64)
+        self.y = np.array([[s.actors[c][1] for c in ACTOR_COLOURS] for s in scenarios], dtype=np.int64)
+        self.orient = np.array([[ORIENTATIONS.index(s.actors[c][2]) for c in ACTOR_COLOURS] for s in scenarios],
+                               dtype=np.int64)
+        self.dirt = np.zeros((B, n, n), dtype=np.int8)          # indexed [env, x, y]
+        for b, s in enumerate(scenarios):
+            for (dx, dy), colour in s.dirt.items():
+                self.dirt[b, dx, dy] = DIRT_CODES[colour]
+
+        # White: cells observed, when each dirt cell was first seen (insertion
+        # order of the dirt map), grid size bounds and the unobserved cells of
+        # the frontier zigzag keyed by insertion order. The unobserved plane is
+        # one cell larger: while n is unknown the frontier can reach past it.
+        self.observed = np.zeros((B, n, n), dtype=bool)
+        self.discovered = np.full((B, n, n), UNSET, dtype=np.int64)
+        self.actor_seen = np.zeros((B, n, n), dtype=bool)       # white's actor_cells
+        self.size_lower = np.ones(B, dtype=np.int64)
+        self.size_upper = np.full(B, UNSET, dtype=np.int64)
+        self.frontier = np.zeros(B, dtype=np.int64)
+        self.unobserved = np.full((B, n + 1, n + 1), UNSET, dtype=np.int64)
+        self.stage = np.zeros(B, dtype=np.int64)
+        self.cleaning = np.zeros(B, dtype=bool)                 # white's phase: zigzag, then cleaning
+        self.mapped = np.zeros((B, n, n), dtype=bool)           # the broadcast map
+        self.map_cycle = np.full(B, -1, dtype=np.int64)
+        self.just_turned = np.zeros((B, 3), dtype=np.int64)
+        self.turn = np.zeros(B, dtype=np.int64)
+
+        self.cycle: int = 0
+        self.completed_cycle = np.full(B, -1, dtype=np.int64)
+        # Finished environments are dropped from the arrays (see _compact());
+        # ids maps the rows left to their scenario, results keeps every scenario's
+        self.ids = np.arange(B)
+        self.scenarios: int = B
+        self._finished = np.full(B, -1, dtype=np.int64)
+
+        self._white_policy = policy_arrays(WHITE_POLICY)
+        self._cleaner_policy = policy_arrays(CLEANER_POLICY)
+        self._offsets = np.array([[(0, 0)] + [perception_offsets(o)[slot] for slot in VIEW_SLOTS[1:]]
+                                  for o in ORIENTATIONS], dtype=np.int64)       # (orientation, slot, xy)
+        self._env = np.arange(B)
+        grid = np.arange(n + 1)
+        self._gx, self._gy = np.meshgrid(grid, grid, indexing="ij")
+        self._gmax = np.maximum(self._gx, self._gy)
+
+    # --- helpers ---
+    def _nearest(self, rows: "np.ndarray", keys: "np.ndarray", x: "np.ndarray", y: "np.ndarray"
+                 ) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+        """
+        For the environments in rows, the cell with the smallest (distance,
+        key) among keys != UNSET (keys holds those rows only). Returns found,
+        tx, ty over the whole batch; other environments are not found.
+        """
+        found = np.zeros(self.size, dtype=bool)
+        tx = np.zeros(self.size, dtype=np.int64)
+        ty = np.zeros(self.size, dtype=np.int64)
+        if not len(rows):
+            return found, tx, ty
+        width = keys.shape[1]
+        gx, gy = self._gx[:width, :width], self._gy[:width, :width]
+        dist = np.abs(gx[None] - x[rows, None, None]) + np.abs(gy[None] - y[rows, None, None])
+        member = keys != UNSET
+        scale = int(np.where(member, keys, 0).max()) + 1        # the distance dominates the key
+        rank = np.where(member, dist * scale + keys, UNSET).reshape(len(rows), -1)
+        best = np.argmin(rank, axis=1)
+        found[rows] = rank[np.arange(len(rows)), best] != UNSET
+        tx[rows], ty[rows] = best // width, best % width
+        return found, tx, ty
+
+    @staticmethod
+    def _heading(dx: "np.ndarray", dy: "np.ndarray", orient: "np.ndarray", x_first: bool) -> "np.ndarray":
+        along_x = dx != 0 if x_first else (np.abs(dx) >= np.abs(dy)) & (dx != 0)
+        vertical = np.where(dy > 0, 2, np.where(dy < 0, 0, orient))
+        return np.where(along_x, np.where(dx > 0, 1, 3), vertical)
+
+    def _detour(self, rows: "np.ndarray", found: "np.ndarray", tx: "np.ndarray", ty: "np.ndarray",
+                known: "np.ndarray") -> Dict[int, int]:
+        """
+        White's heading where a cell it saw an actor in lies between it and its
+        target, from partA.exploration_heading() one environment at a time (few
+        are). Targets with no path are given up as in WhiteMind, updating found,
+        tx and ty. Returns environment -> orientation index.
+        """
+        if not len(rows):
+            return {}
+        n = self.n
+        wx, wy = self.x[:, 0], self.y[:, 0]
+        gx, gy = self._gx[None, :n, :n], self._gy[None, :n, :n]
+        box = (gx >= np.minimum(wx, tx)[rows, None, None]) & (gx <= np.maximum(wx, tx)[rows, None, None]) & \
+            (gy >= np.minimum(wy, ty)[rows, None, None]) & (gy <= np.maximum(wy, ty)[rows, None, None])
+        headings: Dict[int, int] = {}
+        for b in rows[(box & self.actor_seen[rows]).reshape(len(rows), -1).any(axis=1)]:
+            x, y = int(wx[b]), int(wy[b])
+            cells = {(int(cx), int(cy)) for cx, cy in zip(*np.nonzero(self.actor_seen[b]))}
+            extent = max(int(self.size_lower[b] if known[b] else self.frontier[b]), x + 1, y + 1)
+            while True:
+                heading = exploration_heading(x, y, (int(tx[b]), int(ty[b])), MIND_ORIENTATIONS[self.orient[b, 0]],
+                                              cells, extent, bool(known[b]))
+                if heading is not None:
+                    headings[int(b)] = ORIENTATION_INDEX[heading]
+                    break
+                self.unobserved[b, tx[b], ty[b]] = UNSET
+                self.observed[b, tx[b], ty[b]] = True
+                again, nx, ny = self._nearest(np.array([b]), self.unobserved[[b]], wx, wy)
+                found[b], tx[b], ty[b] = again[b], nx[b], ny[b]
+                if not found[b]:
+                    break
+        return headings
+
+    # --- one cycle ---
+    def step(self) -> None:
+        n, env, t = self.n, self._env, self.cycle
+        active = self.completed_cycle < 0
+
+        # Perception: every agent's six cells, whether they are in the grid,
+        # and the state of forward/left/right for the rules
+        off = self._offsets[self.orient]                        # (B, 3, 6, 2)
+        vx = self.x[:, :, None] + off[..., 0]
+        vy = self.y[:, :, None] + off[..., 1]
+        inside = (vx >= 0) & (vx < n) & (vy >= 0) & (vy < n)
+        cx, cy = np.clip(vx, 0, n - 1), np.clip(vy, 0, n - 1)
+        occupied = np.zeros((self.size, n, n), dtype=bool)
+        occupied[env[:, None], self.x, self.y] = True
+        seen_actor = occupied[env[:, None, None], cx, cy] & inside
+        cells = np.where(~inside, WALL, np.where(seen_actor, ACTOR, FREE))     # (B, 3, 6)
+        fwd, left, right = cells[..., 1], cells[..., 2], cells[..., 3]
+
+        # --- White: revise ---
+        wx, wy = self.x[:, 0], self.y[:, 0]
+        win, wcx, wcy = inside[:, 0], cx[:, 0], cy[:, 0]
+        for slot in range(len(VIEW_SLOTS)):
+            rows = env[win[:, slot]]
+            px, py = wcx[rows, slot], wcy[rows, slot]
+            new_dirt = (self.dirt[rows, px, py] > 0) & (self.discovered[rows, px, py] == UNSET)
+            self.discovered[rows[new_dirt], px[new_dirt], py[new_dirt]] = t * len(VIEW_SLOTS) + slot
+            self.observed[rows, px, py] = True
+            self.unobserved[rows, px, py] = UNSET
+            self.actor_seen[rows, px, py] = seen_actor[rows, 0, slot] if slot else False
+
+        # Grid size: perceived cells are inside, missing ones with x, y >= 0 past the east/south wall
+        lower = np.maximum(np.where(win, np.maximum(vx[:, 0], vy[:, 0]) + 1, 0).max(axis=1), self.size_lower)
+        self.size_lower = np.maximum(lower, np.maximum(wx, wy) + 1)
+        past = ~win & (vx[:, 0] >= 0) & (vy[:, 0] >= 0)
+        was_known = self.size_upper <= self.size_lower
+        self.size_upper = np.minimum(self.size_upper,
+                                     np.where(past, np.maximum(vx[:, 0], vy[:, 0]), UNSET).min(axis=1))
+        known = self.size_upper <= self.size_lower
+
+        # Grow the unobserved cells of the zigzag, rebuilt over the grid once n is known
+        inferred = known & ~was_known
+        self.unobserved[inferred] = UNSET
+        self.frontier[inferred] = 0
+        zig = ~self.cleaning
+        extent = np.where(known, self.size_lower, self.size_lower + 1)
+        rows = env[zig & (extent != self.frontier)]
+        if len(rows):
+            limit = extent[rows, None, None]
+            inside_extent = (self._gx[None] < limit) & (self._gy[None] < limit)
+            observed = np.zeros((len(rows), n + 1, n + 1), dtype=bool)
+            observed[:, :n, :n] = self.observed[rows]
+            # New cells are added ring by ring in x-major order, after those already there
+            grow = (limit > self.frontier[rows, None, None]) & inside_extent & \
+                (self._gmax[None] >= self.frontier[rows, None, None]) & ~observed
+            order = self.stage[rows, None, None] * (n + 1) ** 2 + self._gx * (n + 1) + self._gy
+            unobserved = np.where(grow, order, self.unobserved[rows])
+            unobserved[~inside_extent] = UNSET
+            self.unobserved[rows] = unobserved
+            self.stage[rows] += extent[rows] > self.frontier[rows]
+            self.frontier[rows] = extent[rows]
+
+        # --- White: decide ---
+        action = np.full((self.size, 3), IDLE, dtype=np.int64)
+        here = self.dirt[env, wx, wy] > 0
+        opportunistic = zig & here
+        if opportunistic.any():
+            # should_clean_during_exploration: isolated dirt, or a detour worth more than the clean
+            rows = env[opportunistic]
+            others = (self.dirt[rows] > 0) & (self.discovered[rows] != UNSET)
+            others[np.arange(len(rows)), wx[rows], wy[rows]] = False
+            dist = np.abs(self._gx[None, :n, :n] - wx[rows, None, None]) + \
+                np.abs(self._gy[None, :n, :n] - wy[rows, None, None])
+            detour = np.where(others, dist, UNSET).reshape(len(rows), -1).min(axis=1)
+            worth = (detour == UNSET) | ((1 + detour) / CLEANING_AGENTS > self.clean_cost[rows])
+            opportunistic[rows] = worth
+        action[opportunistic, 0] = CLEAN
+
+        exploring = zig & ~opportunistic
+        rows = env[exploring]
+        found, tx, ty = self._nearest(rows, self.unobserved[rows], wx, wy)
+        # While n is unknown, the ring cell straight along the longer axis (WhiteMind.exploration_target)
+        ring = self.frontier - 1
+        ax, ay = np.where(wx >= wy, ring, wx), np.where(wx >= wy, wy, ring)
+        axis = exploring & ~known & (self.unobserved[env, ax, ay] != UNSET)
+        found |= axis
+        tx, ty = np.where(axis, ax, tx), np.where(axis, ay, ty)
+        detour = self._detour(env[exploring & found], found, tx, ty, known)
+        zigzag = exploring & found
+        broadcast = exploring & ~found
+        if broadcast.any():
+            self.cleaning |= broadcast
+            self.map_cycle[broadcast] = t
+            self.mapped[broadcast] = (self.dirt[broadcast] > 0) & (self.discovered[broadcast] != UNSET)
+
+        white_state = np.where(self.cleaning, WHITE_PHASE_INDEX["cleaning"], WHITE_PHASE_INDEX["zigzag"])
+        desired = self._heading(tx - wx, ty - wy, self.orient[:, 0], x_first=False)
+        for b, heading in detour.items():
+            desired[b] = heading
+
+        cleaning = self.cleaning & ~opportunistic
+        action[cleaning & here, 0] = CLEAN
+        rows = env[cleaning & ~here]
+        remaining = np.where(self.mapped[rows] & (self.dirt[rows] > 0), self.discovered[rows], UNSET)
+        moving, dx, dy = self._nearest(rows, remaining, wx, wy)
+        desired = np.where(moving, self._heading(dx - wx, dy - wy, self.orient[:, 0], x_first=True), desired)
+        ruled = zigzag | moving
+        state = (white_state, self.orient[:, 0], desired, fwd[:, 0], left[:, 0], right[:, 0],
+                 self.just_turned[:, 0], self.turn)
+        codes, turned, turn = (table[state] for table in self._white_policy)
+        action[ruled, 0] = codes[ruled]
+        self.just_turned[ruled, 0] = turned[ruled]
+        self.turn[ruled] = turn[ruled]
+
+        # --- Orange and green ---
+        rows = env[(self.map_cycle >= 0) & (self.map_cycle < t)]        # map received
+        for a in (1, 2):
+            ax, ay = self.x[:, a], self.y[:, a]
+            targets = np.where(self.mapped[rows] & (self.dirt[rows] == a), self.discovered[rows], UNSET)
+            busy, tx, ty = self._nearest(rows, targets, ax, ay)
+            on_own = busy & (self.dirt[env, ax, ay] == a)
+            action[on_own, a] = CLEAN
+            moving = busy & ~on_own
+            desired = self._heading(tx - ax, ty - ay, self.orient[:, a], x_first=True)
+            state = (self.orient[:, a], desired, fwd[:, a], left[:, a], right[:, a], self.just_turned[:, a])
+            codes, turned, _ = (table[state] for table in self._cleaner_policy)
+            action[moving, a] = codes[moving]
+            self.just_turned[moving, a] = turned[moving]
+
+        # --- Execute in actor order; finished environments stand still ---
+        action[~active] = IDLE
+        for a in range(3):
+            code = action[:, a]
+            self.orient[:, a] = (self.orient[:, a] + (code == TURN_RIGHT) - (code == TURN_LEFT)) % 4
+            mx = self.x[:, a] + np.take(_DX, self.orient[:, a])
+            my = self.y[:, a] + np.take(_DY, self.orient[:, a])
+            free = (code == MOVE) & (mx >= 0) & (mx < n) & (my >= 0) & (my < n)
+            for other in range(3):
+                if other != a:
+                    free &= (self.x[:, other] != mx) | (self.y[:, other] != my)
+            self.x[free, a], self.y[free, a] = mx[free], my[free]
+            rows = env[code == CLEAN]
+            px, py = self.x[rows, a], self.y[rows, a]
+            if a == 0:
+                self.dirt[rows, px, py] = 0
+            else:
+                own = self.dirt[rows, px, py] == a
+                self.dirt[rows[own], px[own], py[own]] = 0
+
+        self.cycle += 1
+        done = active & (self.map_cycle >= 0) & ~self.dirt.reshape(self.size, -1).any(axis=1)
+        self.completed_cycle[done] = self.cycle
+
+    def _compact(self) -> None:
+        """Drop the rows of completed environments, so that later cycles only cost what is still running."""
+        done = self.completed_cycle >= 0
+        self._finished[self.ids[done]] = self.completed_cycle[done]
+        keep = ~done
+        for field in PER_ENV_FIELDS:
+            setattr(self, field, getattr(self, field)[keep])
+        self.size = len(self.ids)
+        self._env = np.arange(self.size)
+
+    # --- running ---
+    def run(self, max_cycles: int) -> List[SimResult]:
+        """Step until every environment has completed or max_cycles; one SimResult per scenario."""
+        while self.cycle < max_cycles and self.size:
+            self.step()
+            if 2 * int((self.completed_cycle < 0).sum()) <= self.size:
+                self._compact()
+        return self.results()
+
+    def results(self) -> List[SimResult]:
+        cycles = self._finished.copy()
+        cycles[self.ids] = self.completed_cycle
+        left = np.zeros(self.scenarios, dtype=np.int64)
+        left[self.ids] = self.dirt.reshape(self.size, self.n * self.n).astype(bool).sum(axis=1)
+        return [SimResult(self.n, int(c) if c >= 0 else self.cycle, bool(c >= 0), int(d))
+                for c, d in zip(cycles, left)]
@@ -0,0 +1,1144 @@
+#!/usr/bin/env python3
+
+# ----------------------------
+# Cycle benchmarks for the part A minds on the headless stand-in (vwsim.py)
+# ----------------------------
+# Usage:
+#   python benchmarks.py opportunistic [--sizes 5 10 25] [--seeds 10] [--density 0.1]
+#   python benchmarks.py profile [--sizes 5 10 25] [--seeds 10] [--density 0.1] [--per-run] [--folded]
+#   python benchmarks.py timing [--sizes 5 10 25 50] [--seeds 3] [--density 0.1] [--sample-every 1]
+#   python benchmarks.py policy [--sizes 5 10 25] [--seeds 5] [--density 0.1] [--lookups 200000]
+#   python benchmarks.py targets [--counts 100 1000 10000] [--queries 200]
+#   python benchmarks.py checkpoint [--parts partA partB] [--sizes 5 10 25] [--seeds 3] [--density 0.1]
+#   python benchmarks.py cooperative [--sizes 5 10 15] [--seeds 5]
+#   python benchmarks.py yielding [--sizes 5 10 25] [--seeds 5]
+#   python benchmarks.py piggyback [--parts partA partB] [--sizes 5 10 25] [--seeds 5] [--density 0.1]
+#   python benchmarks.py termination [--parts partA partB] [--sizes 5 10 25] [--seeds 3]
+#   python benchmarks.py optimal [--sizes 3 4 5] [--seeds 3] [--max-states 2000000]
+#   python benchmarks.py pool [--parts partA partB] [--sizes 5 10] [--seeds 5]
+#   python benchmarks.py batch --no-yielding [--sizes 5 10 15] [--seeds 20] [--clean-costs 0.5 1.0 2.0 4.0]
+#   python benchmarks.py adversarial [--parts partA] [--sizes 5 10] [--density 0.1] [--population 12]
+#                                    [--generations 15] [--seed 0] [--keep 5] [--corpus adversarial_corpus.json]
+#   python benchmarks.py corpus [--corpus adversarial_corpus.json] [--threshold 0.05] [--cpu-threshold 1.0] [--update]
+#   python benchmarks.py prompts [--sizes 5 10 25] [--seeds 3]
+#   python benchmarks.py distill [--sizes 5 10] [--seeds 5] [--min-confidence 0.9] [--output distilled_model.json]
+#   python benchmarks.py routing [--sizes 5 10] [--seeds 2] [--latency-ms 0.5]
+#   python benchmarks.py imports [--modules partA partB vwsim checkpoint] [--repeats 5] [--top 8]
+#   python benchmarks.py tune [--sizes 5 10 15 25] [--seeds 10] [--output strategy_table.json]
+#   python benchmarks.py suite [--parts partA partB] [--sizes ...] [--seeds 1]
+#                              [--baseline benchmark_baseline.json] [--update-baseline]
+#                              [--threshold 0.05] [--cpu-threshold 0.5]
+#
+# The suite runs the standard configurations (every size x dirt layout x
+# start layout; sizes per part in SUITE_SIZES) and records cycles-to-completion
+# and CPU time per cycle. With --update-baseline the results are stored;
+# otherwise they are compared with the stored baseline (the committed
+# benchmark_baseline.json by default) and the exit status is 1 if any
+# configuration regressed by more than the threshold, stopped completing or
+# has no baseline. CPU time per cycle depends on the machine, so it is only
+# compared when --cpu-threshold is given, against a baseline recorded on the
+# same machine: the committed cpu_us_per_cycle values come from whichever
+# machine last ran --update-baseline, so regenerate them on yours (on a clean
+# tree) before comparing CPU time. The cycle counts are deterministic and
+# hold everywhere; test_baseline.py checks them at n=5 and 10 under pytest.
+#
+# adversarial searches for the scenarios the minds handle worst (adversarial.py)
+# and adds them to a corpus file; corpus re-runs the corpus entries and fails
+# the same way as the suite if any of them got worse, or if the corpus file is
+# missing or empty.
+#
+# distill trains the local decision model (distill.py) on transcripts of part B
+# runs and compares it with the LLM it was trained on, answer by answer and
+# in whole runs; the model file it writes is what VW_LOCAL_MODEL names.
+#
+# routing runs part B with the LLM requests routed by difficulty tier
+# (routing.py) between the rules, a deliberately bad cheap backend and the
+# main model (the mock LLM with an added round-trip), and reports per tier and
+# backend the calls, latency and rejection rate that moved the routes.
+#
+# imports measures what importing each module costs a fresh interpreter (as
+# a batch worker or an offline run starts one), from `python -X importtime`,
+# and whether the import loads the LLM client library or NumPy, which only the
+# surrogate's LLM calls and the vectorised indexes (batchsim, TargetIndex) need.
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import checkpoint
+from vwsim import (VWSimulator, random_scenario, Scenario, DIRT_LAYOUTS, START_LAYOUTS, bind_mock_llm,
+                   termination_observer)
+from profiling import BLOCKED_PHASE, CycleProfile, HotPathTimer, aggregate, aggregate_timers
+from target_index import TargetIndex, SpatialIndex, NUMPY_AVAILABLE
+from batchsim import NUMPY_AVAILABLE as BATCH_AVAILABLE, BatchSimulator
+from adversarial import DEFAULT_CORPUS, add_to_corpus, load_corpus, save_corpus, search
+from distill import (DEFAULT_MIN_CONFIDENCE, DistilledLLM, TranscriptRecorder, agreement, bind_local_model,
+                     train)
+from prompts import TIERS
+from routing import DEFAULT_ROUTES, bind_router
+from optimal import SolverLimitExceeded, bound, optimality_gap
+from strategies import (CLEANING_STRATEGIES, EXPLORATION_STRATEGIES, StrategySelector, cleaning_key,
+                        exploration_key, learn)
+from partA import (WhiteMind, OrangeMind, GreenMind, WHITE_POLICY, CLEANER_POLICY, COOPERATIVE_MODES,
+                   OPPORTUNISTIC_CLEAN_COST, white_rule, cleaner_rule)
+
+
+COLOURS = ("white", "orange", "green")
+
+
+def max_cycles_for(n: int) -> int:
+    return 20 * n * n + 100
+
+
+def partA_minds(cooperative: str = "off", yielding: bool = True, **white_kwargs: object) -> Dict[str, object]:
+    return {"white": WhiteMind(cooperative=cooperative, **white_kwargs),
+            "orange": OrangeMind(cooperative=cooperative, yielding=yielding),
+            "green": GreenMind(cooperative=cooperative, yielding=yielding)}
+
+
+def partB_minds() -> Dict[str, object]:
+    # Imported here so part A benchmarks do not pull in the LLM surrogate stack
+    from partB import WhiteLLMMind, OrangeMind as OrangeLLMMind, GreenMind as GreenLLMMind
+    minds = {"white": WhiteLLMMind(), "orange": OrangeLLMMind(), "green": GreenLLMMind()}
+    for mind in minds.values():
+        bind_mock_llm(mind)
+    return minds
+
+
+MIND_FACTORIES = {"partA": partA_minds, "partB": partB_minds}
+
+
+class MindPool:
+    """One set of minds built by factory, reset() for every run instead of rebuilt."""
+
+    def __init__(self, factory: Callable[[], Dict[str, object]]) -> None:
+        self.factory = factory
+        self.minds: Optional[Dict[str, object]] = None
+
+    def acquire(self) -> Dict[str, object]:
+        if self.minds is None:
+            self.minds = self.factory()
+        else:
+            for mind in self.minds.values():
+                mind.reset()
+        return self.minds
+
+
+def run_partA(scenario: Scenario, **white_kwargs: object) -> int:
+    result = VWSimulator(scenario, partA_minds(**white_kwargs)).run(max_cycles_for(scenario.n))
+    return result.cycles if result.completed else -1
+
+
+# ----------------------------
+# Opportunistic cleaning during exploration (WhiteMind.should_clean_during_exploration)
+# ----------------------------
+def bench_opportunistic(sizes: Sequence[int], seeds: int, density: float) -> List[Dict[str, object]]:
+    rows: List[Dict[str, object]] = []
+    print(f"{'n':>4} {'runs':>5} {'baseline':>10} {'opportunistic':>14} {'net':>8}")
+    for n in sizes:
+        baseline_total, hook_total, runs = 0, 0, 0
+        for seed in range(seeds):
+            scenario = random_scenario(n, density, seed)
+            baseline = run_partA(scenario, opportunistic_cleaning=False)
+            hook = run_partA(scenario, opportunistic_cleaning=True)
+            # Only compare configurations both variants complete
+            if baseline < 0 or hook < 0:
+                continue
+            baseline_total += baseline
+            hook_total += hook
+            runs += 1
+
+        net = hook_total - baseline_total
+        rows.append({"n": n, "runs": runs, "baseline": baseline_total, "opportunistic": hook_total, "net": net})
+        print(f"{n:>4} {runs:>5} {baseline_total:>10} {hook_total:>14} {net:>+8}")
+    return rows
+
+
+# ----------------------------
+# Per-phase cycle breakdown (profiling.CycleProfile)
+# ----------------------------
+def bench_profile(sizes: Sequence[int], seeds: int, density: float, per_run: bool, folded: bool) -> Dict[str, CycleProfile]:
+    profiles: List[CycleProfile] = []
+    for n in sizes:
+        for seed in range(seeds):
+            minds = partA_minds()
+            result = VWSimulator(random_scenario(n, density, seed), minds).run(max_cycles_for(n))
+            run_profiles = [mind.cycle_profile for mind in minds.values()]
+            profiles.extend(run_profiles)
+            if per_run:
+                print(f"--- n={n} seed={seed}: {result}")
+                for profile in run_profiles:
+                    print(profile.report())
+
+    merged = aggregate(profiles)
+    print(f"=== aggregate over {len(sizes) * seeds} runs")
+    for profile in merged.values():
+        print("\n".join(profile.folded()) if folded else profile.report())
+    return merged
+
+
+# ----------------------------
+# Wall-clock per-cycle cost of revise()/decide() (profiling.HotPathTimer)
+# ----------------------------
+def bench_timing(sizes: Sequence[int], seeds: int, density: float, sample_every: int) -> Dict[int, Dict[str, HotPathTimer]]:
+    by_size: Dict[int, Dict[str, HotPathTimer]] = {}
+    for n in sizes:
+        timers: List[HotPathTimer] = []
+        for seed in range(seeds):
+            minds = partA_minds()
+            for mind in minds.values():
+                mind.timings.sample_every = sample_every
+            VWSimulator(random_scenario(n, density, seed), minds).run(max_cycles_for(n))
+            timers.extend(mind.timings for mind in minds.values())
+        by_size[n] = aggregate_timers(timers)
+        print(f"=== n={n}")
+        for timer in by_size[n].values():
+            print(timer.report())
+
+    # Per-cycle CPU time should stay bounded as n grows
+    print(f"{'n':>4} " + " ".join(f"{mind + ' us/cycle':>18}" for mind in ("white", "orange", "green")))
+    for n, timers in by_size.items():
+        cells = []
+        for mind in ("white", "orange", "green"):
+            histograms = timers[mind].histograms
+            cycles = histograms["revise"].count if "revise" in histograms else 0
+            total = sum(histograms[name].total for name in ("revise", "decide") if name in histograms)
+            cells.append(f"{1e6 * total / cycles if cycles else 0.0:>18.1f}")
+        print(f"{n:>4} " + " ".join(cells))
+    return by_size
+
+
+# ----------------------------
+# Evaluated rules vs. their compiled tables (partA WHITE_POLICY / CLEANER_POLICY)
+# ----------------------------
+def bench_policy(sizes: Sequence[int], seeds: int, density: float, lookups: int) -> Dict[str, float]:
+    """
+    Check that the compiled tables (what batchsim.py looks up) match the rules
+    the minds evaluate, time a rule call against a table lookup, and put the
+    difference in proportion to a whole part A cycle (three decisions).
+    """
+    rng = random.Random(0)
+    saved_ns = 0.0
+    timings: Dict[str, float] = {}
+    for name, table, rule in (("white", WHITE_POLICY, white_rule), ("cleaner", CLEANER_POLICY, cleaner_rule)):
+        table.check()
+        states = [tuple(rng.randrange(d) for d in table.domains) for _ in range(lookups)]
+        start = time.perf_counter()
+        for state in states:
+            rule(*state)
+        evaluated = time.perf_counter() - start
+        start = time.perf_counter()
+        for state in states:
+            table[state]
+        looked_up = time.perf_counter() - start
+        timings[name] = evaluated / looked_up if looked_up else 0.0
+        saved_ns += (1 if name == "white" else 2) * 1e9 * (evaluated - looked_up) / lookups
+        print(f"{name:<8} {len(table):>6} states  rule {1e9 * evaluated / lookups:7.1f}ns  "
+              f"table {1e9 * looked_up / lookups:7.1f}ns  speed-up x{timings[name]:.2f}")
+
+    print(f"\n{'n':>4} {'cycles':>7} {'us/cycle':>9} {'table saving':>13}")
+    for n in sizes:
+        cycles, elapsed = 0, 0.0
+        for seed in range(seeds):
+            sim = VWSimulator(random_scenario(n, density, seed), partA_minds())
+            start = time.perf_counter()
+            cycles += sim.run(max_cycles_for(n)).simulated
+            elapsed += time.perf_counter() - start
+        per_cycle_ns = 1e9 * elapsed / cycles if cycles else 0.0
+        print(f"{n:>4} {cycles:>7} {per_cycle_ns / 1e3:>9.1f} {100 * saved_ns / per_cycle_ns if cycles else 0:>12.2f}%")
+    return timings
+
+
+# ----------------------------
+# Nearest-target queries: linear scan (pure Python / NumPy) vs. bucketed grid
+# ----------------------------
+def bench_targets(counts: Sequence[int], queries: int) -> Dict[int, Dict[str, float]]:
+    backends = {"python": lambda cells: TargetIndex(cells, use_numpy=False),
+                "spatial": lambda cells: SpatialIndex(cells)}
+    if NUMPY_AVAILABLE:
+        backends["numpy"] = lambda cells: TargetIndex(cells, use_numpy=True)
+    else:
+        print("NumPy not available: skipping the vectorised backend")
+    results: Dict[int, Dict[str, float]] = {}
+    print(f"{'cells':>7} {'backend':>8} {'nearest us':>11} {'3xcost us':>10} {'remove us':>10}")
+    for count in counts:
+        rng = random.Random(count)
+        side = max(2, int((4 * count) ** 0.5))
+        cells = list(dict.fromkeys((rng.randrange(side), rng.randrange(side)) for _ in range(count)))
+        points = [(rng.randrange(side), rng.randrange(side)) for _ in range(queries)]
+        agents = points[:3]
+        results[count] = {}
+        for name, make_index in backends.items():
+            index = make_index(cells)
+            start = time.perf_counter()
+            for x, y in points:
+                index.nearest(x, y)
+            nearest = (time.perf_counter() - start) / queries
+            start = time.perf_counter()
+            for _ in range(queries):
+                index.cost_matrix(agents)
+            cost = (time.perf_counter() - start) / queries
+            start = time.perf_counter()
+            for cell in cells[::2]:
+                index.discard(cell)
+            remove = (time.perf_counter() - start) / max(1, len(cells[::2]))
+            results[count][name] = nearest
+            print(f"{len(cells):>7} {name:>8} {1e6 * nearest:>11.1f} {1e6 * cost:>10.1f} {1e6 * remove:>10.2f}")
+    return results
+
+
+# ----------------------------
+# Checkpoint / resume (checkpoint.py, VWSimulator.save/load)
+# ----------------------------
+def bench_checkpoint(parts: Sequence[str], sizes: Sequence[int], seeds: int, density: float) -> int:
+    """Interrupt every run half-way, resume it from a checkpoint file and check the cycle count is unchanged."""
+    mismatches = 0
+    print(f"{'part':<6} {'n':>4} {'seed':>4} {'cycles':>7} {'resumed':>7} {'bytes':>7} {'save ms':>8} {'load ms':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "run.ckpt")
+        for part in parts:
+            for n in sizes:
+                for seed in range(seeds):
+                    scenario = random_scenario(n, density, seed)
+                    full = VWSimulator(scenario, MIND_FACTORIES[part]()).run(max_cycles_for(n))
+
+                    first = VWSimulator(scenario, MIND_FACTORIES[part]())
+                    first.run(max(1, full.cycles // 2))
+                    start = time.perf_counter()
+                    size = first.save(path)
+                    saved = time.perf_counter() - start
+
+                    second = VWSimulator(scenario, MIND_FACTORIES[part]())
+                    start = time.perf_counter()
+                    second.load(path)
+                    loaded = time.perf_counter() - start
+                    resumed = second.run(max_cycles_for(n))
+
+                    same = (resumed.cycles, resumed.completed) == (full.cycles, full.completed)
+                    mismatches += not same
+                    print(f"{part:<6} {n:>4} {seed:>4} {full.cycles:>7} {resumed.cycles:>7} {size:>7} "
+                          f"{1e3 * saved:>8.2f} {1e3 * loaded:>8.2f}{'' if same else '  MISMATCH'}")
+    print(f"{mismatches} resumed runs differ from the uninterrupted run")
+    return 1 if mismatches else 0
+
+
+# ----------------------------
+# Offline tuning of the strategy selector (strategies.learn)
+# ----------------------------
+def tuning_scenarios(sizes: Sequence[int], seeds: Iterable[int]) -> List[Scenario]:
+    return [random_scenario(n, density, seed, layout=layout)
+            for n in sizes for seed in seeds for layout, density in DIRT_LAYOUTS.items()]
+
+
+def bench_tune(sizes: Sequence[int], seeds: int, output: str) -> StrategySelector:
+    """Run every exploration x cleaning strategy on training scenarios, learn the table, check it on held-out ones."""
+    records: List[Dict[str, object]] = []
+    for scenario in tuning_scenarios(sizes, range(seeds)):
+        wx, wy, worient = scenario.actors["white"]
+        for exploration in EXPLORATION_STRATEGIES:
+            for cleaning in CLEANING_STRATEGIES:
+                cycles = run_partA(scenario, exploration=exploration, cleaning_strategy=cleaning)
+                records.append({
+                    "exploration_key": exploration_key((wx, wy), worient),
+                    "cleaning_key": cleaning_key(scenario.n, len(scenario.dirt)),
+                    "exploration": exploration,
+                    "cleaning": cleaning,
+                    "cycles": cycles if cycles >= 0 else max_cycles_for(scenario.n),
+                })
+    selector = learn(records)
+    selector.save(output)
+    print(json.dumps(selector.to_dict(), indent=2))
+    print(f"learned from {len(records)} runs, written to {output}")
+
+    # Held-out scenarios: default strategies vs. the learned selector
+    totals = {"default": [0, 0], "tuned": [0, 0]}
+    for scenario in tuning_scenarios(sizes, range(seeds, 2 * seeds)):
+        for name, white_kwargs in (("default", {"selector": StrategySelector()}), ("tuned", {"selector": selector})):
+            cycles = run_partA(scenario, **white_kwargs)
+            totals[name][0] += cycles if cycles >= 0 else max_cycles_for(scenario.n)
+            totals[name][1] += cycles >= 0
+    for name, (cycles, completed) in totals.items():
+        print(f"held-out {name:<8} total cycles {cycles:>8}  completed {completed}")
+    return selector
+
+
+# ----------------------------
+# Cooperative exploration modes (partA.COOPERATIVE_MODES)
+# ----------------------------
+def bench_cooperative(sizes: Sequence[int], seeds: int) -> int:
+    """
+    Every cooperative mode against "off" on every dirt layout and start, run
+    by run: lists each run that takes more cycles than with "off" or does not
+    finish at all, then the totals per size. Returns the number of stalled runs.
+    """
+    modes = [mode for mode in COOPERATIVE_MODES if mode != "off"]
+    totals: Dict[Tuple[int, str], List[int]] = {}
+    stalled = 0
+    for n in sizes:
+        for layout in DIRT_LAYOUTS:
+            for start in START_LAYOUTS:
+                for seed in range(seeds):
+                    scenario = random_scenario(n, seed=seed, layout=layout, start=start)
+                    off = run_partA(scenario)
+                    stalled += off < 0
+                    if off < 0:
+                        print(f"STALLED n={n} {layout}/{start}/seed={seed} off")
+                    for mode in modes:
+                        cycles = run_partA(scenario, cooperative=mode)
+                        # [runs, worse, better, stalled, cycles, cycles with off]
+                        row = totals.setdefault((n, mode), [0, 0, 0, 0, 0, 0])
+                        row[0] += 1
+                        if cycles < 0:
+                            row[3] += 1
+                            stalled += 1
+                            print(f"STALLED n={n} {layout}/{start}/seed={seed} {mode} (off: {off})")
+                            continue
+                        if off < 0:
+                            continue
+                        row[1] += cycles > off
+                        row[2] += cycles < off
+                        row[4] += cycles
+                        row[5] += off
+                        if cycles > off:
+                            print(f"worse   n={n} {layout}/{start}/seed={seed} {mode}: {off} -> {cycles}")
+
+    print(f"\n{'n':>4} {'mode':>6} {'runs':>5} {'worse':>6} {'better':>7} {'stalled':>8} {'cycles':>8} {'off':>8}")
+    for (n, mode), (runs, worse, better, stall, cycles, off) in totals.items():
+        print(f"{n:>4} {mode:>6} {runs:>5} {worse:>6} {better:>7} {stall:>8} {cycles:>8} {off:>8}")
+    print(f"{stalled} stalled runs")
+    return stalled
+
+
+# ----------------------------
+# Congestion between cleaners (BaseCleanerMind.negotiate)
+# ----------------------------
+def bench_yielding(sizes: Sequence[int], seeds: int) -> Dict[str, Dict[str, int]]:
+    """Total cycles and cleaner cycles lost to congestion, with and without priority yielding."""
+    totals: Dict[str, Dict[str, int]] = {}
+    print(f"{'yielding':>8} {'runs':>5} {'cycles':>9} {'completed':>10} {'congested':>10} {'worst run':>10}")
+    for yielding in (False, True):
+        row = {"runs": 0, "cycles": 0, "completed": 0, "congested": 0, "worst": 0}
+        for n in sizes:
+            for layout in DIRT_LAYOUTS:
+                for start in START_LAYOUTS:
+                    for seed in range(seeds):
+                        minds = partA_minds(yielding=yielding)
+                        sim = VWSimulator(random_scenario(n, seed=seed, layout=layout, start=start), minds)
+                        result = sim.run(max_cycles_for(n))
+                        # Cycles a cleaner spent blocked by an actor or stepping aside for one
+                        congested = sum(minds[c].cycle_profile.phase_cycles.get(phase, 0)
+                                        for c in ("orange", "green") for phase in (BLOCKED_PHASE, "yielding"))
+                        row["runs"] += 1
+                        row["cycles"] += result.cycles
+                        row["completed"] += result.completed
+                        row["congested"] += congested
+                        row["worst"] = max(row["worst"], congested)
+        totals["on" if yielding else "off"] = row
+        print(f"{'on' if yielding else 'off':>8} {row['runs']:>5} {row['cycles']:>9} {row['completed']:>10} "
+              f"{row['congested']:>10} {row['worst']:>10}")
+    return totals
+
+
+# ----------------------------
+# Broadcasts sent along with a physical action (messages.compose)
+# ----------------------------
+def bench_piggyback(parts: Sequence[str], sizes: Sequence[int], seeds: int,
+                    density: float) -> Dict[str, Dict[int, Dict[str, float]]]:
+    rows: Dict[str, Dict[int, Dict[str, float]]] = {}
+    print(f"{'part':<6} {'n':>4} {'runs':>5} {'cycles/run':>11} " + " ".join(f"{name + ' saved':>13}" for name in COLOURS))
+    for part in parts:
+        rows[part] = {}
+        for n in sizes:
+            saved = {name: 0 for name in COLOURS}
+            cycles = 0
+            for seed in range(seeds):
+                minds = MIND_FACTORIES[part]()
+                cycles += VWSimulator(random_scenario(n, density, seed), minds).run(max_cycles_for(n)).cycles
+                for name in COLOURS:
+                    saved[name] += minds[name].piggybacked
+            rows[part][n] = {name: saved[name] / seeds for name in COLOURS}
+            rows[part][n]["cycles"] = cycles / seeds
+            print(f"{part:<6} {n:>4} {seeds:>5} {cycles / seeds:>11.1f} "
+                  + " ".join(f"{saved[name] / seeds:>13.1f}" for name in COLOURS))
+    return rows
+
+
+# ----------------------------
+# Termination detected by the agents (messages.termination_cycle)
+# ----------------------------
+def bench_termination(parts: Sequence[str], sizes: Sequence[int], seeds: int) -> int:
+    """
+    Run without the simulator's own completion check, stopping only when the
+    agents report that they are done, and compare with the true completion
+    cycle. Returns the number of runs where the two disagree.
+    """
+    wrong = 0
+    print(f"{'configuration':<48} {'completed':>10} {'reported':>9} {'simulated':>10} {'limit':>7}")
+    for part in parts:
+        for n in sizes:
+            for layout in DIRT_LAYOUTS:
+                for start in START_LAYOUTS:
+                    for seed in range(seeds):
+                        sim = VWSimulator(random_scenario(n, seed=seed, layout=layout, start=start),
+                                          MIND_FACTORIES[part](), stop_on_completion=False)
+                        sim.add_observer(termination_observer)
+                        result = sim.run(max_cycles_for(n))
+                        actual = sim.completed_cycle
+                        wrong += result.terminated_cycle != actual
+                        key = f"{part}/n={n}/{layout}/{start}/seed={seed}"
+                        print(f"{key:<48} {actual if actual is not None else '-':>10} "
+                              f"{result.terminated_cycle if result.terminated_cycle is not None else '-':>9} "
+                              f"{result.simulated:>10} {max_cycles_for(n):>7}")
+    print(f"{wrong} runs where the reported completion cycle is not the actual one")
+    return wrong
+
+
+# ----------------------------
+# Optimality gap against the exact lower bound (optimal.py)
+# ----------------------------
+def bench_optimal(sizes: Sequence[int], seeds: int, max_states: int) -> List[Dict[str, object]]:
+    rows: List[Dict[str, object]] = []
+    print(f"{'configuration':<36} {'dirt':>5} {'explore':>8} {'clean':>6} {'bound':>6} {'partA':>6} {'gap':>7}")
+    for n in sizes:
+        for layout in DIRT_LAYOUTS:
+            for start in START_LAYOUTS:
+                for seed in range(seeds):
+                    key = f"n={n}/{layout}/{start}/seed={seed}"
+                    scenario = random_scenario(n, seed=seed, layout=layout, start=start)
+                    cycles = run_partA(scenario)
+                    try:
+                        lower = bound(scenario.n, scenario.dirt, scenario.actors, max_states)
+                    except SolverLimitExceeded:
+                        print(f"{key:<36} {len(scenario.dirt):>5} search limit reached")
+                        continue
+                    gap = optimality_gap(cycles, lower["bound"]) if cycles >= 0 else None
+                    rows.append({"key": key, "cycles": cycles, **lower, "gap": gap})
+                    print(f"{key:<36} {len(scenario.dirt):>5} {lower['explore']:>8} {lower['clean']:>6} "
+                          f"{lower['bound']:>6} {cycles if cycles >= 0 else '-':>6} "
+                          f"{f'{gap:+.0%}' if gap is not None else '-':>7}")
+    gaps = [row["gap"] for row in rows if row["gap"] is not None]
+    if gaps:
+        print(f"mean gap {sum(gaps) / len(gaps):+.1%}, worst {max(gaps):+.1%} over {len(gaps)} completed runs")
+    return rows
+
+
+# ----------------------------
+# Standard-configuration suite with stored baselines
+# ----------------------------
+# Part B asks the mock LLM every cycle, which makes n=100 and 200 runs impractical
+SUITE_SIZES: Dict[str, Tuple[int, ...]] = {"partA": (5, 10, 25, 50, 100, 200), "partB": (5, 10, 25, 50)}
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+DEFAULT_THRESHOLD: float = 0.05     # allowed relative increase in cycles
+
+
+def run_config(part: str, scenario: Scenario) -> Dict[str, object]:
+    sim = VWSimulator(scenario, MIND_FACTORIES[part]())
+    start = time.process_time()
+    result = sim.run(max_cycles_for(scenario.n))
+    cpu = time.process_time() - start
+    return {
+        "cycles": result.cycles,
+        "completed": result.completed,
+        "cpu_us_per_cycle": round(1e6 * cpu / max(1, sim.cycle), 2),
+    }
+
+
+def compare(key: str, current: Dict[str, object], baseline: Optional[Dict[str, object]],
+            threshold: float, cpu_threshold: Optional[float] = None) -> List[str]:
+    """Regressions of current against baseline; CPU time per cycle only if cpu_threshold is given."""
+    if baseline is None:
+        return [f"{key}: no baseline"]
+    problems = []
+    if baseline["completed"] and not current["completed"]:
+        problems.append(f"{key}: no longer completes")
+    elif current["cycles"] > baseline["cycles"] * (1 + threshold):
+        problems.append(f"{key}: cycles {baseline['cycles']} -> {current['cycles']}")
+    if cpu_threshold is not None and \
+            current["cpu_us_per_cycle"] > baseline["cpu_us_per_cycle"] * (1 + cpu_threshold):
+        problems.append(f"{key}: cpu/cycle {baseline['cpu_us_per_cycle']}us -> {current['cpu_us_per_cycle']}us")
+    return problems
+
+
+def bench_suite(parts: Sequence[str], sizes: Optional[Sequence[int]], seeds: int, baseline_path: str,
+                update: bool, threshold: float, cpu_threshold: Optional[float]) -> int:
+    baseline: Dict[str, Dict[str, object]] = {}
+    if os.path.exists(baseline_path):
+        with open(baseline_path) as f:
+            baseline = json.load(f)
+    elif not update:
+        print(f"No baseline at {baseline_path}: record one with --update-baseline")
+        return 1
+
+    results: Dict[str, Dict[str, object]] = {}
+    regressions: List[str] = []
+    print(f"{'configuration':<42} {'cycles':>8} {'done':>5} {'us/cycle':>9} {'baseline':>9}")
+    for part in parts:
+        for n in sizes or SUITE_SIZES[part]:
+            for layout in DIRT_LAYOUTS:
+                for start in START_LAYOUTS:
+                    for seed in range(seeds):
+                        key = f"{part}/n={n}/{layout}/{start}/seed={seed}"
+                        current = run_config(part, random_scenario(n, seed=seed, layout=layout, start=start))
+                        results[key] = current
+                        previous = baseline.get(key)
+                        regressions.extend(compare(key, current, previous, threshold, cpu_threshold))
+                        print(f"{key:<42} {current['cycles']:>8} {'yes' if current['completed'] else 'no':>5} "
+                              f"{current['cpu_us_per_cycle']:>9} {previous['cycles'] if previous else '-':>9}")
+
+    if update:
+        baseline.update(results)
+        with open(baseline_path, "w") as f:
+            json.dump(baseline, f, indent=1, sort_keys=True)
+        print(f"Baseline written to {baseline_path}")
+        return 0
+
+    for problem in regressions:
+        print(f"REGRESSION {problem}")
+    return 1 if regressions else 0
+
+
+# ----------------------------
+# Pooled minds (reset() instead of construction)
+# ----------------------------
+def bench_pool(parts: Sequence[str], sizes: Sequence[int], seeds: int) -> int:
+    """
+    Run the same scenarios with new minds and with one pooled set, checking
+    that a reset mind has the state of a new one and runs identically.
+    Returns the number of runs that differ.
+    """
+    differ = 0
+    print(f"{'part':<6} {'runs':>5} {'differ':>7} {'construct us':>13} {'reset us':>9}")
+    for part in parts:
+        factory, pool = MIND_FACTORIES[part], MindPool(MIND_FACTORIES[part])
+        scenarios = [random_scenario(n, seed=seed, layout=layout, start=start) for n in sizes
+                     for layout in DIRT_LAYOUTS for start in START_LAYOUTS for seed in range(seeds)]
+        constructing, resetting = 0.0, 0.0
+        for scenario in scenarios:
+            start = time.perf_counter()
+            fresh = factory()
+            constructing += time.perf_counter() - start
+            start = time.perf_counter()
+            pooled = pool.acquire()
+            resetting += time.perf_counter() - start
+
+            same_state = all(checkpoint.mind_state(pooled[c]) == checkpoint.mind_state(fresh[c]) for c in COLOURS)
+            expected = VWSimulator(scenario, fresh).run(max_cycles_for(scenario.n))
+            result = VWSimulator(scenario, pooled).run(max_cycles_for(scenario.n))
+            differ += not same_state or (result.cycles, result.completed) != (expected.cycles, expected.completed)
+        print(f"{part:<6} {len(scenarios):>5} {differ:>7} {1e6 * constructing / len(scenarios):>13.1f} "
+              f"{1e6 * resetting / len(scenarios):>9.1f}")
+    print(f"{differ} pooled runs differ from runs with new minds")
+    return differ
+
+
+# ----------------------------
+# Lockstep batched simulator (batchsim.py)
+# ----------------------------
+def bench_batch(sizes: Sequence[int], seeds: int, clean_costs: Sequence[float]) -> int:
+    """
+    Check the batched model against vwsim.py running the part A minds it
+    models (yielding=False, not the default team), compare simulated cycles
+    per second, and sweep white's opportunistic cleaning cost in one batch per
+    size. Returns the number of runs where the two simulators disagree.
+    """
+    if not BATCH_AVAILABLE:
+        print("batchsim.py needs NumPy")
+        return 0
+    wrong = 0
+    print("Team modelled: cleaners never yield (yielding=False); the default minds yield\n")
+    print(f"{'n':>4} {'runs':>5} {'agree':>6} {'vwsim cyc/s':>12} {'batch cyc/s':>12} {'speed-up':>9}")
+    for n in sizes:
+        scenarios = [random_scenario(n, seed=seed, layout=layout, start=start)
+                     for layout in DIRT_LAYOUTS for start in START_LAYOUTS for seed in range(seeds)]
+        start = time.perf_counter()
+        reference = [VWSimulator(s, partA_minds(yielding=False)).run(max_cycles_for(n)) for s in scenarios]
+        scalar = time.perf_counter() - start
+        start = time.perf_counter()
+        batched = BatchSimulator(scenarios, yielding=False).run(max_cycles_for(n))
+        vector = time.perf_counter() - start
+
+        agree = sum((a.cycles, a.completed) == (b.cycles, b.completed) for a, b in zip(reference, batched))
+        wrong += len(scenarios) - agree
+        simulated = sum(r.simulated for r in reference)
+        print(f"{n:>4} {len(scenarios):>5} {agree:>6} {simulated / scalar:>12.0f} "
+              f"{sum(r.cycles for r in batched) / vector:>12.0f} {scalar / vector:>8.1f}x")
+
+    # Parameter sweep: every scenario once per cost, all in the same batch
+    print(f"\n{'n':>4} {'clean cost':>10} {'completed':>10} {'mean cycles':>12}")
+    for n in sizes:
+        scenarios = [random_scenario(n, seed=seed, layout=layout, start=start)
+                     for layout in DIRT_LAYOUTS for start in START_LAYOUTS for seed in range(seeds)]
+        costs = [cost for cost in clean_costs for _ in scenarios]
+        batch = BatchSimulator(scenarios * len(clean_costs), clean_cost=costs, yielding=False)
+        results = batch.run(max_cycles_for(n))
+        for i, cost in enumerate(clean_costs):
+            chunk = results[i * len(scenarios):(i + 1) * len(scenarios)]
+            done = [r.cycles for r in chunk if r.completed]
+            marker = "  (default cost)" if cost == OPPORTUNISTIC_CLEAN_COST else ""
+            print(f"{n:>4} {cost:>10.2f} {len(done):>6}/{len(chunk):<3} "
+                  f"{sum(done) / len(done) if done else 0:>12.1f}{marker}")
+    print(f"{wrong} runs where the batched model and vwsim disagree")
+    return wrong
+
+
+# ----------------------------
+# Adversarial search and the worst-case corpus (adversarial.py)
+# ----------------------------
+def bench_adversarial(parts: Sequence[str], sizes: Sequence[int], density: float, population: int,
+                      generations: int, seed: int, keep: int, corpus_path: str) -> None:
+    corpus = load_corpus(corpus_path)
+    for part in parts:
+        for n in sizes:
+            found = search(n, lambda scenario: run_config(part, scenario), density, population, generations,
+                           seed)
+            for key in add_to_corpus(corpus, part, found, keep):
+                entry = corpus[key]
+                print(f"corpus += {key:<30} {entry['cycles']:>7} cycles{'' if entry['completed'] else ' (stalled)'}")
+    save_corpus(corpus_path, corpus)
+    print(f"{len(corpus)} scenarios in {corpus_path}")
+
+
+def bench_corpus(corpus_path: str, update: bool, threshold: float, cpu_threshold: Optional[float]) -> int:
+    corpus = load_corpus(corpus_path)
+    if not corpus:
+        print(f"No corpus entries in {corpus_path}: run the adversarial search first")
+        return 1
+    regressions: List[str] = []
+    print(f"{'scenario':<30} {'cycles':>8} {'done':>5} {'us/cycle':>9} {'recorded':>9}")
+    for key, entry in sorted(corpus.items()):
+        current = run_config(key.split("/", 1)[0], Scenario.from_dict(entry["scenario"]))
+        regressions.extend(compare(key, current, entry, threshold, cpu_threshold))
+        print(f"{key:<30} {current['cycles']:>8} {'yes' if current['completed'] else 'no':>5} "
+              f"{current['cpu_us_per_cycle']:>9} {entry['cycles']:>9}")
+        if update:
+            entry.update(current)
+    if update:
+        save_corpus(corpus_path, corpus)
+        print(f"Corpus results written to {corpus_path}")
+        return 0
+    for problem in regressions:
+        print(f"REGRESSION {problem}")
+    return 1 if regressions else 0
+
+
+# ----------------------------
+# LLM request size (prompts.py)
+# ----------------------------
+def bench_prompts(sizes: Sequence[int], seeds: int) -> None:
+    """
+    Characters sent per part B LLM call (mock LLM): the per-cycle state block,
+    and the static instruction that is either registered once (system
+    instruction) or repeated as a cacheable prefix. ~4 characters per token.
+    The VacuumWorld surrogate's LLM takes the prompt alone: the prefix column.
+    """
+    print(f"{'n':>4} {'calls':>6} {'state ch':>9} {'instr ch':>9} {'static':>7} "
+          f"{'tok/call (prefix)':>18} {'tok/call (system)':>18} {'instructions':>13}")
+    for n in sizes:
+        calls, state_chars, instruction_chars = 0, 0, 0
+        instructions: set = set()
+        for layout in DIRT_LAYOUTS:
+            for start in START_LAYOUTS:
+                for seed in range(seeds):
+                    scenario = random_scenario(n, seed=seed, layout=layout, start=start)
+                    minds = partB_minds()
+                    VWSimulator(scenario, minds).run(max_cycles_for(n))
+                    for mind in minds.values():
+                        llm = mind.decide_physical_with_ai
+                        calls += llm.calls
+                        state_chars += llm.prompt_chars
+                        instruction_chars += llm.instruction_chars
+                        instructions |= llm.instructions
+        per_call = max(1, calls)
+        print(f"{n:>4} {calls:>6} {state_chars / per_call:>9.0f} {instruction_chars / per_call:>9.0f} "
+              f"{instruction_chars / max(1, state_chars + instruction_chars):>7.0%} "
+              f"{(state_chars + instruction_chars) / per_call / 4:>18.0f} {state_chars / per_call / 4:>18.0f} "
+              f"{len(instructions):>13}")
+
+
+# ----------------------------
+# Local model distilled from LLM transcripts (distill.py)
+# ----------------------------
+def distill_scenarios(sizes: Sequence[int], seeds: Iterable[int]) -> List[Scenario]:
+    return [random_scenario(n, seed=seed, layout=layout, start=start)
+            for n in sizes for seed in seeds for layout in DIRT_LAYOUTS for start in START_LAYOUTS]
+
+
+def collect_transcripts(scenarios: Sequence[Scenario]) -> List[Dict[str, object]]:
+    """(situation, state, action) of every LLM answer in part B runs of scenarios."""
+    records: List[Dict[str, object]] = []
+    for scenario in scenarios:
+        minds = partB_minds()
+        for mind in minds.values():
+            mind.decide_physical_with_ai = TranscriptRecorder(mind.decide_physical_with_ai, records)
+        VWSimulator(scenario, minds).run(max_cycles_for(scenario.n))
+    return records
+
+
+def bench_distill(sizes: Sequence[int], seeds: int, min_confidence: float, output: str) -> None:
+    """
+    Train the local model on transcripts of part B runs (the mock LLM is the
+    teacher here), then check it on held-out scenarios: agreement with the
+    teacher's answers, time per decision, and whole runs with the local model
+    in front of the teacher and fully offline.
+    """
+    model = train(collect_transcripts(distill_scenarios(sizes, range(seeds))))
+    model.save(output)
+    for situation, (nodes, depth) in model.size().items():
+        print(f"tree {situation[:48]:<48} {nodes:>4} nodes, depth {depth}")
+    print(f"model written to {output}")
+
+    held_out = distill_scenarios(sizes, range(seeds, 2 * seeds))
+    records = collect_transcripts(held_out)
+    print(f"\n{'situation':<48} {'answers':>8} {'agree':>7} {'confident':>10} {'agree':>7}")
+    for situation, row in sorted(agreement(model, records, min_confidence).items()):
+        print(f"{situation[:48]:<48} {row['records']:>8} {row['agree'] / row['records']:>7.1%} "
+              f"{row['confident'] / row['records']:>10.1%} {row['confident_agree'] / max(1, row['confident']):>7.1%}")
+
+    local = DistilledLLM(model)
+    requests = [("STATE\n" + "\n".join(f"{k}: {v}" for k, v in r["state"].items()), str(r["situation"]))
+                for r in records[:20000]]
+    start = time.perf_counter()
+    for block, situation in requests:
+        local(block, system_instruction=situation)
+    print(f"\nlocal decision: {1e6 * (time.perf_counter() - start) / max(1, len(requests)):.1f} us "
+          f"(parse + tree walk)")
+
+    print(f"\n{'backend':<16} {'cycles':>8} {'completed':>10} {'remote calls':>13} {'local calls':>12}")
+    for name, offline in (("teacher", None), ("local+teacher", False), ("local offline", True)):
+        cycles, completed, remote, answered = 0, 0, 0, 0
+        for scenario in held_out:
+            minds = partB_minds()
+            if offline is not None:
+                backends = [bind_local_model(mind, model, min_confidence, offline) for mind in minds.values()]
+            result = VWSimulator(scenario, minds).run(max_cycles_for(scenario.n))
+            cycles += result.cycles
+            completed += result.completed
+            if offline is None:
+                remote += sum(mind.decide_physical_with_ai.calls for mind in minds.values())
+            else:
+                remote += sum(b.remote_calls for b in backends)
+                answered += sum(b.local_calls for b in backends)
+        print(f"{name:<16} {cycles:>8} {completed:>6}/{len(held_out):<3} {remote:>13} {answered:>12}")
+
+
+# ----------------------------
+# Tiered routing (routing.py)
+# ----------------------------
+class DelayedLLM:
+    """The mock LLM with a fixed round-trip added to every call, as a remote model would have."""
+
+    def __init__(self, llm: Callable, latency: float) -> None:
+        self.llm = llm
+        self.latency = latency
+        self.calls: int = 0
+        self.seconds: float = 0.0
+
+    def __call__(self, prompt: str, system_instruction: Optional[str] = None) -> object:
+        start = time.perf_counter()
+        time.sleep(self.latency)
+        response = self.llm(prompt, system_instruction=system_instruction)
+        self.calls += 1
+        self.seconds += time.perf_counter() - start
+        return response
+
+
+def forward_only(prompt: str, system_instruction: Optional[str] = None) -> str:
+    """A cheap backend that is often wrong: always MOVE_FORWARD."""
+    return "MOVE_FORWARD"
+
+
+ROUTING_CONFIGS: Dict[str, Optional[Tuple[Dict[str, str], bool]]] = {
+    # name -> (starting routes, whether forward_only is a backend), None: no router
+    "main only": None,
+    "default routes": (dict(DEFAULT_ROUTES), False),
+    "all main, adaptive": ({"easy": "main", "normal": "main", "hard": "main"}, False),
+    "forward-only cheap": ({"easy": "forward", "normal": "forward", "hard": "main"}, True),
+}
+
+
+def bench_routing(sizes: Sequence[int], seeds: int, latency_ms: float) -> None:
+    """
+    Part B runs with the mock LLM as the main model (plus latency_ms per call)
+    and no router, the default routes, every tier starting on the main model,
+    and a cheap backend that answers MOVE_FORWARD to everything, which the
+    rejection statistics have to move tiers off. Per tier and backend: calls,
+    mean latency and rejection rate, summed over the runs.
+    """
+    scenarios = distill_scenarios(sizes, range(seeds))
+    for name, config in ROUTING_CONFIGS.items():
+        cycles, completed, changes, llm_seconds = 0, 0, 0, 0.0
+        totals: Dict[Tuple[str, str], List[float]] = {}
+        for scenario in scenarios:
+            minds = partB_minds()
+            routers = []
+            for mind in minds.values():
+                mind.decide_physical_with_ai = DelayedLLM(mind.decide_physical_with_ai, latency_ms / 1e3)
+                if config is not None:
+                    routes, forward = config
+                    extra = [("forward", forward_only)] if forward else []
+                    routers.append(bind_router(mind, routes, extra))
+            result = VWSimulator(scenario, minds).run(max_cycles_for(scenario.n))
+            cycles += result.cycles
+            completed += result.completed
+            if config is None:
+                row = totals.setdefault(("all", "main"), [0, 0.0, 0])
+                for mind in minds.values():
+                    row[0] += mind.decide_physical_with_ai.calls
+                    row[1] += mind.decide_physical_with_ai.seconds
+                    llm_seconds += mind.decide_physical_with_ai.seconds
+            for router in routers:
+                changes += len(router.changes)
+                for tier, backend, calls, latency, rate in router.summary():
+                    row = totals.setdefault((tier, backend), [0, 0.0, 0])
+                    row[0] += calls
+                    row[1] += calls * latency
+                    row[2] += calls * rate
+                    llm_seconds += calls * latency
+        print(f"\n{name}: {cycles} cycles, {completed}/{len(scenarios)} completed, {changes} route changes, "
+              f"{llm_seconds:.2f} s in the LLM backends")
+        print(f"  {'tier':<8} {'backend':<8} {'calls':>8} {'mean ms':>8} {'rejected':>11}")
+        for (tier, backend), (calls, seconds, rejections) in sorted(
+                totals.items(), key=lambda item: (TIERS.index(item[0][0]) if item[0][0] in TIERS else -1, item[0][1])):
+            print(f"  {tier:<8} {backend:<8} {int(calls):>8} {1e3 * seconds / max(1, calls):>8.3f} "
+                  f"{rejections / max(1, calls):>11.1%}")
+
+
+# ----------------------------
+# Start-up cost (python -X importtime)
+# ----------------------------
+# Packages the minds must not load at import time: column -> package names
+LAZY_PACKAGES: Dict[str, Tuple[str, ...]] = {"LLM client": ("google.genai",), "NumPy": ("numpy",)}
+
+
+def import_times(module: str) -> Tuple[float, Dict[str, Tuple[int, int]]]:
+    """
+    Import module in a fresh interpreter with -X importtime. Returns the wall
+    time of the whole process (seconds) and imported package -> (self us,
+    cumulative us) as reported by the interpreter.
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], cwd=here,
+                          capture_output=True, text=True)
+    wall = time.perf_counter() - start
+    if proc.returncode:
+        raise RuntimeError(f"importing {module} failed:\n{proc.stderr.strip().splitlines()[-1]}")
+    times: Dict[str, Tuple[int, int]] = {}
+    for line in proc.stderr.splitlines():
+        # "import time:      self [us] |  cumulative | imported package"
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|", 2)
+        times[name.strip()] = (int(own), int(cumulative))
+    return wall, times
+
+
+def bench_imports(modules: Sequence[str], repeats: int, top: int) -> None:
+    """Best-of-repeats import cost of each module, the slowest imports it pulls in, and whether any LAZY_PACKAGES are among them."""
+    baseline = min(import_times("sys")[0] for _ in range(repeats))
+    print(f"interpreter start-up: {1e3 * baseline:.1f} ms")
+    print(f"{'module':<12} {'import ms':>10} {'process ms':>11} {'modules':>8}"
+          + "".join(f" {column:>11}" for column in LAZY_PACKAGES))
+    slowest: Dict[str, List[Tuple[str, int]]] = {}
+    for module in modules:
+        runs = [import_times(module) for _ in range(repeats)]
+        wall, times = min(runs, key=lambda run: run[1][module][1])
+        loaded = [any(name == pkg or name.startswith(pkg + ".") for name in times for pkg in packages)
+                  for packages in LAZY_PACKAGES.values()]
+        print(f"{module:<12} {times[module][1] / 1e3:>10.1f} {1e3 * wall:>11.1f} {len(times):>8}"
+              + "".join(f" {'loaded' if hit else 'no':>11}" for hit in loaded))
+        # Only the top level of each package: its cumulative time covers the submodules
+        roots = [(name, cumulative) for name, (_, cumulative) in times.items() if name != module and "." not in name]
+        slowest[module] = sorted(roots, key=lambda item: item[1], reverse=True)[:top]
+    for module, entries in slowest.items():
+        print(f"\nslowest imports under {module}:")
+        for name, cumulative in entries:
+            print(f"  {name:<32} {cumulative / 1e3:>8.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="VacuumWorld cycle benchmarks")
+    sub = parser.add_subparsers(dest="bench", required=True)
+
+    opp = sub.add_parser("opportunistic", help="net cycle change of opportunistic cleaning by white")
+    opp.add_argument("--sizes", type=int, nargs="+", default=[5, 10, 25])
+    opp.add_argument("--seeds", type=int, default=10)
+    opp.add_argument("--density", type=float, default=0.1)
+
+    prof = sub.add_parser("profile", help="per-phase and per-action cycle breakdown")
+    prof.add_argument("--sizes", type=int, nargs="+", default=[5, 10, 25])
+    prof.add_argument("--seeds", type=int, default=10)
+    prof.add_argument("--density", type=float, default=0.1)
+    prof.add_argument("--per-run", action="store_true", help="print a summary for every run")
+    prof.add_argument("--folded", action="store_true", help="emit folded stacks for flamegraph tools")
+
+    tim = sub.add_parser("timing", help="wall-clock histograms of revise()/decide() hot paths")
+    tim.add_argument("--sizes", type=int, nargs="+", default=[5, 10, 25, 50])
+    tim.add_argument("--seeds", type=int, default=3)
+    tim.add_argument("--density", type=float, default=0.1)
+    tim.add_argument("--sample-every", type=int, default=1)
+
+    pol = sub.add_parser("policy", help="decide() rules vs. their compiled tables: agreement and lookup cost")
+    pol.add_argument("--sizes", type=int, nargs="+", default=[5, 10, 25])
+    pol.add_argument("--seeds", type=int, default=5)
+    pol.add_argument("--density", type=float, default=0.1)
+    pol.add_argument("--lookups", type=int, default=200000)
+
+    tgt = sub.add_parser("targets", help="nearest-target query cost: pure Python, NumPy and bucketed grid")
+    tgt.add_argument("--counts", type=int, nargs="+", default=[100, 1000, 10000])
+    tgt.add_argument("--queries", type=int, default=200)
+
+    ckpt = sub.add_parser("checkpoint", help="resume runs from a mid-run checkpoint and compare with uninterrupted runs")
+    ckpt.add_argument("--parts", nargs="+", choices=sorted(MIND_FACTORIES), default=["partA", "partB"])
+    ckpt.add_argument("--sizes", type=int, nargs="+", default=[5, 10, 25])
+    ckpt.add_argument("--seeds", type=int, default=3)
+    ckpt.add_argument("--density", type=float, default=0.1)
+
+    coop = sub.add_parser("cooperative", help="per-run cycles with orange/green relaying what they see vs. off")
+    coop.add_argument("--sizes", type=int, nargs="+", default=[5, 10, 15])
+    coop.add_argument("--seeds", type=int, default=5)
+
+    yld = sub.add_parser("yielding", help="cleaner congestion with and without priority-based yielding")
+    yld.add_argument("--sizes", type=int, nargs="+", default=[5, 10, 25])
+    yld.add_argument("--seeds", type=int, default=5)
+
+    pig = sub.add_parser("piggyback", help="cycles saved per run by sending broadcasts with physical actions")
+    pig.add_argument("--parts", nargs="+", choices=sorted(MIND_FACTORIES), default=["partA", "partB"])
+    pig.add_argument("--sizes", type=int, nargs="+", default=[5, 10, 25])
+    pig.add_argument("--seeds", type=int, default=5)
+    pig.add_argument("--density", type=float, default=0.1)
+
+    term = sub.add_parser("termination", help="completion cycle reported by the agents vs. the actual one")
+    term.add_argument("--parts", nargs="+", choices=sorted(MIND_FACTORIES), default=["partA", "partB"])
+    term.add_argument("--sizes", type=int, nargs="+", default=[5, 10, 25])
+    term.add_argument("--seeds", type=int, default=3)
+
+    opt = sub.add_parser("optimal", help="optimality gap of part A against an exact lower bound (small grids)")
+    opt.add_argument("--sizes", type=int, nargs="+", default=[3, 4, 5])
+    opt.add_argument("--seeds", type=int, default=3)
+    opt.add_argument("--max-states", type=int, default=2_000_000)
+
+    pool = sub.add_parser("pool", help="pooled minds reset between runs vs. new minds per run")
+    pool.add_argument("--parts", nargs="+", choices=sorted(MIND_FACTORIES), default=["partA", "partB"])
+    pool.add_argument("--sizes", type=int, nargs="+", default=[5, 10])
+    pool.add_argument("--seeds", type=int, default=5)
+
+    bat = sub.add_parser("batch", help="lockstep batched simulator: agreement with vwsim, throughput, cost sweep")
+    bat.add_argument("--sizes", type=int, nargs="+", default=[5, 10, 15])
+    bat.add_argument("--seeds", type=int, default=20)
+    bat.add_argument("--clean-costs", type=float, nargs="+", default=[0.5, 1.0, 2.0, 4.0])
+    bat.add_argument("--no-yielding", dest="yielding", action="store_false",
+                     help="required: the batched model's cleaners never yield, unlike the default minds")
+
+    adv = sub.add_parser("adversarial", help="search for worst-case scenarios and add them to the corpus")
+    adv.add_argument("--parts", nargs="+", choices=sorted(MIND_FACTORIES), default=["partA"])
+    adv.add_argument("--sizes", type=int, nargs="+", default=[5, 10])
+    adv.add_argument("--density", type=float, default=0.1)
+    adv.add_argument("--population", type=int, default=12)
+    adv.add_argument("--generations", type=int, default=15)
+    adv.add_argument("--seed", type=int, default=0)
+    adv.add_argument("--keep", type=int, default=5, help="worst scenarios kept per part and size")
+    adv.add_argument("--corpus", default=DEFAULT_CORPUS)
+
+    corp = sub.add_parser("corpus", help="re-run the worst-case corpus and report regressions")
+    corp.add_argument("--corpus", default=DEFAULT_CORPUS)
+    corp.add_argument("--update", action="store_true", help="record the current results in the corpus")
+    corp.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="allowed relative increase in cycles")
+    # Corpus runs are short, so their CPU time per cycle is noisier than the suite's
+    corp.add_argument("--cpu-threshold", type=float,
+                      help="allowed relative increase in CPU time per cycle (not compared unless given)")
+
+    prm = sub.add_parser("prompts", help="characters per part B LLM call: static instruction vs. per-cycle state")
+    prm.add_argument("--sizes", type=int, nargs="+", default=[5, 10, 25])
+    prm.add_argument("--seeds", type=int, default=3)
+
+    dis = sub.add_parser("distill", help="train the local decision model on part B transcripts and check it")
+    dis.add_argument("--sizes", type=int, nargs="+", default=[5, 10])
+    dis.add_argument("--seeds", type=int, default=5)
+    dis.add_argument("--min-confidence", type=float, default=DEFAULT_MIN_CONFIDENCE)
+    dis.add_argument("--output", default="distilled_model.json")
+
+    rte = sub.add_parser("routing", help="part B LLM requests routed by difficulty tier between backends")
+    rte.add_argument("--sizes", type=int, nargs="+", default=[5, 10])
+    rte.add_argument("--seeds", type=int, default=2)
+    rte.add_argument("--latency-ms", type=float, default=0.5)
+
+    imp = sub.add_parser("imports", help="import time of each module in a fresh interpreter (-X importtime)")
+    imp.add_argument("--modules", nargs="+", default=["partA", "partB", "vwsim", "checkpoint"])
+    imp.add_argument("--repeats", type=int, default=5)
+    imp.add_argument("--top", type=int, default=8)
+
+    tune = sub.add_parser("tune", help="learn the white strategy selection table from batch simulations")
+    tune.add_argument("--sizes", type=int, nargs="+", default=[5, 10, 15, 25])
+    tune.add_argument("--seeds", type=int, default=10)
+    tune.add_argument("--output", default="strategy_table.json")
+
+    suite = sub.add_parser("suite", help="standard configurations compared against stored baselines")
+    suite.add_argument("--parts", nargs="+", choices=sorted(MIND_FACTORIES), default=["partA", "partB"])
+    suite.add_argument("--sizes", type=int, nargs="+", help="default: SUITE_SIZES of each part")
+    suite.add_argument("--seeds", type=int, default=1)
+    suite.add_argument("--baseline", default=DEFAULT_BASELINE)
+    suite.add_argument("--update-baseline", action="store_true")
+    suite.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="allowed relative increase in cycles")
+    suite.add_argument("--cpu-threshold", type=float,
+                       help="allowed relative increase in CPU time per cycle (not compared unless given)")
+
+    args = parser.parse_args()
+    if args.bench == "opportunistic":
+        bench_opportunistic(args.sizes, args.seeds, args.density)
+    elif args.bench == "profile":
+        bench_profile(args.sizes, args.seeds, args.density, args.per_run, args.folded)
+    elif args.bench == "timing":
+        bench_timing(args.sizes, args.seeds, args.density, args.sample_every)
+    elif args.bench == "policy":
+        bench_policy(args.sizes, args.seeds, args.density, args.lookups)
+    elif args.bench == "targets":
+        bench_targets(args.counts, args.queries)
+    elif args.bench == "checkpoint":
+        sys.exit(bench_checkpoint(args.parts, args.sizes, args.seeds, args.density))
+    elif args.bench == "cooperative":
+        sys.exit(1 if bench_cooperative(args.sizes, args.seeds) else 0)
+    elif args.bench == "yielding":
+        bench_yielding(args.sizes, args.seeds)
+    elif args.bench == "piggyback":
+        bench_piggyback(args.parts, args.sizes, args.seeds, args.density)
+    elif args.bench == "termination":
+        sys.exit(1 if bench_termination(args.parts, args.sizes, args.seeds) else 0)
+    elif args.bench == "optimal":
+        bench_optimal(args.sizes, args.seeds, args.max_states)
+    elif args.bench == "pool":
+        sys.exit(1 if bench_pool(args.parts, args.sizes, args.seeds) else 0)
+    elif args.bench == "batch":
+        if args.yielding:
+            print("batchsim.py models cleaners that never yield, not the default (yielding) team: "
+                  "pass --no-yielding to check and sweep that team")
+            sys.exit(1)
+        sys.exit(1 if bench_batch(args.sizes, args.seeds, args.clean_costs) else 0)
+    elif args.bench == "adversarial":
+        bench_adversarial(args.parts, args.sizes, args.density, args.population, args.generations, args.seed,
+                          args.keep, args.corpus)
+    elif args.bench == "corpus":
+        sys.exit(bench_corpus(args.corpus, args.update, args.threshold, args.cpu_threshold))
+    elif args.bench == "prompts":
+        bench_prompts(args.sizes, args.seeds)
+    elif args.bench == "distill":
+        bench_distill(args.sizes, args.seeds, args.min_confidence, args.output)
+    elif args.bench == "routing":
+        bench_routing(args.sizes, args.seeds, args.latency_ms)
+    elif args.bench == "imports":
+        bench_imports(args.modules, args.repeats, args.top)
+    elif args.bench == "tune":
+        bench_tune(args.sizes, args.seeds, args.output)
+    elif args.bench == "suite":
+        sys.exit(bench_suite(args.parts, args.sizes, args.seeds, args.baseline, args.update_baseline,
+                             args.threshold, args.cpu_threshold))
+
+
+if __name__ == "__main__":
+    main()
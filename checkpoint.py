@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+
+# ----------------------------
+# Checkpoint / resume of mind state
+# ----------------------------
+# Each mind class lists the attributes that make up its internal model in
+# CHECKPOINT_FIELDS (phase, maps, cleaned cells, turn memory, ...).
+# Configuration passed to the constructor and per-cycle scratch state (the
+# observation snapshot, profiles, timers) are not part of it: a mind is
+# resumed by constructing it as usual and calling restore_mind() on it.
+#
+# The same split makes minds reusable: every mind's reset() sets up the
+# per-episode state (CHECKPOINT_FIELDS and the scratch state) afresh and
+# keeps what the constructor was given or built, such as the LLM surrogate,
+# the strategy selector and the compiled policy tables. The constructor
+# ends by calling reset(), so a reset mind is indistinguishable from a new
+# one, and batch runners can pool minds instead of rebuilding them per run.
+#
+# Values are written as JSON with small tags for the types JSON lacks:
+#   {"t": [...]} tuple      {"s": [...]} set         {"d": [[k, v], ...]} dict
+#   {"e": [enum type, member name]}                  {"x": [index type, items]}
+# and the file is gzip-compressed. The payload carries CHECKPOINT_VERSION;
+# bump it whenever a mind's CHECKPOINT_FIELDS change meaning, since older
+# checkpoints are then refused rather than restored into the wrong fields.
+
+import gzip
+import json
+import os
+from typing import Dict, Optional
+
+from vacuumworld.common.vwdirection import VWDirection
+from vacuumworld.common.vworientation import VWOrientation
+from vacuumworld.common.vwcolour import VWColour
+
+from target_index import DirtIndex, SpatialIndex, TargetIndex
+
+
+CHECKPOINT_VERSION: int = 2
+
+ENUM_TYPES = {cls.__name__: cls for cls in (VWDirection, VWOrientation, VWColour)}
+INDEX_TYPES = {cls.__name__: cls for cls in (TargetIndex, SpatialIndex, DirtIndex)}
+
+
+class CheckpointError(ValueError):
+    pass
+
+
+def encode(value: object) -> object:
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, tuple):
+        return {"t": [encode(v) for v in value]}
+    if isinstance(value, list):
+        return [encode(v) for v in value]
+    if isinstance(value, (set, frozenset)):
+        return {"s": [encode(v) for v in value]}
+    if isinstance(value, dict):
+        return {"d": [[encode(k), encode(v)] for k, v in value.items()]}
+    if isinstance(value, DirtIndex):
+        return {"x": ["DirtIndex", [[list(cell), value.colour_of(cell)] for cell in value]]}
+    if type(value).__name__ in INDEX_TYPES:
+        return {"x": [type(value).__name__, [list(cell) for cell in value]]}
+    if type(value).__name__ in ENUM_TYPES:
+        return {"e": [type(value).__name__, value.name]}
+    raise CheckpointError(f"cannot checkpoint value of type {type(value).__name__}")
+
+
+def decode(data: object) -> object:
+    if isinstance(data, list):
+        return [decode(v) for v in data]
+    if not isinstance(data, dict):
+        return data
+    (tag, body), = data.items()
+    if tag == "t":
+        return tuple(decode(v) for v in body)
+    if tag == "s":
+        return {decode(v) for v in body}
+    if tag == "d":
+        return {decode(k): decode(v) for k, v in body}
+    if tag == "e":
+        return ENUM_TYPES[body[0]][body[1]]
+    if tag == "x":
+        kind, items = body
+        if kind == "DirtIndex":
+            return DirtIndex(((int(c[0]), int(c[1])), colour) for c, colour in items)
+        return INDEX_TYPES[kind]((int(c[0]), int(c[1])) for c in items)
+    raise CheckpointError(f"unknown checkpoint tag {tag!r}")
+
+
+def mind_state(mind: object) -> Dict[str, object]:
+    """The CHECKPOINT_FIELDS of a mind, encoded."""
+    return {"mind": type(mind).__name__,
+            "fields": {name: encode(getattr(mind, name)) for name in type(mind).CHECKPOINT_FIELDS}}
+
+
+def restore_mind(mind: object, state: Dict[str, object]) -> None:
+    if state["mind"] != type(mind).__name__:
+        raise CheckpointError(f"checkpoint is for {state['mind']}, not {type(mind).__name__}")
+    missing = set(type(mind).CHECKPOINT_FIELDS) - set(state["fields"])
+    if missing:
+        raise CheckpointError(f"checkpoint for {state['mind']} lacks {sorted(missing)}")
+    for name, value in state["fields"].items():
+        setattr(mind, name, decode(value))
+
+
+def checkpoint_minds(minds: Dict[str, object], **extra: object) -> Dict[str, object]:
+    payload = {"version": CHECKPOINT_VERSION, "minds": {key: mind_state(m) for key, m in minds.items()}}
+    payload.update(extra)
+    return payload
+
+
+def restore_minds(minds: Dict[str, object], payload: Dict[str, object]) -> None:
+    if payload.get("version") != CHECKPOINT_VERSION:
+        raise CheckpointError(f"checkpoint version {payload.get('version')} is not {CHECKPOINT_VERSION}")
+    for key, mind in minds.items():
+        restore_mind(mind, payload["minds"][key])
+
+
+def dumps(payload: Dict[str, object]) -> bytes:
+    return gzip.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+
+
+def loads(blob: bytes) -> Dict[str, object]:
+    return json.loads(gzip.decompress(blob).decode("utf-8"))
+
+
+def write_checkpoint(path: str, payload: Dict[str, object]) -> int:
+    """Write a checkpoint payload to path; returns its size in bytes."""
+    blob = dumps(payload)
+    with open(path + ".tmp", "wb") as f:
+        f.write(blob)
+    # Replace atomically so a crash mid-write keeps the previous checkpoint
+    os.replace(path + ".tmp", path)
+    return len(blob)
+
+
+def read_checkpoint(path: str) -> Dict[str, object]:
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+
+def save_checkpoint(path: str, minds: Dict[str, object], **extra: object) -> int:
+    """Checkpoint minds (plus any JSON-able extra entries) to path; returns its size in bytes."""
+    return write_checkpoint(path, checkpoint_minds(minds, **extra))
+
+
+def load_checkpoint(path: str, minds: Optional[Dict[str, object]] = None) -> Dict[str, object]:
+    """Read a checkpoint and, if minds are given, restore them from it."""
+    payload = read_checkpoint(path)
+    if minds is not None:
+        restore_minds(minds, payload)
+    return payload
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+
+# ----------------------------
+# Grid size inference from perceptions
+# ----------------------------
+# The grid is n x n, so one number is unknown. Every cycle narrows it down:
+#   - every in-grid cell perceived at (cx, cy) proves n > max(cx, cy)
+#   - every perceived position that is missing from the observation (an
+#     empty forward/left/right/forwardleft/forwardright) with cx, cy >= 0
+#     lies past the east or south wall, so n <= max(cx, cy)
+# n is known as soon as the two bounds meet, which happens the first time
+# an east or south wall shows up anywhere in the 2x3 perception window,
+# without having to walk up to it facing east/south.
+
+from typing import Dict, Optional, Tuple
+
+from observation import ObservationSnapshot
+
+
+_DELTAS: Dict[str, Tuple[int, int]] = {"north": (0, -1), "east": (1, 0), "south": (0, 1), "west": (-1, 0)}
+_ORDER: Tuple[str, ...] = ("north", "east", "south", "west")
+
+
+def perception_offsets(orientation: object) -> Dict[str, Tuple[int, int]]:
+    """Offsets of the perceived non-center cells for an actor facing orientation."""
+    name = getattr(orientation, "name", orientation)
+    i = _ORDER.index(name)
+    fx, fy = _DELTAS[name]
+    lx, ly = _DELTAS[_ORDER[(i - 1) % 4]]
+    rx, ry = _DELTAS[_ORDER[(i + 1) % 4]]
+    return {"forward": (fx, fy), "left": (lx, ly), "right": (rx, ry),
+            "forwardleft": (fx + lx, fy + ly), "forwardright": (fx + rx, fy + ry)}
+
+
+def size_bounds(snap: ObservationSnapshot, lower: int, upper: Optional[int]) -> Tuple[int, Optional[int]]:
+    """Tighten lower <= n <= upper (upper None = unbounded) with this cycle's perception."""
+    x, y = snap.position
+    lower = max(lower, x + 1, y + 1)
+    for name, (dx, dy) in perception_offsets(snap.orientation).items():
+        cx, cy = x + dx, y + dy
+        if getattr(snap, name) is not None:
+            lower = max(lower, cx + 1, cy + 1)
+        elif cx >= 0 and cy >= 0:
+            upper = max(cx, cy) if upper is None else min(upper, max(cx, cy))
+    return lower, upper
+
+
+def known_size(lower: int, upper: Optional[int]) -> Optional[int]:
+    return lower if upper is not None and upper <= lower else None
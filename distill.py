@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+
+# ----------------------------
+# Local decision model distilled from part B LLM transcripts
+# ----------------------------
+# Every part B LLM request is a static instruction and a STATE block
+# (prompts.py), and every useful answer is one of three action names, so the
+# LLM's policy can be learned from what it answered:
+#   collect:  TranscriptRecorder wraps a mind's decide_physical_with_ai() and
+#             records (situation, state, action) for every valid answer; the
+#             situation is the first line of the instruction and the state is
+#             the STATE block as parse_state() reads it
+#   train:    one decision tree per situation (ID3 on the categorical state
+#             fields and pairs of them, standard library only), saved as JSON
+#   serve:    DistilledLLM has the signature of decide_physical_with_ai() and
+#             answers from the tree in microseconds when it is confident,
+#             deferring to the remote model otherwise (or never, offline)
+#
+# bind_local_model() installs it on a mind, like vwsim.bind_mock_llm(). The
+# part B minds do so when they are created if VW_LOCAL_MODEL names a model
+# file; VW_LOCAL_MIN_CONFIDENCE sets the confidence below which the remote
+# model is asked (0: never, i.e. fully offline). Trained and checked with:
+# python benchmarks.py distill.
+
+import json
+import math
+import os
+from collections import Counter, defaultdict
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from prompts import parse_state, send, split_request
+
+Record = Dict[str, object]
+Node = Dict[str, object]
+
+ACTIONS: Tuple[str, ...] = ("MOVE_FORWARD", "TURN_LEFT", "TURN_RIGHT")
+DEFAULT_MIN_CONFIDENCE: float = 0.9
+DEFAULT_MAX_DEPTH: int = 8
+DEFAULT_MAX_VALUES: int = 12        # state fields with more distinct values (positions, cell lists) are not split on
+
+
+def situation_of(instruction: str) -> str:
+    return instruction.strip().split("\n", 1)[0]
+
+
+def action_name(response: object) -> Optional[str]:
+    """The action an LLM response names (text or a Gemini response), or None if it names none."""
+    candidates = getattr(response, "candidates", None)
+    try:
+        text = candidates[0].content.parts[0].text if candidates else response
+    except (AttributeError, IndexError, TypeError):
+        return None
+    name = str(text).strip().upper()
+    return name if name in ACTIONS else None
+
+
+# ----------------------------
+# Transcripts
+# ----------------------------
+class TranscriptRecorder:
+    """Stands in for decide_physical_with_ai(): forwards to llm (with the tier) and records every valid answer."""
+
+    def __init__(self, llm: Callable, records: List[Record]) -> None:
+        self.llm = llm
+        self.records = records
+
+    def __call__(self, prompt: str, system_instruction: Optional[str] = None, tier: Optional[str] = None) -> object:
+        instruction, block = split_request(prompt, system_instruction)
+        response = send(self.llm, instruction, block, tier)
+        action = action_name(response)
+        if action is not None:
+            self.records.append({"situation": situation_of(instruction), "state": parse_state(block),
+                                 "action": action})
+        return response
+
+
+def save_transcript(path: str, records: Iterable[Record]) -> None:
+    """Append records to a JSON-lines transcript."""
+    with open(path, "a") as f:
+        for record in records:
+            f.write(json.dumps(record, sort_keys=True) + "\n")
+
+
+def load_transcript(path: str) -> List[Record]:
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+# ----------------------------
+# Training
+# ----------------------------
+CROSS = " & "
+
+
+def feature_value(state: Dict[str, str], feature: str) -> str:
+    """A state field, or for a crossed feature "a & b" both fields' values."""
+    if CROSS in feature:
+        return CROSS.join(state.get(part, "") for part in feature.split(CROSS))
+    return state.get(feature, "")
+
+
+def _entropy(counts: Dict[str, int]) -> float:
+    total = sum(counts.values())
+    return -sum(c / total * math.log2(c / total) for c in counts.values() if c)
+
+
+def _grow(rows: List[Tuple[Dict[str, str], str]], features: List[str], depth: int, max_depth: int) -> Node:
+    """rows: (feature -> value, action) pairs."""
+    counts = Counter(action for _, action in rows)
+    node: Node = {"counts": dict(sorted(counts.items()))}
+    if len(counts) == 1 or depth == max_depth:
+        return node
+
+    base, best, best_gain = _entropy(counts), None, 1e-9
+    for feature in features:
+        by_value: Dict[str, Counter] = defaultdict(Counter)
+        for values, action in rows:
+            by_value[values[feature]][action] += 1
+        if len(by_value) < 2:
+            continue
+        rest = sum(sum(c.values()) / len(rows) * _entropy(c) for c in by_value.values())
+        if base - rest > best_gain:
+            best, best_gain = feature, base - rest
+    if best is None:
+        return node
+
+    groups: Dict[str, List[Tuple[Dict[str, str], str]]] = defaultdict(list)
+    for row in rows:
+        groups[row[0][best]].append(row)
+    remaining = [f for f in features if f != best]
+    node["feature"] = best
+    node["children"] = {value: _grow(group, remaining, depth + 1, max_depth) for value, group in sorted(groups.items())}
+    return node
+
+
+def train(records: Iterable[Record], max_depth: int = DEFAULT_MAX_DEPTH,
+          max_values: int = DEFAULT_MAX_VALUES) -> "DistilledModel":
+    """One tree per situation, split on the state fields with at most max_values distinct values and their pairs."""
+    by_situation: Dict[str, List[Record]] = defaultdict(list)
+    for record in records:
+        by_situation[str(record["situation"])].append(record)
+    trees: Dict[str, Node] = {}
+    for situation, group in sorted(by_situation.items()):
+        values: Dict[str, set] = defaultdict(set)
+        for record in group:
+            for key, value in record["state"].items():
+                values[key].add(value)
+        fields = sorted(key for key, seen in values.items() if 1 < len(seen) <= max_values)
+        # Pairs of fields as well: the rules test relations such as orientation vs. desired
+        # orientation, which no single field predicts and a greedy split would not find
+        features = list(fields)
+        for i, first in enumerate(fields):
+            for second in fields[i + 1:]:
+                pairs = {(r["state"].get(first, ""), r["state"].get(second, "")) for r in group}
+                if len(pairs) <= 2 * max_values:
+                    features.append(first + CROSS + second)
+        rows = [({f: feature_value(r["state"], f) for f in features}, str(r["action"])) for r in group]
+        trees[situation] = _grow(rows, features, 0, max_depth)
+    return DistilledModel(trees)
+
+
+# ----------------------------
+# Model
+# ----------------------------
+class DistilledModel:
+    def __init__(self, trees: Optional[Dict[str, Node]] = None) -> None:
+        self.trees: Dict[str, Node] = dict(trees or {})
+
+    def predict(self, situation: str, state: Dict[str, str]) -> Tuple[Optional[str], float]:
+        """
+        The most frequent action at the deepest node state reaches, and its
+        confidence: its count over the node's total plus one, so that rare
+        states are never fully trusted. (None, 0.0) for an unknown situation.
+        """
+        node = self.trees.get(situation)
+        if node is None:
+            return None, 0.0
+        while "feature" in node:
+            child = node["children"].get(feature_value(state, node["feature"]))
+            if child is None:
+                break
+            node = child
+        counts: Dict[str, int] = node["counts"]
+        action = max(counts, key=counts.get)
+        return action, counts[action] / (sum(counts.values()) + 1.0)
+
+    def size(self) -> Dict[str, Tuple[int, int]]:
+        """Situation -> (nodes, depth) of its tree."""
+        def walk(node: Node) -> Tuple[int, int]:
+            children = [walk(child) for child in node.get("children", {}).values()]
+            return 1 + sum(c[0] for c in children), 1 + max((c[1] for c in children), default=0)
+        return {situation: walk(tree) for situation, tree in self.trees.items()}
+
+    def to_dict(self) -> Dict[str, Dict[str, Node]]:
+        return {"trees": self.trees}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Dict[str, Node]]) -> "DistilledModel":
+        return cls(data.get("trees"))
+
+    def save(self, path: str) -> None:
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=1)
+
+    @classmethod
+    def load(cls, path: str) -> "DistilledModel":
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+
+# ----------------------------
+# Serving
+# ----------------------------
+class DistilledLLM:
+    """
+    Stands in for decide_physical_with_ai(): answers from the model when it is
+    at least min_confidence sure, otherwise asks remote. Without a remote
+    every request is answered locally ("IDLE" for an unknown situation).
+    """
+
+    def __init__(self, model: DistilledModel, remote: Optional[Callable] = None,
+                 min_confidence: float = DEFAULT_MIN_CONFIDENCE) -> None:
+        self.model = model
+        self.remote = remote
+        self.min_confidence = min_confidence
+        self.local_calls: int = 0
+        self.remote_calls: int = 0
+
+    def __call__(self, prompt: str, system_instruction: Optional[str] = None) -> object:
+        instruction, block = split_request(prompt, system_instruction)
+        action, confidence = self.model.predict(situation_of(instruction), parse_state(block))
+        if self.remote is None or (action is not None and confidence >= self.min_confidence):
+            self.local_calls += 1
+            return action or "IDLE"
+        self.remote_calls += 1
+        return send(self.remote, instruction, block)
+
+
+def bind_local_model(mind: object, model: DistilledModel, min_confidence: float = DEFAULT_MIN_CONFIDENCE,
+                     offline: bool = False) -> DistilledLLM:
+    """Put the model in front of the mind's current LLM (or in place of it if offline)."""
+    local = DistilledLLM(model, None if offline else mind.decide_physical_with_ai, min_confidence)
+    mind.decide_physical_with_ai = local
+    return local
+
+
+_MODELS: Dict[str, DistilledModel] = {}
+
+
+def load_local_model() -> Optional[DistilledModel]:
+    """The model file named by VW_LOCAL_MODEL, if any (loaded once per process)."""
+    path = os.environ.get("VW_LOCAL_MODEL")
+    if not path:
+        return None
+    if path not in _MODELS:
+        _MODELS[path] = DistilledModel.load(path)
+    return _MODELS[path]
+
+
+def local_min_confidence() -> float:
+    """VW_LOCAL_MIN_CONFIDENCE, or DEFAULT_MIN_CONFIDENCE if it is not set."""
+    return float(os.environ.get("VW_LOCAL_MIN_CONFIDENCE", DEFAULT_MIN_CONFIDENCE))
+
+
+def local_model_from_env(mind: object) -> Optional[DistilledLLM]:
+    """bind_local_model() with load_local_model() and VW_LOCAL_MIN_CONFIDENCE, if VW_LOCAL_MODEL is set."""
+    model = load_local_model()
+    if model is None:
+        return None
+    min_confidence = local_min_confidence()
+    return bind_local_model(mind, model, min_confidence, offline=min_confidence <= 0)
+
+
+def agreement(model: DistilledModel, records: Sequence[Record],
+              min_confidence: float = DEFAULT_MIN_CONFIDENCE) -> Dict[str, Dict[str, int]]:
+    """Per situation: records, predictions equal to the recorded action, confident ones and confident correct ones."""
+    table: Dict[str, Dict[str, int]] = defaultdict(lambda: {"records": 0, "agree": 0, "confident": 0,
+                                                            "confident_agree": 0})
+    for record in records:
+        action, confidence = model.predict(str(record["situation"]), record["state"])
+        row = table[str(record["situation"])]
+        hit = action == record["action"]
+        row["records"] += 1
+        row["agree"] += hit
+        if confidence >= min_confidence:
+            row["confident"] += 1
+            row["confident_agree"] += hit
+    return dict(table)
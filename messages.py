@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+
+# ----------------------------
+# Typed message dispatch
+# ----------------------------
+# Every message the minds broadcast is a dict keyed by its type, with the
+# payload under that key and an optional sequence number next to it:
+#   {"dirt": [{"x": 1, "y": 2, "colour": "green"}, ...], "seq": 7}
+#   {"intent": {"from": "orange", ...}, "seq": 12}
+# MESSAGE_TYPES holds the schema of every known type. A mind marks the
+# methods that handle a type with @handler(type) and calls dispatch() once
+# per cycle: each message is classified by a dict lookup on its keys, dropped
+# if it repeats a sequence number already seen from its sender, validated
+# against its schema and passed to the handler as handler(payload, sender_id).
+# Types the mind has no handler for are skipped without being validated, so
+# adding message types does not slow down minds that ignore them.
+#
+# Outgoing messages get their sequence number from stamp(). The mind keeps
+# the last number sent (message_seq) and the last number seen per sender
+# (seen_seq) as attributes so that they are checkpointed with it (see
+# reset_messaging()).
+#
+# The minds of both parts send through compose() and detect the end of the
+# task with termination_cycle(), below.
+
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Type, Union
+
+from vacuumworld.model.actions.vwactions import VWAction
+from vacuumworld.model.actions.vwidle_action import VWIdleAction
+from vacuumworld.model.actions.vwbroadcast_action import VWBroadcastAction
+
+FieldType = Union[type, Tuple[type, ...]]
+
+
+class MessageType:
+    """
+    Schema of one message type: the payload is a dict with fields, or with
+    many=True a list of such dicts. Extra fields are allowed.
+    """
+    def __init__(self, name: str, fields: Dict[str, FieldType], many: bool = False) -> None:
+        self.name = name
+        self.fields = fields
+        self.many = many
+
+    def _valid_record(self, record: object) -> bool:
+        if not isinstance(record, dict):
+            return False
+        for field, kind in self.fields.items():
+            value = record.get(field)
+            # bool is an int subclass, but never a valid coordinate or count
+            if not isinstance(value, kind) or (isinstance(value, bool) and kind is int):
+                return False
+        return True
+
+    def validate(self, payload: object) -> bool:
+        if self.many:
+            return isinstance(payload, list) and all(self._valid_record(r) for r in payload)
+        return self._valid_record(payload)
+
+
+# ----------------------------
+# Registry
+# ----------------------------
+MESSAGE_TYPES: Dict[str, MessageType] = {}
+
+
+def register_message(name: str, fields: Dict[str, FieldType], many: bool = False) -> MessageType:
+    MESSAGE_TYPES[name] = MessageType(name, fields, many)
+    return MESSAGE_TYPES[name]
+
+
+# Map broadcast by white once exploration is complete
+register_message("dirt", {"x": int, "y": int, "colour": str}, many=True)
+# Cells perceived by a cleaner before the map arrives (partA cooperative relay)
+register_message("observed", {"cells": list, "from": str, "at": list})
+# Where a cleaner is and wants to go next (partA priority yielding)
+register_message("intent", {"from": str, "id": str, "at": list, "next": list, "priority": int, "remaining": int})
+# Cells an agent cleaned or saw clean that were dirty on the map
+register_message("cleaned", {"cells": list})
+# Whether an agent has work left, and the cycle of its last piece of work
+register_message("status", {"from": str, "done": bool, "remaining": int, "cycle": int})
+
+
+def message_type(content: object) -> Optional[str]:
+    if not isinstance(content, dict):
+        return None
+    for key in content:
+        if key in MESSAGE_TYPES:
+            return key
+    return None
+
+
+# ----------------------------
+# Handlers
+# ----------------------------
+def handler(name: str) -> Callable[[Callable], Callable]:
+    """Mark a mind method as the handler for messages of type name."""
+    if name not in MESSAGE_TYPES:
+        raise ValueError(f"unknown message type {name!r}")
+
+    def decorator(method: Callable) -> Callable:
+        method.handles = name
+        return method
+    return decorator
+
+
+_HANDLER_TABLES: Dict[type, Dict[str, str]] = {}
+
+
+def handler_table(cls: Type) -> Dict[str, str]:
+    """Message type -> handler method name for a mind class (built once per class)."""
+    table = _HANDLER_TABLES.get(cls)
+    if table is None:
+        table = {}
+        for klass in reversed(cls.__mro__):
+            for attr, value in vars(klass).items():
+                name = getattr(value, "handles", None)
+                if name is not None:
+                    table[name] = attr
+        _HANDLER_TABLES[cls] = table
+    return table
+
+
+# ----------------------------
+# Messaging state of a mind
+# ----------------------------
+# Kept on the mind by stamp(), dispatch(), compose() and termination_cycle(),
+# and set up by every mind's reset(). The minds list these attributes in their
+# CHECKPOINT_FIELDS, all but piggybacked, which only counts:
+#   message_seq      sequence number of the last message sent
+#   seen_seq         last sequence number seen, per sender
+#   pending_cleaned  cells cleaned or seen clean since the last "cleaned" broadcast
+#   outbox           messages waiting for a broadcast slot
+#   piggybacked      broadcasts sent along with a physical action
+#   cycle            cycles seen
+#   last_work_cycle  cycle of the mind's last piece of work (see termination_cycle())
+#   statuses         the latest status from each other agent
+#   reported_done    whether the last status sent said "done"
+def reset_messaging(mind: object) -> None:
+    mind.message_seq = 0
+    mind.seen_seq = {}
+    mind.pending_cleaned = []
+    mind.outbox = []
+    mind.piggybacked = 0
+    mind.cycle = 0
+    mind.last_work_cycle = 0
+    mind.statuses = {}
+    mind.reported_done = False
+
+
+def stamp(mind: object, message: Dict[str, object]) -> Dict[str, object]:
+    """The message with the mind's next sequence number."""
+    mind.message_seq += 1
+    stamped = dict(message)
+    stamped["seq"] = mind.message_seq
+    return stamped
+
+
+def dispatch(mind: object, messages: Iterable[object]) -> int:
+    """Hand every new, valid message the mind has a handler for to that handler; returns how many."""
+    table = handler_table(type(mind))
+    seen: Dict[str, int] = mind.seen_seq
+    handled = 0
+    for msg in messages:
+        content = msg.get_content()
+        name = message_type(content)
+        method = table.get(name) if name is not None else None
+        if method is None:
+            continue
+        sender = str(msg.get_sender_id())
+        seq = content.get("seq")
+        if isinstance(seq, int):
+            if seq <= seen.get(sender, 0):
+                continue        # duplicate or out of date
+            seen[sender] = seq
+        payload = content[name]
+        if not MESSAGE_TYPES[name].validate(payload):
+            print(f"[{getattr(mind, 'colour_name', 'white').upper()}] Dropping malformed {name} message from {sender}")
+            continue
+        getattr(mind, method)(payload, sender)
+        handled += 1
+    return handled
+
+
+# ----------------------------
+# Action composition
+# ----------------------------
+# A cycle carries one physical and one communicative action. Minds queue the
+# messages that are not tied to the current cycle (the map) in
+# their outbox, and compose() pairs the cycle's move/turn/clean/idle with one
+# broadcast: the message given for this cycle (an intent or report), else the
+# oldest queued message, else the pending cleaned events. Every broadcast that
+# goes out with a move, turn or clean instead of on its own is a cycle saved,
+# counted in the mind's piggybacked.
+def compose(mind: object, physical: VWAction,
+            message: Optional[Dict[str, object]] = None) -> List[VWAction]:
+    if message is None:
+        if mind.outbox:
+            message = mind.outbox.pop(0)
+        elif mind.pending_cleaned:
+            message = {"cleaned": {"cells": [list(cell) for cell in mind.pending_cleaned]}}
+            mind.pending_cleaned = []
+        elif mind.work_done() != mind.reported_done:
+            mind.reported_done = mind.work_done()
+            message = {"status": {"from": mind.colour_name, "done": mind.reported_done,
+                                  "remaining": mind.work_left(), "cycle": mind.last_work_cycle}}
+    if message is None:
+        return [physical]
+    if not isinstance(physical, VWIdleAction):
+        mind.piggybacked += 1
+    return [physical, VWBroadcastAction(message=stamp(mind, message), sender_id=mind.get_own_id())]
+
+
+# ----------------------------
+# Termination detection
+# ----------------------------
+# Every agent broadcasts a status whenever it runs out of work or gets some
+# back (see compose()), with the cycle of its last piece of work: the map
+# broadcast for white, the last clean for everyone. Once an agent is done and
+# has heard "done" from all the others, the task finished on the latest of
+# those cycles. It is known a couple of cycles later, but the reported cycle
+# is exact. A runner can poll termination_cycle() to stop the simulation (see
+# vwsim.termination_observer).
+TEAM: Tuple[str, ...] = ("white", "orange", "green")
+
+
+def termination_cycle(mind: object) -> Optional[int]:
+    """The cycle the whole team finished on, once this mind knows it; else None."""
+    if not mind.work_done():
+        return None
+    cycles = [mind.last_work_cycle]
+    for colour in TEAM:
+        if colour == mind.colour_name:
+            continue
+        status = mind.statuses.get(colour)
+        if status is None or not status["done"]:
+            return None
+        cycles.append(status["cycle"])
+    return max(cycles)
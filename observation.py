@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+
+# ----------------------------
+# Per-cycle decoded observation shared by partA.py and partB.py
+# ----------------------------
+# revise() decodes the VWObservation once into an ObservationSnapshot (plain
+# ints, bools and strings) and stores it on the mind; decide() reads the same
+# snapshot instead of calling the getters and or_else_raise() again.
+
+from typing import List, Optional, Tuple
+
+
+class CellView:
+    __slots__ = ("pos", "has_actor", "has_dirt", "dirt_colour")
+
+    def __init__(self, pos: Tuple[int, int], has_actor: bool, has_dirt: bool, dirt_colour: Optional[str]) -> None:
+        self.pos = pos
+        self.has_actor = has_actor
+        self.has_dirt = has_dirt
+        self.dirt_colour = dirt_colour      # lower-case colour name, e.g. "orange"
+
+
+def _decode_cell(opt_loc: object) -> Optional[CellView]:
+    if opt_loc.is_empty():
+        return None
+    loc = opt_loc.or_else_raise()
+    coord = loc.get_coord()
+    dirt_colour = None
+    has_dirt = loc.has_dirt()
+    if has_dirt:
+        dirt_colour = loc.get_dirt_appearance().or_else_raise().get_colour().name.lower()
+    return CellView((int(coord.get_x()), int(coord.get_y())), loc.has_actor(), has_dirt, dirt_colour)
+
+
+def has_actor(cell: Optional[CellView]) -> bool:
+    return cell is not None and cell.has_actor
+
+
+class ObservationSnapshot:
+    __slots__ = ("position", "orientation", "center", "forward", "left", "right",
+                 "forwardleft", "forwardright", "wall_ahead")
+
+    def __init__(self, position: Tuple[int, int], orientation: object, center: Optional[CellView],
+                 forward: Optional[CellView], left: Optional[CellView], right: Optional[CellView],
+                 forwardleft: Optional[CellView], forwardright: Optional[CellView], wall_ahead: bool) -> None:
+        self.position = position
+        self.orientation = orientation
+        self.center = center
+        self.forward = forward
+        self.left = left
+        self.right = right
+        self.forwardleft = forwardleft
+        self.forwardright = forwardright
+        self.wall_ahead = wall_ahead
+
+    @classmethod
+    def decode(cls, obs: object, position: object, orientation: object) -> "ObservationSnapshot":
+        return cls(
+            (int(position.get_x()), int(position.get_y())),
+            orientation,
+            _decode_cell(obs.get_center()),
+            _decode_cell(obs.get_forward()),
+            _decode_cell(obs.get_left()),
+            _decode_cell(obs.get_right()),
+            _decode_cell(obs.get_forwardleft()),
+            _decode_cell(obs.get_forwardright()),
+            obs.is_wall_immediately_ahead(),
+        )
+
+    def cells(self) -> List[CellView]:
+        """The perceived in-grid cells, center first."""
+        return [c for c in (self.center, self.forward, self.left, self.right, self.forwardleft, self.forwardright)
+                if c is not None]
+
+    def dirt_here(self) -> Optional[str]:
+        """Colour of the dirt under the agent, if any."""
+        return self.center.dirt_colour if self.center is not None and self.center.has_dirt else None
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+
+# ----------------------------
+# Exact lower bounds on the cycles of the explore + clean task (small grids)
+# ----------------------------
+# The real task is partially observable: no agent knows where the dirt is
+# until it has been seen, so its true optimum is a policy, not a plan. What
+# can be computed exactly, by A* search, are the optima of two relaxations,
+# and their maximum is a lower bound on what any agent team can achieve:
+#   explore:     the fewest cycles after which white has observed every cell
+#                (state: white's position, orientation and observed cells).
+#                The map cannot be broadcast before cycle explore + 1.
+#   clean:       the fewest cycles for the three agents to clean all dirt
+#                knowing where it is from the start (state: every agent's
+#                position and orientation, and the dirt still left), with
+#                orange and green held idle for the first `frozen` cycles.
+#                Under the task rules the cleaners cannot move before they
+#                receive the map, i.e. for at least explore + 1 cycles.
+# Agents act as in vwsim.py: in the order white, orange, green, each move
+# into a free in-grid cell, white cleaning any dirt and orange/green only
+# their own colour. Both heuristics are admissible, so the results are exact.
+#
+# A run's optimality gap against bound() is an upper bound on its true gap.
+
+import heapq
+from itertools import count, product
+from typing import Dict, List, Sequence, Tuple
+
+from dimensions import perception_offsets
+
+Pose = Tuple[int, int, int]         # x, y, orientation index
+
+ORIENTATION_NAMES: Tuple[str, ...] = ("north", "east", "south", "west")
+DELTAS: Tuple[Tuple[int, int], ...] = ((0, -1), (1, 0), (0, 1), (-1, 0))
+AGENTS: Tuple[str, ...] = ("white", "orange", "green")
+
+MOVE, LEFT, RIGHT, CLEAN, IDLE = range(5)
+DEFAULT_MAX_STATES: int = 2_000_000
+
+
+class SolverLimitExceeded(RuntimeError):
+    pass
+
+
+def pose_of(x: int, y: int, orientation: str) -> Pose:
+    return x, y, ORIENTATION_NAMES.index(orientation)
+
+
+def turns_needed(orient: int, dx: int, dy: int) -> int:
+    """Fewest turns before an agent facing orient can have moved by (dx, dy)."""
+    needed = set()
+    if dx:
+        needed.add(1 if dx > 0 else 3)
+    if dy:
+        needed.add(2 if dy > 0 else 0)
+    if not needed:
+        return 0
+    if orient in needed:
+        return len(needed) - 1
+    if len(needed) == 1:
+        return 1 if (orient - next(iter(needed))) % 2 else 2
+    return len(needed)
+
+
+# ----------------------------
+# Exploration: white observing every cell
+# ----------------------------
+def _view_mask(n: int, pose: Pose) -> int:
+    x, y, o = pose
+    mask = 1 << (y * n + x)
+    for dx, dy in perception_offsets(ORIENTATION_NAMES[o]).values():
+        cx, cy = x + dx, y + dy
+        if 0 <= cx < n and 0 <= cy < n:
+            mask |= 1 << (cy * n + cx)
+    return mask
+
+
+def explore_optimum(n: int, start: Pose, max_states: int = DEFAULT_MAX_STATES) -> int:
+    """Fewest cycles (actions) after which every cell has been in white's view."""
+    full = (1 << (n * n)) - 1
+    views = {(x, y, o): _view_mask(n, (x, y, o)) for x in range(n) for y in range(n) for o in range(4)}
+    cells = [(i % n, i // n) for i in range(n * n)]
+
+    def h(pose: Pose, seen: int) -> int:
+        unseen = [cells[i] for i in range(n * n) if not seen >> i & 1]
+        if not unseen:
+            return 0
+        # Every cell in view is within distance 2, and a cycle reveals at most 3 new cells
+        far = max(abs(cx - pose[0]) + abs(cy - pose[1]) for cx, cy in unseen) - 2
+        return max(far, (len(unseen) + 2) // 3)
+
+    seen0 = views[start]
+    best: Dict[Tuple[Pose, int], int] = {(start, seen0): 0}
+    tie = count()
+    frontier = [(h(start, seen0), next(tie), 0, start, seen0)]
+    while frontier:
+        _, _, g, pose, seen = heapq.heappop(frontier)
+        if seen == full:
+            return g
+        if best.get((pose, seen), g) < g:
+            continue
+        if len(best) > max_states:
+            raise SolverLimitExceeded(f"exploration search exceeded {max_states} states")
+        x, y, o = pose
+        dx, dy = DELTAS[o]
+        successors = [(x, y, (o - 1) % 4), (x, y, (o + 1) % 4)]
+        if 0 <= x + dx < n and 0 <= y + dy < n:
+            successors.append((x + dx, y + dy, o))
+        for nxt in successors:
+            nseen = seen | views[nxt]
+            if best.get((nxt, nseen), g + 2) > g + 1:
+                best[(nxt, nseen)] = g + 1
+                heapq.heappush(frontier, (g + 1 + h(nxt, nseen), next(tie), g + 1, nxt, nseen))
+    raise ValueError("grid cannot be explored")
+
+
+# ----------------------------
+# Cleaning: all three agents, dirt known
+# ----------------------------
+def clean_optimum(n: int, dirt: Dict[Tuple[int, int], str], poses: Sequence[Pose], frozen: int = 0,
+                  max_states: int = DEFAULT_MAX_STATES) -> int:
+    """Fewest cycles to clean all dirt, with orange/green idle for the first frozen cycles."""
+    cells = list(dirt)
+    index = {cell: i for i, cell in enumerate(cells)}
+    # Which agents may clean each dirt cell
+    eligible = [[a for a, name in enumerate(AGENTS) if name in ("white", dirt[cell])] for cell in cells]
+
+    def h(state: Tuple[Tuple[Pose, ...], int, int]) -> int:
+        agents, left, wait = state
+        bound = 0
+        for i in range(len(cells)):
+            if not left >> i & 1:
+                continue
+            cx, cy = cells[i]
+            reach = min((wait if a else 0) + abs(cx - agents[a][0]) + abs(cy - agents[a][1]) +
+                        turns_needed(agents[a][2], cx - agents[a][0], cy - agents[a][1]) for a in eligible[i])
+            bound = max(bound, reach + 1)
+        return bound
+
+    def step(agents: Tuple[Pose, ...], left: int, actions: Tuple[int, ...]) -> Tuple[Tuple[Pose, ...], int]:
+        placed = list(agents)
+        for a, action in enumerate(actions):
+            x, y, o = placed[a]
+            if action == MOVE:
+                dx, dy = DELTAS[o]
+                target = (x + dx, y + dy)
+                if all((p[0], p[1]) != target for p in placed):
+                    placed[a] = (target[0], target[1], o)
+            elif action == LEFT:
+                placed[a] = (x, y, (o - 1) % 4)
+            elif action == RIGHT:
+                placed[a] = (x, y, (o + 1) % 4)
+            elif action == CLEAN:
+                left &= ~(1 << index[(x, y)])
+        return tuple(placed), left
+
+    def options(agent: int, pose: Pose, left: int, wait: int) -> List[int]:
+        if agent and wait:
+            return [IDLE]
+        x, y, o = pose
+        moves = [IDLE, LEFT, RIGHT]
+        dx, dy = DELTAS[o]
+        if 0 <= x + dx < n and 0 <= y + dy < n:
+            moves.append(MOVE)
+        i = index.get((x, y))
+        if i is not None and left >> i & 1 and agent in eligible[i]:
+            moves.append(CLEAN)
+        return moves
+
+    start = (tuple(poses), (1 << len(cells)) - 1, frozen)
+    best: Dict[Tuple[Tuple[Pose, ...], int, int], int] = {start: 0}
+    tie = count()
+    frontier = [(h(start), next(tie), 0, start)]
+    while frontier:
+        _, _, g, state = heapq.heappop(frontier)
+        agents, left, wait = state
+        if not left:
+            return g
+        if best.get(state, g) < g:
+            continue
+        if len(best) > max_states:
+            raise SolverLimitExceeded(f"cleaning search exceeded {max_states} states")
+        choices = [options(a, agents[a], left, wait) for a in range(len(AGENTS))]
+        for actions in product(*choices):
+            nagents, nleft = step(agents, left, actions)
+            nxt = (nagents, nleft, max(0, wait - 1))
+            if best.get(nxt, g + 2) > g + 1:
+                best[nxt] = g + 1
+                heapq.heappush(frontier, (g + 1 + h(nxt), next(tie), g + 1, nxt))
+    raise ValueError("dirt cannot be cleaned")
+
+
+# ----------------------------
+# Combined bound for a scenario
+# ----------------------------
+def bound(n: int, dirt: Dict[Tuple[int, int], str], actors: Dict[str, Tuple[int, int, str]],
+          max_states: int = DEFAULT_MAX_STATES) -> Dict[str, int]:
+    """
+    explore, clean (cleaners idle until the earliest possible map) and their
+    combination: the fewest cycles any team can complete the task in under
+    the task rules. actors maps colour -> (x, y, orientation name), as in vwsim.Scenario.
+    """
+    poses = [pose_of(*actors[name]) for name in AGENTS]
+    explore = explore_optimum(n, poses[0], max_states)
+    clean = clean_optimum(n, dirt, poses, frozen=explore + 1, max_states=max_states) if dirt else 0
+    return {"explore": explore, "clean": clean, "bound": max(explore + 1, clean)}
+
+
+def optimality_gap(cycles: int, lower_bound: int) -> float:
+    """Relative excess of a run over the lower bound (an upper bound on its true gap)."""
+    return (cycles - lower_bound) / float(lower_bound) if lower_bound else 0.0
@@ -2,18 +2,207 @@
 
 from typing import Iterable, Optional, Set, Tuple, Dict, List
 
-from vacuumworld import run
 from vacuumworld.model.actions.vwactions import VWAction
 from vacuumworld.model.actions.vwmove_action import VWMoveAction
 from vacuumworld.model.actions.vwturn_action import VWTurnAction
 from vacuumworld.model.actions.vwclean_action import VWCleanAction
 from vacuumworld.model.actions.vwidle_action import VWIdleAction
-from vacuumworld.model.actions.vwbroadcast_action import VWBroadcastAction
 from vacuumworld.model.actor.mind.surrogate.vwactor_mind_surrogate import VWActorMindSurrogate
 from vacuumworld.common.vwdirection import VWDirection
 from vacuumworld.common.vworientation import VWOrientation
 from vacuumworld.common.vwcolour import VWColour
 
+from profiling import CycleProfile, HotPathTimer, profile_cycles, timed
+from observation import ObservationSnapshot
+from target_index import DirtIndex, SpatialIndex
+from dimensions import known_size, perception_offsets, size_bounds
+from messages import compose, dispatch, handler, reset_messaging, termination_cycle
+from strategies import (CLEANING_STRATEGIES, DEFAULT_EXPLORATION, EXPLORATION_STRATEGIES, StrategySelector,
+                        default_selector)
+from policy_table import (MOVE, TURN_LEFT, TURN_RIGHT, IDLE, FREE, ACTOR, WALL, NO_TURN, LEFT, RIGHT,
+                          Decision, cell_state, compile_policy)
+
+
+# Opportunistic cleaning during exploration: cleaning costs one cycle on the
+# exploration critical path, while leaving the dirt costs a later visit (the
+# clean plus the detour to reach it) shared among the three cleaning agents.
+EXPLORATION_PHASES = ("find_width", "find_height", "zigzag")
+OPPORTUNISTIC_CLEAN_COST: float = 1.0
+CLEANING_AGENTS: int = 3
+
+# Cooperative exploration (off by default):
+#   relay: orange/green stay idle but broadcast what they perceive, and white
+#          merges the dirt into its map. The reported cells do not change
+#          white's nearest-unobserved order (taking them out pulled it around
+#          and cost 1.5% more cycles than "off"): white only stops exploring
+#          once every cell it has not observed itself has been reported. Over
+#          every layout and start at n=4..15 (5 seeds) it takes fewer cycles
+#          in 42 of 360 runs, more in 19, and 0.5% fewer in total
+#          (benchmarks.py cooperative).
+# The cleaners never move before the map is broadcast, as the task requires.
+COOPERATIVE_MODES = ("off", "relay")
+
+
+# Priority-based yielding between cleaners: an agent next to another actor
+# broadcasts its intent (where it is, the cell it wants next, its priority and
+# how much dirt it has left). When two agents each want the other's cell, the
+# one with less remaining work (then lower priority, then lower ID) steps aside
+# for at most YIELD_CYCLES cycles while the other holds its heading.
+YIELD_CYCLES: int = 4
+AGENT_PRIORITY: Dict[str, int] = {"white": 2, "orange": 1, "green": 0}
+HEADINGS: Dict[VWOrientation, Tuple[int, int]] = {
+    VWOrientation.north: (0, -1), VWOrientation.east: (1, 0), VWOrientation.south: (0, 1), VWOrientation.west: (-1, 0),
+}
+
+
+# ----------------------------
+# Exploration heading
+# ----------------------------
+def exploration_heading(x: int, y: int, target: Tuple[int, int], orient: VWOrientation,
+                        actor_cells: Set[Tuple[int, int]], extent: int, n_known: bool) -> Optional[VWOrientation]:
+    """
+    Orientation for white to explore towards target in: along the longer axis
+    first, unless a cell an actor was seen in lies between white and the
+    target. The cleaners wait in place until the map arrives, so white then
+    follows a shortest path around those cells within [0, extent)^2 instead
+    of turning back and forth in front of them. None if no path reaches the
+    target once n is known.
+    """
+    tx, ty = target
+    dx, dy = tx - x, ty - y
+    if abs(dx) >= abs(dy) and dx != 0:
+        greedy = VWOrientation.east if dx > 0 else VWOrientation.west
+    elif dy != 0:
+        greedy = VWOrientation.south if dy > 0 else VWOrientation.north
+    else:
+        return orient
+    if not any(min(x, tx) <= ax <= max(x, tx) and min(y, ty) <= ay <= max(y, ty) for ax, ay in actor_cells):
+        return greedy
+
+    # Breadth-first from the target until white's cell is reached
+    distance = {target: 0}
+    queue = [target]
+    for cx, cy in queue:
+        if (cx, cy) == (x, y):
+            break
+        for hx, hy in HEADINGS.values():
+            cell = (cx + hx, cy + hy)
+            if cell not in distance and 0 <= cell[0] < extent and 0 <= cell[1] < extent and \
+                    (cell not in actor_cells or cell == (x, y)):
+                distance[cell] = distance[(cx, cy)] + 1
+                queue.append(cell)
+    if (x, y) not in distance:
+        # Until n is known the target may only be cut off inside the cells known so far
+        return None if n_known else greedy
+    # The first step of a shortest path, preferring the usual heading
+    steps = sorted(HEADINGS, key=lambda o: (o != greedy, abs(dx - HEADINGS[o][0]) + abs(dy - HEADINGS[o][1])))
+    return next(o for o in steps if distance.get((x + HEADINGS[o][0], y + HEADINGS[o][1])) == distance[(x, y)] - 1)
+
+
+# ----------------------------
+# Teleoreactive movement rules
+# ----------------------------
+# The movement part of decide() is a pure function of a small discrete state
+# (phase, orientation, desired orientation, forward/left/right cell state and
+# the turn memory), evaluated by white_rule() and cleaner_rule(). They are
+# also compiled into lookup tables over every state (WHITE_POLICY,
+# CLEANER_POLICY), which batchsim.py indexes for whole batches at once. The
+# minds call the rules directly: a table lookup saves under 150ns per white
+# decision and next to nothing per cleaner decision, 0.05% of a part A cycle
+# (benchmarks.py policy).
+ORIENTATIONS = (VWOrientation.north, VWOrientation.east, VWOrientation.south, VWOrientation.west)
+ORIENTATION_INDEX: Dict[VWOrientation, int] = {o: i for i, o in enumerate(ORIENTATIONS)}
+_NORTH, _EAST, _SOUTH, _WEST = range(4)
+
+TURN_DIRECTIONS = (None, VWDirection.left, VWDirection.right)
+TURN_INDEX: Dict[Optional[VWDirection], int] = {d: i for i, d in enumerate(TURN_DIRECTIONS)}
+
+WHITE_POLICY_PHASES = ("find_width", "find_height", "zigzag", "cleaning")
+WHITE_PHASE_INDEX: Dict[str, int] = {p: i for i, p in enumerate(WHITE_POLICY_PHASES)}
+
+
+def make_action(code: int) -> VWAction:
+    if code == MOVE:
+        return VWMoveAction()
+    if code == TURN_LEFT:
+        return VWTurnAction(VWDirection.left)
+    if code == TURN_RIGHT:
+        return VWTurnAction(VWDirection.right)
+    return VWIdleAction()
+
+
+def white_rule(phase: int, orient: int, desired: int, forward: int, left: int, right: int,
+               just_turned: int, turn: int) -> Decision:
+    just_turned = bool(just_turned)
+
+    # --- Find width / height: face east (south), walk to the wall ---
+    if phase in (0, 1):
+        heading, axis, side = (_EAST, "width", "east") if phase == 0 else (_SOUTH, "height", "south")
+        if orient != heading:
+            return TURN_RIGHT, just_turned, turn, f"[WHITE] Turning to face {side} to find {axis}"
+        if forward != WALL:
+            return MOVE, just_turned, turn, f"[WHITE] Moving {side} to find {axis}"
+        return IDLE, just_turned, turn, f"[WHITE] Idle at {side} wall during {axis} finding"
+
+    # --- Cleaning: head for the target, sidestep when blocked ---
+    if phase == 3:
+        if forward == FREE:
+            return MOVE, just_turned, turn, "[WHITE] Moving toward cleaning target"
+        # Sidestep into a free cell before a wall, or white swings between two walls in a corner
+        if left == FREE or (left != ACTOR and right != FREE):
+            return TURN_LEFT, just_turned, turn, "[WHITE] Forward blocked, turning left toward cleaning target"
+        if right != ACTOR:
+            return TURN_RIGHT, just_turned, turn, "[WHITE] Forward blocked, turning right toward cleaning target"
+        return IDLE, just_turned, turn, "[WHITE] Forward blocked, cannot move, idling"
+
+    # --- Perception-aware zigzag: actor avoidance ---
+    if forward == ACTOR:
+        if left == FREE:
+            return TURN_LEFT, True, LEFT, "[WHITE] Actor ahead, turning left to avoid"
+        if right == FREE:
+            return TURN_RIGHT, True, RIGHT, "[WHITE] Actor ahead, turning right to avoid"
+        # Boxed in by idle cleaners: they will not move before the map, so turn to the way out
+        if orient != desired:
+            return TURN_RIGHT, False, turn, "[WHITE] Actor ahead, no escape, turning back"
+        return IDLE, just_turned, turn, "[WHITE] Actor ahead, no escape, idling"
+
+    # --- After just turned, move forward if possible, else revert the turn ---
+    if just_turned:
+        if forward == FREE:
+            return MOVE, False, turn, "[WHITE] Moving forward after turn"
+        return (TURN_LEFT if turn == RIGHT else TURN_RIGHT), False, turn, \
+            "[WHITE] Cannot move forward after turn, turning back"
+
+    # --- Normal zigzag execution ---
+    if orient != desired:
+        return TURN_RIGHT, False, turn, f"[WHITE] Turning to desired orientation {ORIENTATIONS[desired].name}"
+    return MOVE, False, turn, "[WHITE] Moving forward in zigzag"
+
+
+def cleaner_rule(orient: int, desired: int, forward: int, left: int, right: int, just_turned: int) -> Decision:
+    blocked = forward != FREE
+
+    # --- If facing wrong direction, turn toward target ---
+    if orient != desired:
+        return TURN_RIGHT, True, NO_TURN, ""
+
+    # --- Attempt forward movement (whether or not we just turned) ---
+    if not blocked:
+        return MOVE, False, NO_TURN, ""
+
+    # --- If blocked, try left, then right; a wall counts as free ---
+    if left != ACTOR:
+        return TURN_LEFT, True, NO_TURN, ""
+    if right != ACTOR:
+        return TURN_RIGHT, True, NO_TURN, ""
+
+    # --- Fully stuck, idle ---
+    return IDLE, False, NO_TURN, ""
+
+
+WHITE_POLICY = compile_policy(white_rule, (len(WHITE_POLICY_PHASES), 4, 4, 3, 3, 3, 2, len(TURN_DIRECTIONS)))
+CLEANER_POLICY = compile_policy(cleaner_rule, (4, 4, 3, 3, 3, 2))
+
 
 # ----------------------------
 # WhiteMind: perception-aware zigzag + simultaneous cleaning
@@ -22,178 +211,285 @@ from vacuumworld.common.vwcolour import VWColour
 # WhiteMind: perception-aware zigzag + simultaneous cleaning
 # ----------------------------
 class WhiteMind(VWActorMindSurrogate):
-    def __init__(self) -> None:
+    colour_name = "white"
+
+    # Internal model saved by checkpoint.save_checkpoint()
+    CHECKPOINT_FIELDS = ("known_width", "known_height", "size_lower", "size_upper", "frontier",
+                         "dirt_map", "visited", "observed", "unobserved", "relayed",
+                         "phase", "zigzag_dir", "cleaned", "remaining", "map_broadcasted",
+                         "just_turned", "turn_direction", "exploration", "cleaning_strategy",
+                         "actor_positions", "actor_cells", "message_seq", "seen_seq", "pending_cleaned",
+                         "outbox", "cycle", "last_work_cycle", "statuses", "reported_done")
+
+    def __init__(self, opportunistic_cleaning: bool = True, exploration: Optional[str] = None,
+                 cleaning_strategy: Optional[str] = None, selector: Optional[StrategySelector] = None,
+                 cooperative: str = "off") -> None:
         super().__init__()
+        if cooperative not in COOPERATIVE_MODES:
+            raise ValueError(f"unknown cooperative mode {cooperative!r}")
+        self.opportunistic_cleaning: bool = opportunistic_cleaning
+        # Cooperative exploration (see COOPERATIVE_MODES)
+        self.cooperative: str = cooperative
+        # Strategies (see strategies.py): given here, or chosen by the selector
+        # on the first cycle (exploration) and once the map is complete (cleaning)
+        self.selector: StrategySelector = selector if selector is not None else default_selector()
+        self.fixed_exploration: Optional[str] = exploration
+        self.fixed_cleaning_strategy: Optional[str] = cleaning_strategy
+        self.reset()
+
+    def reset(self) -> None:
+        """Start a new episode: forget everything but the configuration given to the constructor."""
+        self.actor_positions: Dict[str, Tuple[int, int]] = {}
+        # Cells an actor was last seen in (or reported from), routed around while exploring
+        self.actor_cells: Set[Tuple[int, int]] = set()
+
+        reset_messaging(self)
+
+        self.exploration: Optional[str] = self.fixed_exploration
+        self.cleaning_strategy: Optional[str] = self.fixed_cleaning_strategy
         self.known_width: Optional[int] = None
         self.known_height: Optional[int] = None
+        # size_lower <= n <= size_upper from perceptions (dimensions.py); the grid is n x n
+        self.size_lower: int = 1
+        self.size_upper: Optional[int] = None
 
         self.dirt_map: Dict[Tuple[int, int], str] = {}
         self.visited: Set[Tuple[int, int]] = set()
         self.observed: Set[Tuple[int, int]] = set()  # track all observed cells
+        self.relayed: Set[Tuple[int, int]] = set()   # reported by orange/green, not observed by white yet
+        self.unobserved: Optional[SpatialIndex] = None   # cells still to observe, built when zigzag starts
+        self.frontier: int = 0      # unobserved covers the cells with max(x, y) < frontier
 
-        self.phase: str = "find_width"
+        self.phase: str = EXPLORATION_STRATEGIES[self.exploration or DEFAULT_EXPLORATION][0]
         self.zigzag_dir: str = "west"
 
         self.cleaned: Set[Tuple[int, int]] = set()
+        self.remaining: DirtIndex = DirtIndex()         # dirt still to clean, built when the map is broadcast
         self.map_broadcasted: bool = False
 
         # Flags for actor avoidance
         self.just_turned: bool = False
         self.turn_direction: Optional[VWDirection] = None
 
+        # Observation decoded once per cycle in revise(), reused by decide()
+        self.snapshot: Optional[ObservationSnapshot] = None
+
+        self.cycle_profile: CycleProfile = CycleProfile("white")
+        self.timings: HotPathTimer = HotPathTimer("white")
+
+    def current_phase(self) -> str:
+        return self.phase
+
+    def work_done(self) -> bool:
+        return self.map_broadcasted and not self.remaining
+
+    def work_left(self) -> int:
+        return len(self.remaining) if self.map_broadcasted else len(self.dirt_map)
+
+    def termination_cycle(self) -> Optional[int]:
+        return termination_cycle(self)
+
+    @handler("status")
+    def receive_status(self, status: Dict[str, object], sender: str) -> None:
+        self.statuses[status["from"]] = status
+
+    @timed("revise")
     def revise(self) -> None:
+        self.cycle += 1
         try:
-            pos = self.get_own_position()
-            x, y = int(pos.get_x()), int(pos.get_y())
-            orient = self.get_own_orientation()
+            self.snapshot = None
+            with self.timings.section("observe"):
+                snap = self.snapshot = ObservationSnapshot.decode(
+                    self.get_latest_observation(), self.get_own_position(), self.get_own_orientation())
+            x, y = snap.position
+            orient = snap.orientation
             self.visited.add((x, y))
             print(f"[WHITE] Cycle info - Position: ({x},{y}), Orientation: {orient.name}")
 
-            obs = self.get_latest_observation()
+            if self.exploration is None:
+                self.exploration = self.selector.select_exploration((x, y), orient)
+                self.phase = EXPLORATION_STRATEGIES[self.exploration][0]
+                print(f"[WHITE] Exploration strategy: {self.exploration}")
 
             # Update observed squares exploiting perception
-            for getter in [obs.get_center, obs.get_forward, obs.get_left,
-                           obs.get_right, obs.get_forwardleft, obs.get_forwardright]:
-                opt_loc = getter()
-                if not opt_loc.is_empty():
-                    loc = opt_loc.or_else_raise()
-                    cpos = (int(loc.get_coord().get_x()), int(loc.get_coord().get_y()))
-                    self.observed.add(cpos)
-
-                    if loc.has_dirt():
-                        dirt_app = loc.get_dirt_appearance().or_else_raise()
-                        colour = str(dirt_app.get_colour())
-                        if cpos not in self.dirt_map:
-                            self.dirt_map[cpos] = colour
-                            print(f"[WHITE] Found {colour} dirt at {cpos}")
-
-            # Infer width/height
-            if self.phase == "find_width" and orient == VWOrientation.east and obs.is_wall_immediately_ahead():
-                self.known_width = x + 1
-                self.phase = "find_height"
-                print(f"[WHITE] Grid width inferred: {self.known_width}")
-            elif self.phase == "find_height" and orient == VWOrientation.south and obs.is_wall_immediately_ahead():
-                self.known_height = y + 1
-                self.phase = "zigzag"
-                self.zigzag_dir = "west"
-                print(f"[WHITE] Grid height inferred: {self.known_height}")
-                print(f"[WHITE] Starting perception-aware zigzag from bottom-right ({self.known_width-1},{self.known_height-1})")
+            for cell in snap.cells():
+                self.observed.add(cell.pos)
+                self.relayed.discard(cell.pos)
+                if cell.has_actor and cell.pos != (x, y):
+                    self.actor_cells.add(cell.pos)
+                else:
+                    self.actor_cells.discard(cell.pos)
+                if self.unobserved is not None:
+                    self.unobserved.discard(cell.pos)
+                if cell.has_dirt and cell.pos not in self.dirt_map:
+                    self.dirt_map[cell.pos] = cell.dirt_colour
+                    if self.map_broadcasted and cell.pos not in self.cleaned:
+                        self.remaining.add(cell.pos, cell.dirt_colour)
+                    print(f"[WHITE] Found {cell.dirt_colour} dirt at {cell.pos}")
+                elif not cell.has_dirt and cell.pos in self.remaining:
+                    # Cleaned by someone else since it was mapped
+                    self.remaining.discard(cell.pos)
+                    self.cleaned.add(cell.pos)
+                    self.pending_cleaned.append(cell.pos)
+
+            # Merge observations reported by orange/green
+            dispatch(self, self.get_latest_received_messages())
+
+            # Dirt cleaned opportunistically last cycle must not be broadcast
+            if self.phase in EXPLORATION_PHASES and (x, y) in self.dirt_map and \
+                    snap.center is not None and not snap.center.has_dirt:
+                del self.dirt_map[(x, y)]
+                self.cleaned.add((x, y))
+                print(f"[WHITE] Dropped cleaned cell {(x, y)} from dirt map")
+
+            # Infer the grid size from walls anywhere in the perception window
+            self.size_lower, self.size_upper = size_bounds(snap, self.size_lower, self.size_upper)
+            n = known_size(self.size_lower, self.size_upper)
+            if n is not None and self.known_width is None:
+                self.known_width = self.known_height = n
+                # Rebuilt over the whole grid in row order, so nearest-cell ties sweep column by column
+                self.unobserved, self.frontier = None, 0
+                print(f"[WHITE] Grid size inferred: {n}x{n}")
+                if self.phase in ("find_width", "find_height"):
+                    self.phase = "zigzag"
+                    print(f"[WHITE] Starting perception-aware zigzag from ({x},{y})")
+            if self.phase == "zigzag":
+                self.grow_frontier()
 
         except Exception as e:
             print(f"[WHITE] revise error: {e}")
 
+    @handler("cleaned")
+    def receive_cleaned(self, event: Dict[str, object], sender: str) -> None:
+        for cx, cy in event["cells"]:
+            pos = (int(cx), int(cy))
+            self.cleaned.add(pos)
+            self.remaining.discard(pos)
+            if not self.map_broadcasted:
+                self.dirt_map.pop(pos, None)
+
+    @handler("observed")
+    def merge_report(self, report: Dict[str, object], sender: str) -> None:
+        """Add the cells another agent perceived to the map."""
+        self.actor_positions[report["from"]] = (int(report["at"][0]), int(report["at"][1]))
+        self.actor_cells.add(self.actor_positions[report["from"]])
+        for cx, cy, colour in report["cells"]:
+            pos = (int(cx), int(cy))
+            self.size_lower = max(self.size_lower, pos[0] + 1, pos[1] + 1)
+            if pos not in self.observed:
+                self.relayed.add(pos)
+            if colour and pos not in self.dirt_map and pos not in self.cleaned:
+                self.dirt_map[pos] = colour
+                print(f"[WHITE] {report['from']} found {colour} dirt at {pos}")
+
+    def grow_frontier(self) -> None:
+        """
+        Extend the unobserved cells to the grid, or while n is still unknown to
+        one ring past the cells known to exist, so that exploring it either
+        finds more grid or perceives the wall. Only the new ring is added.
+        """
+        extent = self.known_width if self.known_width is not None else self.size_lower + 1
+        if self.unobserved is None:
+            self.unobserved = SpatialIndex()
+        if extent > self.frontier:
+            # The cells with frontier <= max(i, j) < extent, in row order
+            for i in range(extent):
+                for j in range(0 if i >= self.frontier else self.frontier, extent):
+                    if (i, j) not in self.observed:
+                        self.unobserved.add((i, j))
+            self.frontier = extent
+
+    def exploration_target(self, x: int, y: int) -> Optional[Tuple[int, int]]:
+        """
+        Nearest unobserved cell; while n is unknown, the ring cell straight
+        along the longer axis instead, so white walks to the nearer wall as
+        find_width/find_height would rather than staircasing along the ring.
+        """
+        if self.known_width is None:
+            ring = self.frontier - 1
+            cell = (ring, y) if x >= y else (x, ring)
+            if cell in self.unobserved:
+                return cell
+        return self.unobserved.nearest(x, y)
+
+    def should_clean_during_exploration(self, cpos: Tuple[int, int]) -> bool:
+        """
+        Policy hook: clean the dirt under white while exploring only when the
+        expected saving of not having to come back exceeds the cycle spent now.
+        """
+        if not self.opportunistic_cleaning:
+            return False
+
+        others = [d for d in self.dirt_map if d != cpos and d not in self.cleaned]
+        if not others:
+            # Isolated dirt: whoever cleans it later has to make a dedicated trip
+            return True
+
+        detour = min(abs(d[0] - cpos[0]) + abs(d[1] - cpos[1]) for d in others)
+        expected_saving = (1 + detour) / CLEANING_AGENTS
+        return expected_saving > OPPORTUNISTIC_CLEAN_COST
+
+    def apply_policy(self, orient: VWOrientation, desired: VWOrientation, snap: ObservationSnapshot) -> VWAction:
+        """Evaluate white_rule for the current state and update the turn memory."""
+        state = (WHITE_PHASE_INDEX[self.phase], ORIENTATION_INDEX[orient], ORIENTATION_INDEX[desired],
+                 cell_state(snap.forward, snap.wall_ahead), cell_state(snap.left), cell_state(snap.right),
+                 int(self.just_turned), TURN_INDEX[self.turn_direction])
+        action, self.just_turned, turn, message = white_rule(*state)
+        self.turn_direction = TURN_DIRECTIONS[turn]
+        print(message)
+        return make_action(action)
+
+    @profile_cycles
+    @timed("decide")
     def decide(self) -> Iterable[VWAction]:
         try:
-            pos = self.get_own_position()
-            x, y = int(pos.get_x()), int(pos.get_y())
-            orient = self.get_own_orientation()
-            obs = self.get_latest_observation()
+            snap = self.snapshot
+            if snap is None:
+                return [VWIdleAction()]
+            x, y = snap.position
+            orient = snap.orientation
 
             print(f"[WHITE] Decide - Phase: {self.phase}, Position: ({x},{y}), Orientation: {orient.name}")
 
-            # --- Find width ---
-            if self.phase == "find_width":
-                if orient != VWOrientation.east:
-                    print("[WHITE] Turning to face east to find width")
-                    return [VWTurnAction(VWDirection.right)]
-                if not obs.is_wall_immediately_ahead():
-                    print("[WHITE] Moving east to find width")
-                    return [VWMoveAction()]
-                print("[WHITE] Idle at east wall during width finding")
-                return [VWIdleAction()]
+            # --- Opportunistic cleaning while exploring ---
+            if self.phase in EXPLORATION_PHASES:
+                if snap.dirt_here() is not None and (x, y) in self.dirt_map and \
+                        self.should_clean_during_exploration((x, y)):
+                    print(f"[WHITE] Cleaning dirt at {(x, y)} during exploration")
+                    self.last_work_cycle = self.cycle
+                    return compose(self, VWCleanAction())
 
-            # --- Find height ---
-            if self.phase == "find_height":
-                if orient != VWOrientation.south:
-                    print("[WHITE] Turning to face south to find height")
-                    return [VWTurnAction(VWDirection.right)]
-                if not obs.is_wall_immediately_ahead():
-                    print("[WHITE] Moving south to find height")
-                    return [VWMoveAction()]
-                print("[WHITE] Idle at south wall during height finding")
-                return [VWIdleAction()]
+            # --- Find width / height ---
+            if self.phase in ("find_width", "find_height"):
+                return compose(self, self.apply_policy(orient, orient, snap))
 
             # --- Perception-aware zigzag ---
             if self.phase == "zigzag":
                 print(f"[WHITE] Zigzag direction: {self.zigzag_dir}")
 
-                maxX = self.known_width - 1
-                maxY = self.known_height - 1
-
-                unobs = [(i, j) for i in range(self.known_width) for j in range(self.known_height)
-                        if (i, j) not in self.observed]
-
-                if not unobs:
+                with self.timings.section("select_target"):
+                    # Pick nearest unobserved, giving up on cells no path reaches;
+                    # once there is none, broadcast this cycle
+                    desired = None
+                    extent = max(self.known_width or self.frontier, x + 1, y + 1)
+                    target = self.exploration_target(x, y)
+                    if self.known_width is not None and len(self.unobserved) <= len(self.relayed):
+                        target = None   # what is left was reported by orange/green
+                    while target is not None:
+                        desired = exploration_heading(x, y, (int(target[0]), int(target[1])), orient,
+                                                      self.actor_cells, extent, self.known_width is not None)
+                        if desired is not None:
+                            break
+                        print(f"[WHITE] No path to {target} around the other actors, giving it up")
+                        self.unobserved.discard(target)
+                        self.observed.add(target)
+                        self.relayed.discard(target)
+                        target = self.exploration_target(x, y)
+                if target is None:
                     print("[WHITE] All cells observed, switching to broadcasting")
                     self.phase = "broadcasting"
-                    return [VWIdleAction()]
-
-                # Pick nearest unobserved
-                target = min(unobs, key=lambda t: abs(t[0]-x)+abs(t[1]-y))
-                tx, ty = int(target[0]), int(target[1])
-                dx, dy = tx - x, ty - y
-
-                if abs(dx) >= abs(dy) and dx != 0:
-                    desired = VWOrientation.east if dx > 0 else VWOrientation.west
-                elif dy != 0:
-                    desired = VWOrientation.south if dy > 0 else VWOrientation.north
                 else:
-                    desired = orient
-
-                fwd = obs.get_forward()
-                forward_blocked_by_actor = (not fwd.is_empty() and fwd.or_else_raise().has_actor())
-                forward_blocked_by_wall = obs.is_wall_immediately_ahead()
-
-                # --- Actor avoidance ---
-                if forward_blocked_by_actor and not forward_blocked_by_wall:
-                    left_obs = obs.get_left()
-                    right_obs = obs.get_right()
-
-                    left_free = False
-                    right_free = False
-
-                    if not left_obs.is_empty():
-                        left_free = not left_obs.or_else_raise().has_actor()
-                    if not right_obs.is_empty():
-                        right_free = not right_obs.or_else_raise().has_actor()
-
-                    if left_free:
-                        self.just_turned = True
-                        self.turn_direction = VWDirection.left
-                        print("[WHITE] Actor ahead, turning left to avoid")
-                        return [VWTurnAction(VWDirection.left)]
-                    elif right_free:
-                        self.just_turned = True
-                        self.turn_direction = VWDirection.right
-                        print("[WHITE] Actor ahead, turning right to avoid")
-                        return [VWTurnAction(VWDirection.right)]
-                    else:
-                        print("[WHITE] Actor ahead, no escape, idling")
-                        return [VWIdleAction()]
-
-                # --- After just turned, move forward if possible ---
-                if self.just_turned:
-                    self.just_turned = False
-                    fwd = obs.get_forward()
-                    forward_blocked_by_actor = (not fwd.is_empty() and fwd.or_else_raise().has_actor())
-                    forward_blocked_by_wall = obs.is_wall_immediately_ahead()
-                    if not forward_blocked_by_actor and not forward_blocked_by_wall:
-                        print("[WHITE] Moving forward after turn")
-                        return [VWMoveAction()]
-                    else:
-                        # If can't move forward after turn, revert turn
-                        if hasattr(self, "turn_direction"):
-                            opposite = VWDirection.left if self.turn_direction == VWDirection.right else VWDirection.right
-                            print("[WHITE] Cannot move forward after turn, turning back")
-                            return [VWTurnAction(opposite)]
-
-                # --- Normal zigzag execution ---
-                if orient != desired:
-                    print(f"[WHITE] Turning to desired orientation {desired.name}")
-                    return [VWTurnAction(VWDirection.right)]
-
-                print("[WHITE] Moving forward in zigzag")
-                return [VWMoveAction()]
+                    return compose(self, self.apply_policy(orient, desired, snap))
 
             # --- Broadcasting dirt map ---
             if self.phase == "broadcasting":
@@ -201,30 +497,34 @@ class WhiteMind(VWActorMindSurrogate):
                 for (dx, dy), colour in self.dirt_map.items():
                     dirt_list.append({"x": int(dx), "y": int(dy), "colour": colour})
                 self.map_broadcasted = True
+                self.last_work_cycle = self.cycle
+                self.remaining = DirtIndex((pos, colour) for pos, colour in self.dirt_map.items() if pos not in self.cleaned)
+                if self.cleaning_strategy is None:
+                    self.cleaning_strategy = self.selector.select_cleaning(self.known_width, len(self.remaining))
+                    print(f"[WHITE] Cleaning strategy: {self.cleaning_strategy}")
                 self.phase = "cleaning"
                 print(f"[WHITE] Broadcasting map with {len(dirt_list)} dirt locations")
-                return [VWBroadcastAction(message={"dirt": dirt_list}, sender_id=self.get_own_id())]
+                # Sent with the first cleaning action below
+                self.outbox.insert(0, {"dirt": dirt_list})
 
             # --- Cleaning phase ---
             if self.phase == "cleaning":
-                center = obs.get_center()
-                if not center.is_empty():
-                    c = center.or_else_raise()
-                    if c.has_dirt():
-                        coord = c.get_coord()
-                        cpos = (int(coord.get_x()), int(coord.get_y()))
-                        if cpos not in self.cleaned:
-                            self.cleaned.add(cpos)
-                            print(f"[WHITE] Cleaning dirt at {cpos}")
-                            return [VWCleanAction()]
-
-                remaining_dirt = [pos for pos in self.dirt_map.keys() if pos not in self.cleaned]
-                if not remaining_dirt:
-                    print("[WHITE] No remaining dirt, idling")
-                    return [VWIdleAction()]
-
-                # Move toward closest dirt
-                target = min(remaining_dirt, key=lambda t: abs(int(t[0]) - x) + abs(int(t[1]) - y))
+                if snap.dirt_here() is not None:
+                    cpos = snap.center.pos
+                    if cpos not in self.cleaned:
+                        self.cleaned.add(cpos)
+                        self.remaining.discard(cpos)
+                        self.pending_cleaned.append(cpos)
+                        self.last_work_cycle = self.cycle
+                        print(f"[WHITE] Cleaning dirt at {cpos}")
+                        return compose(self, VWCleanAction())
+
+                with self.timings.section("select_target"):
+                    # Move toward closest dirt
+                    target = CLEANING_STRATEGIES[self.cleaning_strategy](self.remaining, x, y)
+                    if target is None:
+                        print("[WHITE] No remaining dirt, idling")
+                        return compose(self, VWIdleAction())
                 tx, ty = int(target[0]), int(target[1])
                 dx, dy = tx - x, ty - y
 
@@ -235,28 +535,10 @@ class WhiteMind(VWActorMindSurrogate):
                 else:
                     desired = orient
 
-                fwd = obs.get_forward()
-                left = obs.get_left()
-                right = obs.get_right()
-
-                forward_blocked = (not fwd.is_empty() and fwd.or_else_raise().has_actor()) or obs.is_wall_immediately_ahead()
-                left_free = left.is_empty() or not left.or_else_raise().has_actor()
-                right_free = right.is_empty() or not right.or_else_raise().has_actor()
-
-                if not forward_blocked:
-                    print("[WHITE] Moving toward cleaning target")
-                    return [VWMoveAction()]
-                if forward_blocked and left_free:
-                    print("[WHITE] Forward blocked, turning left toward cleaning target")
-                    return [VWTurnAction(VWDirection.left)]
-                if forward_blocked and right_free:
-                    print("[WHITE] Forward blocked, turning right toward cleaning target")
-                    return [VWTurnAction(VWDirection.right)]
-                print("[WHITE] Forward blocked, cannot move, idling")
-                return [VWIdleAction()]
+                return compose(self, self.apply_policy(orient, desired, snap))
 
             print("[WHITE] No specific phase action, idling")
-            return [VWIdleAction()]
+            return compose(self, VWIdleAction())
 
         except Exception as e:
             print(f"[WHITE] decide error: {e}")
@@ -267,136 +549,271 @@ class WhiteMind(VWActorMindSurrogate):
 # OrangeMind & GreenMind with proper collision avoidance
 # ----------------------------
 class BaseCleanerMind(VWActorMindSurrogate):
-    def __init__(self, colour_name: str) -> None:
+    # Internal model saved by checkpoint.save_checkpoint()
+    CHECKPOINT_FIELDS = ("map_received", "targets", "cleaned", "just_turned", "last_positions",
+                         "reported", "pending_report", "yield_left", "yield_target",
+                         "message_seq", "seen_seq", "pending_cleaned", "outbox", "cycle", "last_work_cycle",
+                         "statuses", "reported_done")
+
+    def __init__(self, colour_name: str, cooperative: str = "off", yielding: bool = True) -> None:
         super().__init__()
+        if cooperative not in COOPERATIVE_MODES:
+            raise ValueError(f"unknown cooperative mode {cooperative!r}")
         self.colour_name = colour_name.lower()
+        self.yielding: bool = yielding
+        self.cooperative: str = cooperative
+        self.reset()
+
+    def reset(self) -> None:
+        """Start a new episode: forget everything but the configuration given to the constructor."""
+        # Priority-based yielding (see YIELD_CYCLES): intents received this
+        # cycle, by sender, and the side cell being yielded to
+        self.intents: Dict[str, Dict[str, object]] = {}
+        self.yield_left: int = 0
+        self.yield_target: Optional[Tuple[int, int]] = None
+
+        reset_messaging(self)
+
+        # Cooperative exploration (see COOPERATIVE_MODES): cells perceived and
+        # reported to white so far
+        self.reported: Set[Tuple[int, int]] = set()
+        self.pending_report: List[List[object]] = []
         self.map_received: bool = False
-        self.targets: Set[Tuple[int, int]] = set()
+        self.targets: SpatialIndex = SpatialIndex()     # dirt of this agent's colour still to clean
         self.cleaned: Set[Tuple[int, int]] = set()
 
         self.just_turned: bool = False
         self.last_positions: List[Tuple[int, int]] = []     # loop detection
 
+        self.snapshot: Optional[ObservationSnapshot] = None
+
+        self.cycle_profile: CycleProfile = CycleProfile(self.colour_name)
+        self.timings: HotPathTimer = HotPathTimer(self.colour_name)
+
+    def work_done(self) -> bool:
+        return self.map_received and not self.targets
+
+    def work_left(self) -> int:
+        return len(self.targets)
+
+    def termination_cycle(self) -> Optional[int]:
+        return termination_cycle(self)
+
+    def current_phase(self) -> str:
+        if not self.map_received:
+            return "waiting"
+        if self.yield_left > 0:
+            return "yielding"
+        return "cleaning" if self.targets else "done"
+
+    @timed("revise")
     def revise(self) -> None:
+        self.cycle += 1
         try:
-            pos = self.get_own_position()
-            x, y = int(pos.get_x()), int(pos.get_y())
-            obs = self.get_latest_observation()
+            self.snapshot = None
+            with self.timings.section("observe"):
+                snap = self.snapshot = ObservationSnapshot.decode(
+                    self.get_latest_observation(), self.get_own_position(), self.get_own_orientation())
+            x, y = snap.position
 
             # store last 4 positions for loop detection
             self.last_positions.append((x, y))
             if len(self.last_positions) > 4:
                 self.last_positions.pop(0)
 
-            # process broadcasted map
-            for msg in self.get_latest_received_messages():
-                content = msg.get_content()
-                if isinstance(content, dict) and "dirt" in content and not self.map_received:
-                    self.map_received = True
-                    for entry in content["dirt"]:
-                        pos_tuple = (int(entry["x"]), int(entry["y"]))
-                        if self.colour_name in entry["colour"].lower():
-                            self.targets.add(pos_tuple)
-
-            # Remove cleaned targets automatically
-            center = obs.get_center()
-            if not center.is_empty():
-                c = center.or_else_raise()
-                coord = c.get_coord()
-                cpos = (int(coord.get_x()), int(coord.get_y()))
-                if not c.has_dirt() and cpos in self.targets:
-                    self.targets.remove(cpos)
-                    self.cleaned.add(cpos)
+            # process broadcasted map and intents
+            self.intents = {}
+            dispatch(self, self.get_latest_received_messages())
+
+            # Cooperative exploration: queue newly perceived cells for white
+            if self.cooperative != "off" and not self.map_received:
+                for cell in snap.cells():
+                    if cell.pos not in self.reported:
+                        self.reported.add(cell.pos)
+                        self.pending_report.append([cell.pos[0], cell.pos[1], cell.dirt_colour or ""])
+
+            # Drop targets seen clean anywhere in view, and tell the others
+            for cell in snap.cells():
+                if cell.pos in self.targets and cell.dirt_colour != self.colour_name:
+                    self.targets.discard(cell.pos)
+                    self.cleaned.add(cell.pos)
+                    self.pending_cleaned.append(cell.pos)
 
         except Exception as e:
             print(f"[{self.colour_name.upper()}] revise error: {e}")
 
+    # --- Message handlers (messages.dispatch) ---
+    @handler("dirt")
+    def receive_map(self, dirt: List[Dict[str, object]], sender: str) -> None:
+        if self.map_received:
+            return
+        self.map_received = True
+        for entry in dirt:
+            if self.colour_name in entry["colour"].lower():
+                self.targets.add((entry["x"], entry["y"]))
+
+    @handler("intent")
+    def receive_intent(self, intent: Dict[str, object], sender: str) -> None:
+        if intent["from"] != self.colour_name:
+            self.intents[intent["from"]] = intent
+
+    @handler("cleaned")
+    def receive_cleaned(self, event: Dict[str, object], sender: str) -> None:
+        for cx, cy in event["cells"]:
+            pos = (int(cx), int(cy))
+            self.cleaned.add(pos)
+            self.targets.discard(pos)
+
+    @handler("status")
+    def receive_status(self, status: Dict[str, object], sender: str) -> None:
+        self.statuses[status["from"]] = status
+
+    @profile_cycles
+    @timed("decide")
     def decide(self) -> Iterable[VWAction]:
         try:
-            pos = self.get_own_position()
-            x, y = int(pos.get_x()), int(pos.get_y())
-            orient = self.get_own_orientation()
-            obs = self.get_latest_observation()
+            snap = self.snapshot
+            # --- Before the map: stay put, but report what we see ---
+            if snap is not None and not self.map_received and self.cooperative != "off":
+                report = None
+                if self.pending_report:
+                    report = {"observed": {"cells": self.pending_report, "from": self.colour_name,
+                                           "at": list(snap.position)}}
+                    self.pending_report = []
+                return compose(self, VWIdleAction(), report)
 
             # If not ready, idle
-            if not self.map_received or not self.targets:
+            if snap is None or not self.map_received:
                 return [VWIdleAction()]
+            # Done: only move to make way for others
+            if not self.targets:
+                return compose(self, self.negotiate(snap, None) if self.yielding else VWIdleAction())
 
             # --- Clean dirt if standing on it ---
-            center = obs.get_center()
-            if not center.is_empty():
-                c = center.or_else_raise()
-                if c.has_dirt():
-                    coord = c.get_coord()
-                    cpos = (int(coord.get_x()), int(coord.get_y()))
-                    dirt_app = c.get_dirt_appearance().or_else_raise()
-                    if dirt_app.get_colour().name.lower() == self.colour_name:
-                        self.cleaned.add(cpos)
-                        return [VWCleanAction()]
-
-            # --- Pick nearest target ---
-            target = min(self.targets, key=lambda t: abs(t[0] - x) + abs(t[1] - y))
-            tx, ty = target
-            dx, dy = tx - x, ty - y
-
-            if dx != 0:
-                desired = VWOrientation.east if dx > 0 else VWOrientation.west
-            elif dy != 0:
-                desired = VWOrientation.south if dy > 0 else VWOrientation.north
-            else:
-                desired = orient
-
-            forward = obs.get_forward()
-            left = obs.get_left()
-            right = obs.get_right()
-
-            forward_blocked = obs.is_wall_immediately_ahead() or \
-                            (not forward.is_empty() and forward.or_else_raise().has_actor())
-            left_free = left.is_empty() or not left.or_else_raise().has_actor()
-            right_free = right.is_empty() or not right.or_else_raise().has_actor()
-
-            # --- If facing wrong direction, turn toward target ---
-            if orient != desired:
-                self.just_turned = True
-                return [VWTurnAction(VWDirection.right)]
-
-            # --- If just turned last cycle, attempt forward ---
-            if self.just_turned:
-                self.just_turned = False
-                if not forward_blocked:
-                    return [VWMoveAction()]
-
-            # --- Attempt forward movement ---
-            if not forward_blocked:
-                return [VWMoveAction()]
-
-            # --- If blocked, try left ---
-            if left_free:
-                self.just_turned = True
-                return [VWTurnAction(VWDirection.left)]
-
-            # --- If blocked, try right ---
-            if right_free:
-                self.just_turned = True
-                return [VWTurnAction(VWDirection.right)]
-
-            # --- Fully stuck, idle ---
-            return [VWIdleAction()]
+            if snap.dirt_here() == self.colour_name:
+                self.cleaned.add(snap.center.pos)
+                self.targets.discard(snap.center.pos)
+                self.pending_cleaned.append(snap.center.pos)
+                self.last_work_cycle = self.cycle
+                return compose(self, VWCleanAction())
+
+            # --- Pick nearest target; ties go to the target broadcast first ---
+            # (map order rather than set order: it does not hang on hashing or
+            # removal history, and a checkpoint restores it)
+            with self.timings.section("select_target"):
+                target = self.targets.nearest(*snap.position)
+            if not self.yielding:
+                return compose(self, self.step_towards(snap, target))
+
+            # --- Head-on conflicts: yield or hold, and tell neighbours where we are going ---
+            action = self.negotiate(snap, target)
+            wanted = self.yield_target if self.yield_left > 0 else target
+            if any(cell.has_actor for cell in (snap.forward, snap.left, snap.right) if cell is not None):
+                return compose(self, action, self.intent(snap, wanted))
+            return compose(self, action)
 
         except Exception as e:
             print(f"[{self.colour_name.upper()}] decide error: {e}")
             return [VWIdleAction()]
 
+    def heading(self, snap: ObservationSnapshot, target: Tuple[int, int]) -> VWOrientation:
+        """Orientation to move in towards target: x first, then y."""
+        x, y = snap.position
+        dx, dy = target[0] - x, target[1] - y
+        if dx != 0:
+            return VWOrientation.east if dx > 0 else VWOrientation.west
+        if dy != 0:
+            return VWOrientation.south if dy > 0 else VWOrientation.north
+        return snap.orientation
+
+    def next_cell(self, snap: ObservationSnapshot, target: Tuple[int, int]) -> Tuple[int, int]:
+        hx, hy = HEADINGS[self.heading(snap, target)]
+        return snap.position[0] + hx, snap.position[1] + hy
+
+    def intent(self, snap: ObservationSnapshot, target: Tuple[int, int]) -> Dict[str, object]:
+        return {"intent": {"from": self.colour_name, "id": str(self.get_own_id()), "at": list(snap.position),
+                           "next": list(self.next_cell(snap, target)),
+                           "priority": AGENT_PRIORITY.get(self.colour_name, 0), "remaining": len(self.targets)}}
+
+    def outranks(self, other: Dict[str, object]) -> bool:
+        mine = (len(self.targets), AGENT_PRIORITY.get(self.colour_name, 0), str(self.get_own_id()))
+        return mine > (int(other["remaining"]), int(other["priority"]), str(other["id"]))
+
+    def side_cell(self, snap: ObservationSnapshot, blocked: Tuple[int, int], target: Tuple[int, int]) -> Tuple[int, int]:
+        """Where to step aside from a head-on conflict over the blocked cell."""
+        x, y = snap.position
+        ax, ay = blocked[0] - x, blocked[1] - y
+        seen = {cell.pos: cell for cell in snap.cells()}
+        in_view = {(x + ox, y + oy) for ox, oy in perception_offsets(snap.orientation).values()}
+        # Perpendicular to the conflict, towards the target first, then backing off
+        towards = (target[0] - x) * ay + (target[1] - y) * ax > 0
+        sides = [(x + ay, y + ax), (x - ay, y - ax)]
+        for cell in (sides if towards else sides[::-1]) + [(x - ax, y - ay)]:
+            if cell[0] < 0 or cell[1] < 0 or (cell in in_view and cell not in seen):
+                continue        # wall
+            if cell in seen and seen[cell].has_actor:
+                continue
+            return cell
+        return snap.position
+
+    def negotiate(self, snap: ObservationSnapshot, target: Optional[Tuple[int, int]]) -> VWAction:
+        """
+        Next action towards target, resolving head-on conflicts by priority.
+        With no target (done), the agent only steps aside for anyone that wants its cell.
+        """
+        if self.yield_left > 0:
+            self.yield_left -= 1
+            if snap.position != self.yield_target:
+                return self.step_towards(snap, self.yield_target)
+            return VWIdleAction()
+
+        if target is None:
+            other = next((intent for intent in self.intents.values()
+                          if tuple(intent["next"]) == snap.position), None)
+            if other is None:
+                return VWIdleAction()
+            wanted = target = (int(other["at"][0]), int(other["at"][1]))
+        else:
+            wanted = self.next_cell(snap, target)
+            other = next((intent for intent in self.intents.values()
+                          if tuple(intent["at"]) == wanted and tuple(intent["next"]) == snap.position), None)
+            if other is None:
+                return self.step_towards(snap, target)
+            if self.outranks(other):
+                # Right of way: hold the heading until the other agent has stepped aside
+                if snap.orientation == self.heading(snap, target) and snap.forward is not None \
+                        and snap.forward.has_actor:
+                    return VWIdleAction()
+                return self.step_towards(snap, target)
+
+        self.yield_target = self.side_cell(snap, wanted, target)
+        self.yield_left = YIELD_CYCLES - 1
+        print(f"[{self.colour_name.upper()}] Yielding to {other['from']}, stepping aside to {self.yield_target}")
+        return self.step_towards(snap, self.yield_target)
+
+    def step_towards(self, snap: ObservationSnapshot, target: Tuple[int, int]) -> VWAction:
+        """One move/turn towards target (x first, then y), sidestepping actors."""
+        orient = snap.orientation
+        desired = self.heading(snap, target)
+
+        state = (ORIENTATION_INDEX[orient], ORIENTATION_INDEX[desired],
+                 cell_state(snap.forward, snap.wall_ahead), cell_state(snap.left), cell_state(snap.right),
+                 int(self.just_turned))
+        action, self.just_turned, _, _ = cleaner_rule(*state)
+        return make_action(action)
+
 
 class OrangeMind(BaseCleanerMind):
-    def __init__(self) -> None:
-        super().__init__("orange")
+    def __init__(self, cooperative: str = "off", yielding: bool = True) -> None:
+        super().__init__("orange", cooperative, yielding)
 
 
 class GreenMind(BaseCleanerMind):
-    def __init__(self) -> None:
-        super().__init__("green")
+    def __init__(self, cooperative: str = "off", yielding: bool = True) -> None:
+        super().__init__("green", cooperative, yielding)
 
 
 if __name__ == "__main__":
+    # Imported here: the GUI stack is not needed by the minds or the headless runs
+    from vacuumworld import run
     run(white_mind=WhiteMind(), orange_mind=OrangeMind(), green_mind=GreenMind())
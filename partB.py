@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 
-from typing import Iterable, Optional, Dict, Tuple
-from vacuumworld import run
+from itertools import islice
+from typing import TYPE_CHECKING, Iterable, Optional, Dict, Tuple, List, Set
 from vacuumworld.model.actions.vwactions import VWAction
 from vacuumworld.model.actions.vwmove_action import VWMoveAction
 from vacuumworld.model.actions.vwturn_action import VWTurnAction
@@ -11,16 +11,71 @@ from vacuumworld.model.actor.mind.surrogate.vw_llm_actor_mind_surrogate import V
 from vacuumworld.common.vwdirection import VWDirection
 from vacuumworld.common.vworientation import VWOrientation
 from vacuumworld.model.actions.vwbroadcast_action import VWBroadcastAction
-from vacuumworld.common.vwcolour import VWColour
-from google.genai.types import GenerateContentResponse
+
+# The LLM client's types are only used in annotations: the client library is
+# loaded by the surrogate when a call is made, not when this module is imported
+# (see benchmarks.py imports). vacuumworld.run (the GUI) is imported under
+# __main__ for the same reason, and target_index loads NumPy only for the
+# vectorised TargetIndex, which no mind builds: offline and mock runs, and
+# batch workers, start without either library.
+if TYPE_CHECKING:
+    from google.genai.types import GenerateContentResponse
+
+from profiling import CycleProfile, HotPathTimer, profile_cycles, timed
+from observation import ObservationSnapshot, CellView, has_actor
+from target_index import DirtIndex
+from messages import compose, dispatch, handler, reset_messaging, termination_cycle
+from prompts import ask, cell_line, instructions_for
+from distill import local_model_from_env
+from routing import router_from_env
+
+
+def _cell_summary(cell: Optional[CellView]) -> Tuple[Optional[Tuple[int, int]], bool, bool, Optional[str]]:
+    """(position, has actor, has dirt, dirt colour) of an adjacent cell, for the prompts."""
+    if cell is None:
+        return None, False, False, None
+    return cell.pos, cell.has_actor, cell.has_dirt, cell.dirt_colour
+
+
+# The LLM side of a mind, set up once in __init__ and kept across reset():
+# the surrogate's constructor has read .env, the static instructions are built
+# (prompts.py) so that each cycle sends only its state, and requests are
+# routed by tier if VW_ROUTING is set (routing.py), or else answered from a
+# model distilled from LLM transcripts if VW_LOCAL_MODEL names one (distill.py).
+def set_up_llm(mind: VWLLMActorMindSurrogate) -> None:
+    mind.instructions = instructions_for(mind.colour_name)
+    if router_from_env(mind) is None:
+        local_model_from_env(mind)
+
+
+def see_cleaned(mind: VWLLMActorMindSurrogate, snap: ObservationSnapshot) -> None:
+    """Drop the remaining dirt seen clean anywhere in view, and queue it to tell the others."""
+    for cell in snap.cells():
+        if not cell.has_dirt and cell.pos in mind.remaining:
+            mind.remaining.discard(cell.pos)
+            mind.cleaned.add(cell.pos)
+            mind.pending_cleaned.append(cell.pos)
 
 
 # ----------------------------
 # WHITE AGENT
 # ----------------------------
 class WhiteLLMMind(VWLLMActorMindSurrogate):
+    # Internal model saved by checkpoint.save_checkpoint()
+    CHECKPOINT_FIELDS = ("known_width", "known_height", "observed", "dirt_map", "phase", "last_row_direction",
+                         "last_visited", "map_broadcasted", "cleaned", "remaining", "moving_up_row",
+                         "next_row_direction", "prev_phase", "just_blocked_turn", "visited", "last_actions",
+                         "message_seq", "seen_seq", "outbox", "pending_cleaned", "cycle", "last_work_cycle",
+                         "statuses", "reported_done")
+
     def __init__(self) -> None:
         super().__init__(dot_env_path=".env")
+        self.colour_name = "white"
+        set_up_llm(self)
+        self.reset()
+
+    def reset(self) -> None:
+        """Start a new episode, keeping the LLM surrogate."""
         self.known_width: Optional[int] = None
         self.known_height: Optional[int] = None
         self.observed: set[Tuple[int,int]] = set()
@@ -29,19 +84,37 @@ class WhiteLLMMind(VWLLMActorMindSurrogate):
         self.last_row_direction: str = "WEST"
         self.last_visited: Optional[Tuple[int,int]] = None
         self.map_broadcasted: bool = False
+        reset_messaging(self)
         self.cleaned: set[Tuple[int,int]] = set()
+        self.remaining: DirtIndex = DirtIndex()     # dirt_map minus cleaned, by colour
         self.moving_up_row = False
         self.next_row_direction = self.last_row_direction
         self.prev_phase: Optional[str] = None
         self.just_blocked_turn = False
 
-        self.colour_name = "white"
-
         self.visited: set[Tuple[int, int]] = set()
 
         # Fallback: track last positions to detect repeated MOVE_FORWARD that doesn’t move
         self.last_actions: list[Tuple[str, Tuple[int,int]]] = []
 
+        # Observation decoded once per cycle in revise(), reused by decide()
+        self.snapshot: Optional[ObservationSnapshot] = None
+
+        self.cycle_profile: CycleProfile = CycleProfile("white")
+        self.timings: HotPathTimer = HotPathTimer("white")
+
+    def current_phase(self) -> str:
+        return self.phase
+
+    def work_done(self) -> bool:
+        return self.map_broadcasted and not self.remaining
+
+    def work_left(self) -> int:
+        return len(self.remaining)
+
+    def termination_cycle(self) -> Optional[int]:
+        return termination_cycle(self)
+
     def minimal_turn_action(
     self,
     current: VWOrientation,
@@ -84,35 +157,37 @@ class WhiteLLMMind(VWLLMActorMindSurrogate):
         elif diff == 3:
             return VWTurnAction(VWDirection.left)
 
+    @timed("revise")
     def revise(self) -> None:
+        self.cycle += 1
         try:
-            pos = self.get_own_position()
-            x, y = int(pos.get_x()), int(pos.get_y())
+            self.snapshot = None
+            with self.timings.section("observe"):
+                snap = self.snapshot = ObservationSnapshot.decode(
+                    self.get_latest_observation(), self.get_own_position(), self.get_own_orientation())
+            x, y = snap.position
             self.last_visited = (x, y)
             self.visited.add((x,y))
-            orient = self.get_own_orientation()
-            obs = self.get_latest_observation()
+            orient = snap.orientation
 
             # Record observed tiles and dirt
-            for getter in [obs.get_center, obs.get_forward, obs.get_left,
-                           obs.get_right, obs.get_forwardleft, obs.get_forwardright]:
-                opt_loc = getter()
-                if not opt_loc.is_empty():
-                    loc = opt_loc.or_else_raise()
-                    cpos = (int(loc.get_coord().get_x()), int(loc.get_coord().get_y()))
-                    self.observed.add(cpos)
-                    if loc.has_dirt():
-                        colour = str(loc.get_dirt_appearance().or_else_raise().get_colour())
-                        self.dirt_map[cpos] = colour
+            for cell in snap.cells():
+                self.observed.add(cell.pos)
+                if cell.has_dirt:
+                    self.dirt_map[cell.pos] = cell.dirt_colour
+                    if cell.pos not in self.cleaned:
+                        self.remaining.add(cell.pos, cell.dirt_colour)
+            see_cleaned(self, snap)
+            dispatch(self, self.get_latest_received_messages())
 
             # Width detection
-            if self.phase == "find_width" and orient == VWOrientation.east and obs.is_wall_immediately_ahead():
+            if self.phase == "find_width" and orient == VWOrientation.east and snap.wall_ahead:
                 self.known_width = x + 1
                 self.phase = "find_height"
                 print(f"[WHITE] Width found: {self.known_width}")
 
             # Height detection
-            elif self.phase == "find_height" and orient == VWOrientation.south and obs.is_wall_immediately_ahead():
+            elif self.phase == "find_height" and orient == VWOrientation.south and snap.wall_ahead:
                 self.known_height = y + 1
                 print(f"[WHITE] Height found: {self.known_height}")
                 self.phase = "zigzag"
@@ -126,41 +201,40 @@ class WhiteLLMMind(VWLLMActorMindSurrogate):
         except Exception as e:
             print(f"[WHITE] revise error: {e}")
 
+    @profile_cycles
+    @timed("decide")
     def decide(self) -> Iterable[VWAction]:
+        return compose(self, self.decide_physical()[0])
+
+    def decide_physical(self) -> List[VWAction]:
         try:
-            pos = self.get_own_position()
-            x, y = int(pos.get_x()), int(pos.get_y())
-            orient = self.get_own_orientation()
-            obs = self.get_latest_observation()
+            snap = self.snapshot
+            if snap is None:
+                return [VWIdleAction()]
+            x, y = snap.position
+            orient = snap.orientation
 
             print(f"[WHITE DEBUG] Phase={self.phase}, pos=({x},{y}), orient={orient.name}, last_row_dir={self.last_row_direction}")
 
             # -------------------------
             # BLOCKED PHASE
             # -------------------------
-            forward_loc = obs.get_forward()
-            left_loc = obs.get_left()
-            right_loc = obs.get_right()
-
-            ahead_has_actor = (
-                not forward_loc.is_empty() and
-                forward_loc.or_else_raise().has_actor()
-            )
+            ahead_has_actor = has_actor(snap.forward)
 
             # Left cell
             left_blocked = True
             unvisited_left = False
-            if not left_loc.is_empty():
-                left_cell = left_loc.or_else_raise()
-                lx, ly = int(left_cell.get_coord().get_x()), int(left_cell.get_coord().get_y())
+            if snap.left is not None:
+                left_cell = snap.left
+                lx, ly = left_cell.pos
                 if self.known_width is not None and self.known_height is not None:
                     left_blocked = (
-                        left_cell.has_actor() or
+                        left_cell.has_actor or
                         lx < 0 or lx >= self.known_width or
                         ly < 0 or ly >= self.known_height
                     )
                 else:
-                    left_blocked = left_cell.has_actor()
+                    left_blocked = left_cell.has_actor
                 unvisited_left = (lx, ly) not in self.visited
             else:
                 left_blocked = False
@@ -169,17 +243,17 @@ class WhiteLLMMind(VWLLMActorMindSurrogate):
             # Right cell
             right_blocked = True
             unvisited_right = False
-            if not right_loc.is_empty():
-                right_cell = right_loc.or_else_raise()
-                rx, ry = int(right_cell.get_coord().get_x()), int(right_cell.get_coord().get_y())
+            if snap.right is not None:
+                right_cell = snap.right
+                rx, ry = right_cell.pos
                 if self.known_width is not None and self.known_height is not None:
                     right_blocked = (
-                        right_cell.has_actor() or
+                        right_cell.has_actor or
                         rx < 0 or rx >= self.known_width or
                         ry < 0 or ry >= self.known_height
                     )
                 else:
-                    right_blocked = right_cell.has_actor()
+                    right_blocked = right_cell.has_actor
                 unvisited_right = (rx, ry) not in self.visited
             else:
                 right_blocked = False
@@ -201,28 +275,13 @@ class WhiteLLMMind(VWLLMActorMindSurrogate):
                     return [VWMoveAction()]
 
                 # LLM prompt for blocked situation
-                prompt = f"""
-                You are blocked by an agent directly ahead.
-
-                Ahead: {'blocked' if ahead_has_actor else 'free'}
-                Left: {'blocked' if left_blocked else 'free'}
-                Right: {'blocked' if right_blocked else 'free'}
-
-                Flags:
-                - Left leads to an unvisited cell: {unvisited_left}
-                - Right leads to an unvisited cell: {unvisited_right}
-
-                Rules (FOLLOW EXACTLY):
-                1. IF right cell is FREE and UNVISITED then TURN_RIGHT
-                2. If left cell is FREE and UNVISITED then TURN_LEFT
-                3. If neither left nor right lead to unvisited cells, but one is free → TURN towards the free cell.
-                4. If all blocked → TURN_LEFT
-                5. Do not move forward while an agent is ahead.
-
-                Output EXACTLY ONE action: MOVE_FORWARD, TURN_LEFT, or TURN_RIGHT
-                Do NOT include text, punctuation, or explanation.
-                """
-                response = self.decide_physical_with_ai(prompt)
+                response = ask(self, self.instructions["blocked"], tier="easy", state={
+                    "ahead": "blocked" if ahead_has_actor else "free",
+                    "left": "blocked" if left_blocked else "free",
+                    "right": "blocked" if right_blocked else "free",
+                    "left unvisited": unvisited_left,
+                    "right unvisited": unvisited_right,
+                })
                 action = self.parse_gemini_response(response)
                 print(f"[WHITE BLOCKED] LLM suggested action: {action}")
 
@@ -245,27 +304,23 @@ class WhiteLLMMind(VWLLMActorMindSurrogate):
             if self.phase == "find_width":
                 if orient != VWOrientation.east:
                     return [VWTurnAction(VWDirection.right)]
-                forward_loc = obs.get_forward()
-                ahead_has_actor = not forward_loc.is_empty() and forward_loc.or_else_raise().has_actor()
                 if ahead_has_actor:
                     self.prev_phase = "find_width"
                     self.phase = "blocked"
                     # The blocked-phase logic at the top of decide() will handle this
                     return [VWIdleAction()]
-                if not obs.is_wall_immediately_ahead():
+                if not snap.wall_ahead:
                     return [VWMoveAction()]
                 return [VWIdleAction()]
 
             if self.phase == "find_height":
                 if orient != VWOrientation.south:
                     return [VWTurnAction(VWDirection.right)]
-                forward_loc = obs.get_forward()
-                ahead_has_actor = not forward_loc.is_empty() and forward_loc.or_else_raise().has_actor()
                 if ahead_has_actor:
                     self.prev_phase = "find_height"
                     self.phase = "blocked"
                     return [VWIdleAction()]
-                if obs.is_wall_immediately_ahead():
+                if snap.wall_ahead:
                     self.known_height = y + 1
                     self.phase = "zigzag"
                 return [VWMoveAction()]
@@ -276,22 +331,17 @@ class WhiteLLMMind(VWLLMActorMindSurrogate):
             if self.phase == "zigzag":
                 print("[WHITE ZIGZAG] Starting zigzag logic")
 
-                # Determine if forward move is blocked by wall or actor
-                fwd = obs.get_forward()
-                left_loc = obs.get_left()
-                right_loc = obs.get_right()
-
                 # Compute ahead_blocked including walls for LLM
-                forward_blocked_by_wall = obs.is_wall_immediately_ahead()
-                forward_blocked_by_actor = not fwd.is_empty() and fwd.or_else_raise().has_actor()
+                forward_blocked_by_wall = snap.wall_ahead
+                forward_blocked_by_actor = has_actor(snap.forward)
                 ahead_blocked = forward_blocked_by_wall or forward_blocked_by_actor \
                                 or (x == 0 and orient == VWOrientation.west) \
                                 or (x == self.known_width-1 and orient == VWOrientation.east) \
                                 or (y == 0 and orient == VWOrientation.north) \
                                 or (y == self.known_height-1 and orient == VWOrientation.south)
 
-                left_blocked = not left_loc.is_empty() and left_loc.or_else_raise().has_actor()
-                right_blocked = not right_loc.is_empty() and right_loc.or_else_raise().has_actor()
+                left_blocked = has_actor(snap.left)
+                right_blocked = has_actor(snap.right)
                 # Row end detection
                 at_row_end = (x == 0 and self.last_row_direction == "WEST") or \
                             (x == self.known_width-1 and self.last_row_direction == "EAST")
@@ -319,53 +369,20 @@ class WhiteLLMMind(VWLLMActorMindSurrogate):
                     return [VWMoveAction()]
 
                 # LLM prompt for zigzag move (enhanced instructions added)
-                prompt = f"""
-You are controlling a vacuum agent in a {self.known_width}x{self.known_height} grid.
-
-Current position: ({x},{y})
-Current orientation: {orient.name}
-Last row direction: {self.last_row_direction}
-
-Grid dimensions: width={self.known_width}, height={self.known_height}
-Visited cells: {','.join([f'({vx},{vy})' for vx, vy in self.observed]) if self.observed else 'none'}
-Observed dirt locations: {','.join([f'({dx},{dy})' for dx, dy in self.dirt_map.keys()]) if self.dirt_map else 'none'}
-
-Adjacent squares (walls + other agents):
-- Ahead: {'blocked' if ahead_blocked else 'free'}
-- Left: {'blocked' if left_blocked else 'free'}
-- Right: {'blocked' if right_blocked else 'free'}
-
-Flags:
-- At row end (for zigzag): {at_row_end}
-- Currently moving up a row: {self.moving_up_row}
-- Next row direction after moving up: {self.next_row_direction}
-
-Additional instructions:
-- If the square in your last row direction is blocked by a wall, first attempt to move north.
-- If north is also blocked (by wall or actor), choose the next free direction clockwise (east → south → west).
-- Always avoid moving into walls or other agents.
-- Prioritize moving into unvisited cells if available.
-
-Rules for zigzag (FOLLOW EXACTLY):
-1. IF Currently moving up a row = True:
-- Output ONLY MOVE_FORWARD to move north one cell.
-2. ELSE IF At row end = True:
-- Begin moving up to the next row (set Currently moving up a row = True).
-- Output the action needed to move one cell north.
-3. ELSE:
-- Move forward if the square ahead is unvisited and free.
-- TURN_LEFT or TURN_RIGHT only if needed to avoid walls or continue zigzag in last_row_direction.
-4. Avoid already visited cells unless no unvisited square is reachable.
-5. Avoid squares occupied by other agents.
-6. Do not move outside the grid.
-7. After moving up, TURN to face Next row direction to continue zigzag.
-
-Output:
-- Provide EXACTLY ONE action: MOVE_FORWARD, TURN_LEFT, or TURN_RIGHT.
-- DO NOT include explanations, punctuation, code, or extra text.
-- Output only the move name.
-"""
-                response = self.decide_physical_with_ai(prompt)
+                response = ask(self, self.instructions["zigzag"], tier="easy", state={
+                    "grid": f"{self.known_width}x{self.known_height}",
+                    "position": f"({x},{y})",
+                    "orientation": orient.name,
+                    "last row direction": self.last_row_direction,
+                    "ahead": "blocked" if ahead_blocked else "free",
+                    "left": "blocked" if left_blocked else "free",
+                    "right": "blocked" if right_blocked else "free",
+                    "at row end": at_row_end,
+                    "moving up a row": self.moving_up_row,
+                    "next row direction": self.next_row_direction,
+                    "visited": ','.join([f'({vx},{vy})' for vx, vy in self.observed]) if self.observed else 'none',
+                    "dirt seen": ','.join([f'({dx},{dy})' for dx, dy in self.dirt_map.keys()]) if self.dirt_map else 'none',
+                })
                 llm_action = self.parse_gemini_response(response)
                 print(f"[WHITE ZIGZAG] LLM suggested action: {llm_action}")
 
@@ -395,7 +412,9 @@ Output:
                 dirt_list = [{"x": dx, "y": dy, "colour": colour} for (dx, dy), colour in self.dirt_map.items()]
                 self.map_broadcasted = True
                 self.phase = "cleaning"
-                return [VWBroadcastAction(message={"dirt": dirt_list}, sender_id=self.get_own_id())]
+                # Sent with the first cleaning action below
+                self.outbox.insert(0, {"dirt": dirt_list})
+                self.last_work_cycle = self.cycle
 
             # -------------------------
             # CLEANING PHASE
@@ -404,36 +423,29 @@ Output:
             # CLEANING PHASE (LLM-BASED for White Agent)
             # -------------------------
             if self.phase == "cleaning":
-                center = obs.get_center()
-
                 # Check if standing on dirt that needs cleaning
-                standing_on_dirt = False
-                dirt_colour_here = None
                 current_pos = (x, y)
-
-                if not center.is_empty():
-                    c = center.or_else_raise()
-                    if c.has_dirt():
-                        dirt_app = c.get_dirt_appearance().or_else_raise()
-                        dirt_colour_here = dirt_app.get_colour().name.lower()
-                        standing_on_dirt = (current_pos not in self.cleaned)
+                dirt_colour_here = snap.dirt_here()
+                standing_on_dirt = dirt_colour_here is not None and current_pos not in self.cleaned
 
                 # If standing on any dirt, clean it
                 if standing_on_dirt:
                     print(f"[WHITE] Cleaning {dirt_colour_here} dirt at {current_pos}")
                     self.cleaned.add(current_pos)
+                    self.remaining.discard(current_pos)
+                    self.pending_cleaned.append(current_pos)
+                    self.last_work_cycle = self.cycle
                     return [VWCleanAction()]
 
                 # Calculate remaining dirt targets (white cleans ALL dirt)
-                remaining_dirt = [pos for pos in self.dirt_map.keys() if pos not in self.cleaned]
-
-                # If no dirt left, idle
-                if not remaining_dirt:
-                    print("[WHITE] All dirt cleaned, idling")
-                    return [VWIdleAction()]
-
-                # Find nearest dirt target
-                target = min(remaining_dirt, key=lambda t: abs(t[0]-x) + abs(t[1]-y))
+                with self.timings.section("select_target"):
+                    # If no dirt left, idle
+                    if not self.remaining:
+                        print("[WHITE] All dirt cleaned, idling")
+                        return [VWIdleAction()]
+
+                    # Find nearest dirt target
+                    target = self.remaining.nearest(x, y)
                 tx, ty = target
                 manhattan_distance = abs(tx - x) + abs(ty - y)
                 target_colour = self.dirt_map.get(target, "unknown")
@@ -452,163 +464,52 @@ Output:
                     desired_orientation = orient
                     direction_name = orient.name
 
-                # Get adjacent cell information
-                fwd = obs.get_forward()
-                left_loc = obs.get_left()
-                right_loc = obs.get_right()
-
-                # Check forward
-                forward_blocked = obs.is_wall_immediately_ahead()
-                forward_has_actor = False
-                forward_has_dirt = False
-                forward_dirt_colour = None
-                forward_pos = None
-
-                if not fwd.is_empty():
-                    fwd_cell = fwd.or_else_raise()
-                    forward_has_actor = fwd_cell.has_actor()
-                    forward_blocked = forward_blocked or forward_has_actor
-                    forward_pos = (int(fwd_cell.get_coord().get_x()), int(fwd_cell.get_coord().get_y()))
-
-                    if fwd_cell.has_dirt():
-                        forward_has_dirt = True
-                        forward_dirt_colour = fwd_cell.get_dirt_appearance().or_else_raise().get_colour().name.lower()
-
-                # Check left
-                left_blocked = False
-                left_has_actor = False
-                left_has_dirt = False
-                left_dirt_colour = None
-                left_pos = None
-
-                if not left_loc.is_empty():
-                    left_cell = left_loc.or_else_raise()
-                    left_has_actor = left_cell.has_actor()
-                    left_blocked = left_has_actor
-                    left_pos = (int(left_cell.get_coord().get_x()), int(left_cell.get_coord().get_y()))
-
-                    if left_cell.has_dirt():
-                        left_has_dirt = True
-                        left_dirt_colour = left_cell.get_dirt_appearance().or_else_raise().get_colour().name.lower()
-
-                # Check right
-                right_blocked = False
-                right_has_actor = False
-                right_has_dirt = False
-                right_dirt_colour = None
-                right_pos = None
-
-                if not right_loc.is_empty():
-                    right_cell = right_loc.or_else_raise()
-                    right_has_actor = right_cell.has_actor()
-                    right_blocked = right_has_actor
-                    right_pos = (int(right_cell.get_coord().get_x()), int(right_cell.get_coord().get_y()))
+                # Adjacent cell information from this cycle's snapshot
+                forward_pos, forward_has_actor, forward_has_dirt, forward_dirt_colour = _cell_summary(snap.forward)
+                left_pos, left_has_actor, left_has_dirt, left_dirt_colour = _cell_summary(snap.left)
+                right_pos, right_has_actor, right_has_dirt, right_dirt_colour = _cell_summary(snap.right)
 
-                    if right_cell.has_dirt():
-                        right_has_dirt = True
-                        right_dirt_colour = right_cell.get_dirt_appearance().or_else_raise().get_colour().name.lower()
+                forward_blocked = snap.wall_ahead or forward_has_actor
+                left_blocked = left_has_actor
+                right_blocked = right_has_actor
 
                 # Count dirt by colour
-                orange_count = sum(1 for pos, col in self.dirt_map.items() if col.lower() == "orange" and pos not in self.cleaned)
-                green_count = sum(1 for pos, col in self.dirt_map.items() if col.lower() == "green" and pos not in self.cleaned)
+                orange_count = self.remaining.count("orange")
+                green_count = self.remaining.count("green")
 
                 # Build list of remaining dirt
-                dirt_list_str = ', '.join([f"({d[0]},{d[1]}):{self.dirt_map[d]}" for d in remaining_dirt[:5]])
-                if len(remaining_dirt) > 5:
-                    dirt_list_str += f" ... +{len(remaining_dirt)-5} more"
-
-                # Build comprehensive LLM prompt
-                prompt = f"""You are the WHITE cleaning agent in a {self.known_width}x{self.known_height} grid.
-
-MISSION: Navigate to and clean ALL remaining dirt (any colour) in the grid.
-
-CURRENT STATE:
-- Your position: ({x}, {y})
-- Your orientation: {orient.name}
-- Nearest dirt target: ({tx}, {ty}) - {target_colour} colour
-- Manhattan distance to target: {manhattan_distance}
-- Direction to target: {direction_name}
-- Desired orientation to reach target: {desired_orientation.name}
-
-REMAINING DIRT STATUS:
-- Total dirt remaining: {len(remaining_dirt)}
-  - Orange dirt: {orange_count}
-  - Green dirt: {green_count}
-- All remaining dirt: {dirt_list_str}
-
-CLEANING PROGRESS:
-- Total cleaned: {len(self.cleaned)}
-- Last 3 cleaned positions: {list(self.cleaned)[-3:] if self.cleaned else 'none'}
-
-ADJACENT CELLS:
-Forward (ahead):
-  - Position: {forward_pos if forward_pos else 'wall/unknown'}
-  - Blocked by wall: {obs.is_wall_immediately_ahead()}
-  - Blocked by actor: {forward_has_actor}
-  - Overall blocked: {forward_blocked}
-  - Has dirt: {forward_has_dirt}
-  - Dirt colour: {forward_dirt_colour if forward_has_dirt else 'none'}
-
-Left:
-  - Position: {left_pos if left_pos else 'wall/unknown'}
-  - Blocked by actor: {left_has_actor}
-  - Overall blocked: {left_blocked}
-  - Has dirt: {left_has_dirt}
-  - Dirt colour: {left_dirt_colour if left_has_dirt else 'none'}
-
-Right:
-  - Position: {right_pos if right_pos else 'wall/unknown'}
-  - Blocked by actor: {right_has_actor}
-  - Overall blocked: {right_blocked}
-  - Has dirt: {right_has_dirt}
-  - Dirt colour: {right_dirt_colour if right_has_dirt else 'none'}
-
-NAVIGATION RULES (FOLLOW EXACTLY):
-1. You clean ALL colours of dirt (orange, green, or any other).
-
-2. If standing on dirt: (Handled automatically - you won't see this)
-
-3. Priority navigation:
-   - If adjacent cell has dirt: Turn to face it, then move to it
-   - Otherwise: Navigate to nearest dirt at ({tx}, {ty})
-
-4. Movement logic:
-   - If facing desired orientation ({desired_orientation.name}) AND forward is FREE: MOVE_FORWARD
-   - If facing desired orientation BUT forward is BLOCKED: Turn to find alternate path
-   - If NOT facing desired orientation: Turn towards it
-
-5. When blocked, choose turn direction based on:
-   - Which direction has dirt visible
-   - Which direction is free and moves closer to target
-   - If both blocked, turn towards less-blocked side
-
-6. CRITICAL: NEVER output MOVE_FORWARD when forward is blocked (wall or other agent).
-
-7. If surrounded by orange/green agents cleaning their dirt:
-   - Be patient, turn to face free directions
-   - Wait for them to move, then proceed to your target
-
-DECISION STRATEGY:
-Step 1: Check if adjacent cells have dirt → prioritize moving to them
-Step 2: Check alignment with target orientation
-Step 3: Check if forward is clear
-Step 4: Decide: MOVE_FORWARD (if aligned & clear) OR TURN (if blocked or misaligned)
-
-OUTPUT ONE ACTION ONLY:
-- MOVE_FORWARD (only if forward is clear and brings you closer to dirt)
-- TURN_LEFT (to avoid obstacles or reorient towards target)
-- TURN_RIGHT (to avoid obstacles or reorient towards target)
-
-Output EXACTLY ONE action name. NO explanations, punctuation, or extra text.
-"""
+                dirt_list_str = ', '.join([f"({d[0]},{d[1]}):{self.dirt_map[d]}" for d in islice(self.remaining, 5)])
+                if len(self.remaining) > 5:
+                    dirt_list_str += f" ... +{len(self.remaining)-5} more"
+
+                # This cycle's state for the LLM
+                state = {
+                    "grid": f"{self.known_width}x{self.known_height}",
+                    "position": f"({x}, {y})",
+                    "orientation": orient.name,
+                    "target": f"({tx}, {ty}) {target_colour}",
+                    "distance to target": manhattan_distance,
+                    "direction to target": direction_name,
+                    "desired orientation": desired_orientation.name,
+                    "dirt remaining": f"{len(self.remaining)} (orange {orange_count}, green {green_count})",
+                    "remaining dirt": dirt_list_str,
+                    "cleaned": f"{len(self.cleaned)}, last {list(self.cleaned)[-3:] if self.cleaned else 'none'}",
+                    "ahead": cell_line(forward_blocked, forward_pos, snap.wall_ahead, forward_has_actor,
+                                       forward_dirt_colour if forward_has_dirt else None),
+                    "left": cell_line(left_blocked, left_pos, False, left_has_actor,
+                                      left_dirt_colour if left_has_dirt else None),
+                    "right": cell_line(right_blocked, right_pos, False, right_has_actor,
+                                       right_dirt_colour if right_has_dirt else None),
+                }
 
                 print(f"[WHITE CLEANING] Calling LLM...")
                 print(f"  Position: ({x},{y}), Target: ({tx},{ty}), Distance: {manhattan_distance}")
                 print(f"  Orient: {orient.name}, Desired: {desired_orientation.name}")
                 print(f"  Forward: {'blocked' if forward_blocked else 'free'}, Left: {'blocked' if left_blocked else 'free'}, Right: {'blocked' if right_blocked else 'free'}")
 
-                # Call LLM
-                response = self.decide_physical_with_ai(prompt)
+                # Call LLM: cleaning next to another agent is the hardest request
+                tier = "hard" if forward_has_actor or left_has_actor or right_has_actor else "normal"
+                response = ask(self, self.instructions["cleaning"], state, tier)
                 action = self.parse_gemini_response(response)
 
                 print(f"[WHITE CLEANING] LLM suggested: {action.__class__.__name__}")
@@ -632,7 +533,7 @@ Output EXACTLY ONE action name. NO explanations, punctuation, or extra text.
             return [VWIdleAction()]
 
 
-    def parse_gemini_response(self, response: GenerateContentResponse) -> VWAction:
+    def parse_gemini_response(self, response: "GenerateContentResponse") -> VWAction:
         try:
             if isinstance(response, VWAction):
                 return response
@@ -653,33 +554,65 @@ Output EXACTLY ONE action name. NO explanations, punctuation, or extra text.
     def backup_decide_after_llm_error(self, original_prompt, error, action_superclass):
         return VWIdleAction()
 
+    @handler("cleaned")
+    def receive_cleaned(self, event: Dict[str, object], sender: str) -> None:
+        for cx, cy in event["cells"]:
+            pos = (int(cx), int(cy))
+            self.cleaned.add(pos)
+            self.remaining.discard(pos)
+
+    @handler("status")
+    def receive_status(self, status: Dict[str, object], sender: str) -> None:
+        self.statuses[status["from"]] = status
+
 
 # ----------------------------
 # ORANGE / GREEN AGENTS
 # ----------------------------
-from typing import Iterable, Dict, Tuple, Optional, List, Set
-from vacuumworld.model.actions.vwactions import VWAction
-from vacuumworld.model.actions.vwmove_action import VWMoveAction
-from vacuumworld.model.actions.vwturn_action import VWTurnAction
-from vacuumworld.model.actions.vwclean_action import VWCleanAction
-from vacuumworld.model.actions.vwidle_action import VWIdleAction
-from vacuumworld.model.actions.vwbroadcast_action import VWBroadcastAction
-from vacuumworld.model.actor.mind.surrogate.vw_llm_actor_mind_surrogate import VWLLMActorMindSurrogate
-from vacuumworld.common.vwdirection import VWDirection
-from vacuumworld.common.vworientation import VWOrientation
-from google.genai.types import GenerateContentResponse
-
 class BaseCleanerMind(VWLLMActorMindSurrogate):
+    # Internal model saved by checkpoint.save_checkpoint()
+    CHECKPOINT_FIELDS = ("map_received", "dirt_map", "cleaned", "remaining", "last_positions",
+                         "just_blocked_turn", "prev_phase", "phase", "message_seq", "seen_seq", "outbox",
+                         "pending_cleaned", "cycle", "last_work_cycle", "statuses", "reported_done")
+
     def __init__(self, colour_name: str) -> None:
         super().__init__(dot_env_path=".env")
         self.colour_name: str = colour_name.lower()
+        set_up_llm(self)
+        self.reset()
+
+    def reset(self) -> None:
+        """Start a new episode, keeping the LLM surrogate."""
         self.map_received: bool = False
         self.dirt_map: Dict[Tuple[int,int], str] = {}
         self.cleaned: Set[Tuple[int,int]] = set()
+        self.remaining: DirtIndex = DirtIndex()     # dirt_map minus cleaned, by colour
         self.last_positions: List[Tuple[int,int]] = []
         self.just_blocked_turn: bool = False
         self.prev_phase: Optional[str] = None
         self.phase: str = "normal"
+        reset_messaging(self)
+
+        self.snapshot: Optional[ObservationSnapshot] = None
+
+        self.cycle_profile: CycleProfile = CycleProfile(self.colour_name)
+        self.timings: HotPathTimer = HotPathTimer(self.colour_name)
+
+    def current_phase(self) -> str:
+        if self.phase != "normal":
+            return self.phase
+        if not self.map_received:
+            return "waiting"
+        return "cleaning" if self.remaining.count(self.colour_name) else "done"
+
+    def work_done(self) -> bool:
+        return self.map_received and not self.remaining.count(self.colour_name)
+
+    def work_left(self) -> int:
+        return self.remaining.count(self.colour_name)
+
+    def termination_cycle(self) -> Optional[int]:
+        return termination_cycle(self)
 
     # ----------------------------
     # Minimal turn action (like White)
@@ -716,35 +649,48 @@ class BaseCleanerMind(VWLLMActorMindSurrogate):
         elif diff == 3:
             return VWTurnAction(VWDirection.left)
 
+    @handler("dirt")
+    def receive_map(self, dirt: List[Dict[str, object]], sender: str) -> None:
+        if self.map_received:
+            return
+        self.map_received = True
+        for entry in dirt:
+            pos_tuple = (entry["x"], entry["y"])
+            colour = entry["colour"].lower()
+            self.dirt_map[pos_tuple] = colour
+            if pos_tuple not in self.cleaned:
+                self.remaining.add(pos_tuple, colour)
+
+    @handler("cleaned")
+    def receive_cleaned(self, event: Dict[str, object], sender: str) -> None:
+        for cx, cy in event["cells"]:
+            pos = (int(cx), int(cy))
+            self.cleaned.add(pos)
+            self.remaining.discard(pos)
+
+    @handler("status")
+    def receive_status(self, status: Dict[str, object], sender: str) -> None:
+        self.statuses[status["from"]] = status
+
     # ----------------------------
     # Revise: observe dirt and update map
     # ----------------------------
+    @timed("revise")
     def revise(self) -> None:
+        self.cycle += 1
         try:
-            pos = self.get_own_position()
-            x, y = int(pos.get_x()), int(pos.get_y())
-            obs = self.get_latest_observation()
+            self.snapshot = None
+            with self.timings.section("observe"):
+                snap = self.snapshot = ObservationSnapshot.decode(
+                    self.get_latest_observation(), self.get_own_position(), self.get_own_orientation())
+            x, y = snap.position
             self.last_positions.append((x, y))
             if len(self.last_positions) > 4:
                 self.last_positions.pop(0)
 
-            # process broadcasted map
-            for msg in self.get_latest_received_messages():
-                content = msg.get_content()
-                if isinstance(content, dict) and "dirt" in content and not self.map_received:
-                    self.map_received = True
-                    for entry in content["dirt"]:
-                        pos_tuple = (int(entry["x"]), int(entry["y"]))
-                        colour = entry["colour"].lower()
-                        self.dirt_map[pos_tuple] = colour
-
-            # update cleaned if current tile has no dirt
-            center = obs.get_center()
-            if not center.is_empty():
-                c = center.or_else_raise()
-                cpos = (int(c.get_coord().get_x()), int(c.get_coord().get_y()))
-                if not c.has_dirt():
-                    self.cleaned.add(cpos)
+            # process broadcasted map and cleaned events
+            dispatch(self, self.get_latest_received_messages())
+            see_cleaned(self, snap)
 
         except Exception as e:
             print(f"[{self.colour_name.upper()}] revise error: {e}")
@@ -752,47 +698,44 @@ class BaseCleanerMind(VWLLMActorMindSurrogate):
     # ----------------------------
     # Decide method: blocked + cleaning logic
     # ----------------------------
+    @profile_cycles
+    @timed("decide")
     def decide(self) -> Iterable[VWAction]:
+        return compose(self, self.decide_physical()[0])
+
+    def decide_physical(self) -> List[VWAction]:
         try:
             # Stay idle until map is received
-            if not self.map_received:
+            snap = self.snapshot
+            if snap is None or not self.map_received:
                 return [VWIdleAction()]
 
-            pos = self.get_own_position()
-            x, y = int(pos.get_x()), int(pos.get_y())
-            orient = self.get_own_orientation()
-            obs = self.get_latest_observation()
+            x, y = snap.position
+            orient = snap.orientation
+
+            # Clean matching dirt underfoot first, even with the way ahead blocked:
+            # turning away from it (blocked phase) can leave it for good
+            dirt_colour_here = snap.dirt_here()
+            if dirt_colour_here == self.colour_name and (x, y) not in self.cleaned:
+                print(f"[{self.colour_name.upper()}] Cleaning {dirt_colour_here} dirt at {(x, y)}")
+                self.cleaned.add((x, y))
+                self.remaining.discard((x, y))
+                self.pending_cleaned.append((x, y))
+                self.last_work_cycle = self.cycle
+                return [VWCleanAction()]
 
             # -------------------------
             # BLOCKED PHASE (if needed)
             # -------------------------
-            forward_loc = obs.get_forward()
-            left_loc = obs.get_left()
-            right_loc = obs.get_right()
-
-            ahead_blocked_by_actor = not forward_loc.is_empty() and forward_loc.or_else_raise().has_actor()
-            ahead_blocked_by_wall = obs.is_wall_immediately_ahead()
+            ahead_blocked_by_actor = has_actor(snap.forward)
+            ahead_blocked_by_wall = snap.wall_ahead
             ahead_blocked = ahead_blocked_by_actor or ahead_blocked_by_wall
 
-            left_blocked, unvisited_left = True, False
-            if not left_loc.is_empty():
-                lc = left_loc.or_else_raise()
-                lx, ly = int(lc.get_coord().get_x()), int(lc.get_coord().get_y())
-                left_blocked = lc.has_actor()
-                unvisited_left = (lx, ly) not in self.last_positions
-            else:
-                left_blocked = False
-                unvisited_left = True
+            left_blocked = has_actor(snap.left)
+            unvisited_left = snap.left is None or snap.left.pos not in self.last_positions
 
-            right_blocked, unvisited_right = True, False
-            if not right_loc.is_empty():
-                rc = right_loc.or_else_raise()
-                rx, ry = int(rc.get_coord().get_x()), int(rc.get_coord().get_y())
-                right_blocked = rc.has_actor()
-                unvisited_right = (rx, ry) not in self.last_positions
-            else:
-                right_blocked = False
-                unvisited_right = True
+            right_blocked = has_actor(snap.right)
+            unvisited_right = snap.right is None or snap.right.pos not in self.last_positions
 
             # Enter blocked phase if actor or wall ahead
             if self.phase == "blocked" or ahead_blocked:
@@ -804,28 +747,13 @@ class BaseCleanerMind(VWLLMActorMindSurrogate):
                     self.phase = self.prev_phase
                     return [VWMoveAction()]
 
-                prompt = f"""
-You are blocked by an agent or wall directly ahead.
-
-Ahead: {'blocked' if ahead_blocked else 'free'}
-Left: {'blocked' if left_blocked else 'free'}
-Right: {'blocked' if right_blocked else 'free'}
-
-Flags:
-- Left leads to an unvisited cell: {unvisited_left}
-- Right leads to an unvisited cell: {unvisited_right}
-
-Rules (FOLLOW EXACTLY):
-1. IF right cell is FREE and UNVISITED then TURN_RIGHT
-2. If left cell is FREE and UNVISITED then TURN_LEFT
-3. If neither left nor right lead to unvisited cells, but one is free → TURN towards the free cell.
-4. If all blocked → TURN_LEFT
-5. Do not move forward while an agent or wall is ahead.
-
-Output EXACTLY ONE action: MOVE_FORWARD, TURN_LEFT, or TURN_RIGHT
-Do NOT include text, punctuation, or explanation.
-"""
-                response = self.decide_physical_with_ai(prompt)
+                response = ask(self, self.instructions["blocked"], tier="easy", state={
+                    "ahead": "blocked" if ahead_blocked else "free",
+                    "left": "blocked" if left_blocked else "free",
+                    "right": "blocked" if right_blocked else "free",
+                    "left unvisited": unvisited_left,
+                    "right unvisited": unvisited_right,
+                })
                 action = self.parse_gemini_response(response)
 
                 if isinstance(action, VWTurnAction):
@@ -834,8 +762,7 @@ Do NOT include text, punctuation, or explanation.
 
                 if getattr(self, "just_blocked_turn", False):
                     self.just_blocked_turn = False
-                    fwd = obs.get_forward()
-                    if (fwd.is_empty() or not fwd.or_else_raise().has_actor()) and not obs.is_wall_immediately_ahead():
+                    if not ahead_blocked:
                         return [VWMoveAction()]
                     return [VWIdleAction()]
 
@@ -844,40 +771,15 @@ Do NOT include text, punctuation, or explanation.
             # -------------------------
             # CLEANING PHASE (LLM-BASED)
             # -------------------------
-            center = obs.get_center()
-
-            # Check if standing on dirt that needs cleaning
-            standing_on_dirt = False
-            dirt_colour_here = None
-            current_pos = (x, y)
-
-            if not center.is_empty():
-                c = center.or_else_raise()
-                if c.has_dirt():
-                    dirt_app = c.get_dirt_appearance().or_else_raise()
-                    dirt_colour_here = dirt_app.get_colour().name.lower()
-                    # Only clean if it matches our colour and hasn't been cleaned
-                    standing_on_dirt = (dirt_colour_here == self.colour_name) and (current_pos not in self.cleaned)
-
-            # If standing on matching dirt, clean immediately
-            if standing_on_dirt:
-                print(f"[{self.colour_name.upper()}] Cleaning {dirt_colour_here} dirt at {current_pos}")
-                self.cleaned.add(current_pos)
-                return [VWCleanAction()]
-
             # Calculate remaining dirt targets (ONLY our colour)
-            remaining_dirt = [
-                pos for pos, colour in self.dirt_map.items()
-                if colour.lower() == self.colour_name and pos not in self.cleaned
-            ]
-
-            # If no dirt left of our colour, idle
-            if not remaining_dirt:
-                print(f"[{self.colour_name.upper()}] No remaining {self.colour_name} dirt, idling")
-                return [VWIdleAction()]
+            with self.timings.section("select_target"):
+                # Find nearest dirt target of our colour
+                target = self.remaining.nearest(x, y, self.colour_name)
 
-            # Find nearest dirt target of our colour
-            target = min(remaining_dirt, key=lambda t: abs(t[0]-x) + abs(t[1]-y))
+                # If no dirt left of our colour, idle
+                if target is None:
+                    print(f"[{self.colour_name.upper()}] No remaining {self.colour_name} dirt, idling")
+                    return [VWIdleAction()]
             tx, ty = target
             manhattan_distance = abs(tx - x) + abs(ty - y)
 
@@ -895,177 +797,47 @@ Do NOT include text, punctuation, or explanation.
                 desired_orientation = orient
                 direction_name = orient.name
 
-            # Get adjacent cell information
-            fwd = obs.get_forward()
-            left_loc = obs.get_left()
-            right_loc = obs.get_right()
-
-            # Check forward
-            forward_blocked = obs.is_wall_immediately_ahead()
-            forward_has_actor = False
-            forward_has_dirt = False
-            forward_dirt_colour = None
-            forward_pos = None
-            forward_is_target_colour = False
-
-            if not fwd.is_empty():
-                fwd_cell = fwd.or_else_raise()
-                forward_has_actor = fwd_cell.has_actor()
-                forward_blocked = forward_blocked or forward_has_actor
-                forward_pos = (int(fwd_cell.get_coord().get_x()), int(fwd_cell.get_coord().get_y()))
-
-                if fwd_cell.has_dirt():
-                    forward_has_dirt = True
-                    forward_dirt_colour = fwd_cell.get_dirt_appearance().or_else_raise().get_colour().name.lower()
-                    forward_is_target_colour = (forward_dirt_colour == self.colour_name)
-
-            # Check left
-            left_blocked = False
-            left_has_actor = False
-            left_has_dirt = False
-            left_dirt_colour = None
-            left_pos = None
-            left_is_target_colour = False
-
-            if not left_loc.is_empty():
-                left_cell = left_loc.or_else_raise()
-                left_has_actor = left_cell.has_actor()
-                left_blocked = left_has_actor
-                left_pos = (int(left_cell.get_coord().get_x()), int(left_cell.get_coord().get_y()))
-
-                if left_cell.has_dirt():
-                    left_has_dirt = True
-                    left_dirt_colour = left_cell.get_dirt_appearance().or_else_raise().get_colour().name.lower()
-                    left_is_target_colour = (left_dirt_colour == self.colour_name)
-
-            # Check right
-            right_blocked = False
-            right_has_actor = False
-            right_has_dirt = False
-            right_dirt_colour = None
-            right_pos = None
-            right_is_target_colour = False
-
-            if not right_loc.is_empty():
-                right_cell = right_loc.or_else_raise()
-                right_has_actor = right_cell.has_actor()
-                right_blocked = right_has_actor
-                right_pos = (int(right_cell.get_coord().get_x()), int(right_cell.get_coord().get_y()))
+            # Adjacent cell information from this cycle's snapshot
+            forward_pos, forward_has_actor, forward_has_dirt, forward_dirt_colour = _cell_summary(snap.forward)
+            left_pos, left_has_actor, left_has_dirt, left_dirt_colour = _cell_summary(snap.left)
+            right_pos, right_has_actor, right_has_dirt, right_dirt_colour = _cell_summary(snap.right)
+
+            forward_blocked = snap.wall_ahead or forward_has_actor
+            left_blocked = left_has_actor
+            right_blocked = right_has_actor
 
-                if right_cell.has_dirt():
-                    right_has_dirt = True
-                    right_dirt_colour = right_cell.get_dirt_appearance().or_else_raise().get_colour().name.lower()
-                    right_is_target_colour = (right_dirt_colour == self.colour_name)
+            forward_is_target_colour = forward_dirt_colour == self.colour_name
+            left_is_target_colour = left_dirt_colour == self.colour_name
+            right_is_target_colour = right_dirt_colour == self.colour_name
 
             # Count other colour dirt for context
             other_colour = "orange" if self.colour_name == "green" else "green"
-            my_colour_count = len(remaining_dirt)
-            other_colour_count = sum(1 for pos, col in self.dirt_map.items()
-                                    if col.lower() == other_colour and pos not in self.cleaned)
+            my_colour_count = self.remaining.count(self.colour_name)
+            other_colour_count = self.remaining.count(other_colour)
 
             # Build list of remaining dirt of our colour
-            dirt_list_str = ', '.join([f"({d[0]},{d[1]})" for d in remaining_dirt[:5]])
-            if len(remaining_dirt) > 5:
-                dirt_list_str += f" ... and {len(remaining_dirt)-5} more"
-
-            # Build comprehensive LLM prompt
-            prompt = f"""You are the {self.colour_name.upper()} cleaning agent in a grid world.
-
-MISSION: Navigate to and clean ONLY {self.colour_name.upper()} dirt. You must IGNORE {other_colour} dirt (that's for the {other_colour} agent).
-
-YOUR COLOUR: {self.colour_name.upper()}
-OTHER AGENT'S COLOUR: {other_colour.upper()} (IGNORE THIS)
-
-CURRENT STATE:
-- Your position: ({x}, {y})
-- Your orientation: {orient.name}
-- Target {self.colour_name} dirt: ({tx}, {ty})
-- Manhattan distance to target: {manhattan_distance}
-- Direction to target: {direction_name}
-- Desired orientation to reach target: {desired_orientation.name}
-
-REMAINING DIRT STATUS:
-- {self.colour_name.upper()} dirt remaining (YOUR JOB): {my_colour_count}
-- {other_colour.upper()} dirt remaining (NOT YOUR JOB): {other_colour_count}
-- Your remaining {self.colour_name} dirt locations: {dirt_list_str}
-
-CLEANING PROGRESS:
-- {self.colour_name.upper()} dirt you've cleaned: {len(self.cleaned)}
-- Last 3 cleaned positions: {list(self.cleaned)[-3:] if self.cleaned else 'none'}
-
-ADJACENT CELLS:
-Forward (ahead):
-  - Position: {forward_pos if forward_pos else 'wall/unknown'}
-  - Blocked by wall: {obs.is_wall_immediately_ahead()}
-  - Blocked by actor: {forward_has_actor}
-  - Overall blocked: {forward_blocked}
-  - Has dirt: {forward_has_dirt}
-  - Dirt colour: {forward_dirt_colour if forward_has_dirt else 'none'}
-  - Is YOUR colour ({self.colour_name}): {forward_is_target_colour}
-
-Left:
-  - Position: {left_pos if left_pos else 'wall/unknown'}
-  - Blocked by actor: {left_has_actor}
-  - Overall blocked: {left_blocked}
-  - Has dirt: {left_has_dirt}
-  - Dirt colour: {left_dirt_colour if left_has_dirt else 'none'}
-  - Is YOUR colour ({self.colour_name}): {left_is_target_colour}
-
-Right:
-  - Position: {right_pos if right_pos else 'wall/unknown'}
-  - Blocked by actor: {right_has_actor}
-  - Overall blocked: {right_blocked}
-  - Has dirt: {right_has_dirt}
-  - Dirt colour: {right_dirt_colour if right_has_dirt else 'none'}
-  - Is YOUR colour ({self.colour_name}): {right_is_target_colour}
-
-NAVIGATION RULES (FOLLOW EXACTLY):
-1. CRITICAL: You ONLY clean {self.colour_name.upper()} dirt. DO NOT go towards {other_colour} dirt.
-
-2. If standing on {self.colour_name} dirt:
-   - (Handled automatically - you won't see this scenario)
-
-3. Priority navigation:
-   - If adjacent cell has {self.colour_name} dirt: Turn to face it, then move to it
-   - Otherwise: Navigate to nearest {self.colour_name} dirt at ({tx}, {ty})
-
-4. Movement logic:
-   - If facing desired orientation ({desired_orientation.name}) AND forward is FREE: MOVE_FORWARD
-   - If facing desired orientation BUT forward is BLOCKED: Turn to find alternate path
-   - If NOT facing desired orientation: Turn towards it (TURN_LEFT or TURN_RIGHT)
-
-5. When choosing turn direction:
-   - Prefer turning towards cells with {self.colour_name} dirt
-   - Prefer turning towards free cells that move closer to target
-   - Avoid turning towards {other_colour} dirt (not your job)
-
-6. CRITICAL: NEVER output MOVE_FORWARD when forward is blocked (wall or other agent).
-
-7. If blocked by other agents:
-   - Be patient, turn to find alternate path
-   - Don't compete with the {other_colour} agent if they're near {other_colour} dirt
-   - Wait if necessary by turning or idling
-
-8. Coordination:
-   - White agent explores and broadcasts the map first
-   - You and {other_colour} agent work in parallel to clean your respective colours
-   - Stay out of each other's way when possible
-
-DECISION STRATEGY:
-Step 1: Check if adjacent cells have {self.colour_name} dirt → move towards it
-Step 2: Check alignment with target orientation ({desired_orientation.name})
-Step 3: Check if forward path is clear
-Step 4: Decide:
-   - MOVE_FORWARD if aligned, clear, and moving towards {self.colour_name} dirt
-   - TURN_LEFT or TURN_RIGHT if blocked or need to reorient
-
-OUTPUT ONE ACTION ONLY:
-- MOVE_FORWARD (only if forward is clear and brings you closer to {self.colour_name} dirt)
-- TURN_LEFT (to avoid obstacles or reorient towards {self.colour_name} target)
-- TURN_RIGHT (to avoid obstacles or reorient towards {self.colour_name} target)
-
-Output EXACTLY ONE action name. NO explanations, punctuation, or extra text.
-"""
+            dirt_list_str = ', '.join([f"({d[0]},{d[1]})" for d in islice(self.remaining.cells(self.colour_name), 5)])
+            if my_colour_count > 5:
+                dirt_list_str += f" ... and {my_colour_count-5} more"
+
+            # This cycle's state for the LLM
+            state = {
+                "position": f"({x}, {y})",
+                "orientation": orient.name,
+                "target": f"({tx}, {ty})",
+                "distance to target": manhattan_distance,
+                "direction to target": direction_name,
+                "desired orientation": desired_orientation.name,
+                "dirt remaining": f"{self.colour_name} {my_colour_count} (yours), {other_colour} {other_colour_count}",
+                "remaining dirt": dirt_list_str,
+                "cleaned": f"{len(self.cleaned)}, last {list(self.cleaned)[-3:] if self.cleaned else 'none'}",
+                "ahead": cell_line(forward_blocked, forward_pos, snap.wall_ahead, forward_has_actor,
+                                   forward_dirt_colour if forward_has_dirt else None, self.colour_name),
+                "left": cell_line(left_blocked, left_pos, False, left_has_actor,
+                                  left_dirt_colour if left_has_dirt else None, self.colour_name),
+                "right": cell_line(right_blocked, right_pos, False, right_has_actor,
+                                   right_dirt_colour if right_has_dirt else None, self.colour_name),
+            }
 
             print(f"[{self.colour_name.upper()} CLEANING] Calling LLM...")
             print(f"  Position: ({x},{y}), Target: ({tx},{ty}), Distance: {manhattan_distance}")
@@ -1074,8 +846,9 @@ Output EXACTLY ONE action name. NO explanations, punctuation, or extra text.
             print(f"  Left: {'blocked' if left_blocked else 'free'} (has {self.colour_name} dirt: {left_is_target_colour})")
             print(f"  Right: {'blocked' if right_blocked else 'free'} (has {self.colour_name} dirt: {right_is_target_colour})")
 
-            # Call LLM
-            response = self.decide_physical_with_ai(prompt)
+            # Call LLM: cleaning next to another agent is the hardest request
+            tier = "hard" if forward_has_actor or left_has_actor or right_has_actor else "normal"
+            response = ask(self, self.instructions["cleaning"], state, tier)
             action = self.parse_gemini_response(response)
 
             print(f"[{self.colour_name.upper()} CLEANING] LLM suggested: {action.__class__.__name__}")
@@ -1101,7 +874,7 @@ Output EXACTLY ONE action name. NO explanations, punctuation, or extra text.
     # ----------------------------
     # Gemini response parsing
     # ----------------------------
-    def parse_gemini_response(self, response: GenerateContentResponse) -> VWAction:
+    def parse_gemini_response(self, response: "GenerateContentResponse") -> VWAction:
         try:
             if isinstance(response, VWAction):
                 return response
@@ -1136,4 +909,5 @@ class GreenMind(BaseCleanerMind):
 # Run simulation
 # ----------------------------
 if __name__ == "__main__":
+    from vacuumworld import run
     run(white_mind=WhiteLLMMind(), orange_mind=OrangeMind(), green_mind=GreenMind())
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+
+# ----------------------------
+# Policy precompilation: lookup tables for teleoreactive rules
+# ----------------------------
+# A rule is a pure function of a small discrete state (every argument an int
+# in range(domain)). compile_policy() evaluates it once for every state and
+# stores the results in a dict keyed by the state tuple, so deciding at run
+# time is a single subscript, table[state], instead of a chain of branches.
+
+from itertools import product
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+
+# Physical action codes produced by the rules
+MOVE, TURN_LEFT, TURN_RIGHT, IDLE = range(4)
+
+# Perceived state of an adjacent cell
+FREE, ACTOR, WALL = range(3)
+
+# Remembered turn direction
+NO_TURN, LEFT, RIGHT = range(3)
+
+# (action code, just_turned after the decision, turn direction after the decision, log message)
+Decision = Tuple[int, bool, int, str]
+
+
+class PolicyTable(Dict[Tuple[int, ...], Decision]):
+    def __init__(self, rule: Callable[..., Decision], domains: Sequence[int]) -> None:
+        super().__init__((state, rule(*state)) for state in product(*(range(d) for d in domains)))
+        self.rule = rule
+        self.domains: Tuple[int, ...] = tuple(domains)
+
+    def check(self) -> None:
+        """Re-evaluate the rule on every state; raises AssertionError if the table is stale."""
+        for state, decision in self.items():
+            assert self.rule(*state) == decision, f"policy table differs from rule at {state}"
+
+
+def compile_policy(rule: Callable[..., Decision], domains: Sequence[int]) -> PolicyTable:
+    return PolicyTable(rule, domains)
+
+
+def cell_state(cell: Optional[object], wall: bool = False) -> int:
+    if wall or cell is None:
+        return WALL
+    return ACTOR if cell.has_actor else FREE
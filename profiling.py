@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+
+# ----------------------------
+# Cycle-cost profiling for the part A/B minds
+# ----------------------------
+# Every mind's decide() is wrapped with @profile_cycles, which records one
+# entry per environment cycle: the phase the decision was taken in and the
+# type of each action returned. A cycle taken with another actor directly
+# ahead is booked under "blocked" so that congestion shows up separately.
+#
+# Summaries come in two forms:
+#   - report():  per-phase/per-action table with bars (flame-style, widest first)
+#   - folded():  "mind;phase;action count" lines, the folded-stack format
+#                read by flamegraph tools
+# and aggregate() merges the profiles of a batch of runs.
+#
+# Separately, HotPathTimer measures wall-clock time of revise()/decide() and
+# of named sections inside them (observation unpacking, target selection) into
+# log2 microsecond histograms. Timing is sampled once every
+# VW_TIMING_SAMPLE_EVERY cycles (default 1 = every cycle, 0 = off).
+
+import os
+import time
+from functools import wraps
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+
+# Default VacuumWorld effort is 1 for every action type
+ACTION_EFFORTS: Dict[str, int] = {"move": 1, "turn": 1, "clean": 1, "idle": 1, "broadcast": 1, "speak": 1}
+
+BLOCKED_PHASE = "blocked"
+
+
+def action_name(action: object) -> str:
+    name = type(action).__name__
+    if name.startswith("VW"):
+        name = name[2:]
+    if name.endswith("Action"):
+        name = name[:-6]
+    return name.lower()
+
+
+class CycleProfile:
+    def __init__(self, mind: str) -> None:
+        self.mind = mind
+        self.cycles: int = 0
+        self.phase_cycles: Dict[str, int] = {}
+        self.phase_effort: Dict[str, int] = {}
+        self.action_counts: Dict[Tuple[str, str], int] = {}
+
+    def record(self, phase: str, actions: Iterable[object]) -> None:
+        self.cycles += 1
+        self.phase_cycles[phase] = self.phase_cycles.get(phase, 0) + 1
+        for action in actions:
+            name = action_name(action)
+            key = (phase, name)
+            self.action_counts[key] = self.action_counts.get(key, 0) + 1
+            self.phase_effort[phase] = self.phase_effort.get(phase, 0) + ACTION_EFFORTS.get(name, 1)
+
+    def merge(self, other: "CycleProfile") -> None:
+        self.cycles += other.cycles
+        for phase, count in other.phase_cycles.items():
+            self.phase_cycles[phase] = self.phase_cycles.get(phase, 0) + count
+        for phase, effort in other.phase_effort.items():
+            self.phase_effort[phase] = self.phase_effort.get(phase, 0) + effort
+        for key, count in other.action_counts.items():
+            self.action_counts[key] = self.action_counts.get(key, 0) + count
+
+    def action_totals(self) -> Dict[str, int]:
+        totals: Dict[str, int] = {}
+        for (_, name), count in self.action_counts.items():
+            totals[name] = totals.get(name, 0) + count
+        return totals
+
+    def folded(self) -> List[str]:
+        return [f"{self.mind};{phase};{name} {count}"
+                for (phase, name), count in sorted(self.action_counts.items())]
+
+    def report(self, width: int = 40) -> str:
+        lines = [f"[{self.mind.upper()}] {self.cycles} cycles, "
+                 f"effort {sum(self.phase_effort.values())}, actions {self.action_totals()}"]
+        if not self.cycles:
+            return lines[0]
+
+        for phase, count in sorted(self.phase_cycles.items(), key=lambda kv: -kv[1]):
+            bar = "#" * max(1, round(width * count / self.cycles))
+            lines.append(f"  {phase:<13} {count:>7} {100 * count / self.cycles:5.1f}% "
+                         f"effort={self.phase_effort.get(phase, 0):<7} {bar}")
+            actions = sorted(((name, c) for (p, name), c in self.action_counts.items() if p == phase),
+                             key=lambda kv: -kv[1])
+            for name, c in actions:
+                lines.append(f"    {name:<11} {c:>7}")
+        return "\n".join(lines)
+
+
+def aggregate(profiles: Iterable[CycleProfile]) -> Dict[str, CycleProfile]:
+    """Merge per-run profiles into one profile per mind."""
+    merged: Dict[str, CycleProfile] = {}
+    for profile in profiles:
+        if profile.mind not in merged:
+            merged[profile.mind] = CycleProfile(profile.mind)
+        merged[profile.mind].merge(profile)
+    return merged
+
+
+def _forward_has_actor(mind: object) -> bool:
+    snap = getattr(mind, "snapshot", None)
+    return snap is not None and snap.forward is not None and snap.forward.has_actor
+
+
+def profile_cycles(decide: Callable) -> Callable:
+    """Decorator for decide(): books the cycle under the mind's current phase."""
+    @wraps(decide)
+    def wrapper(self):
+        phase = self.current_phase()
+        if _forward_has_actor(self):
+            phase = BLOCKED_PHASE
+        actions = list(decide(self))
+        self.cycle_profile.record(phase, actions)
+        return actions
+    return wrapper
+
+
+# ----------------------------
+# Wall-clock hot-path timing
+# ----------------------------
+DEFAULT_SAMPLE_EVERY: int = int(os.environ.get("VW_TIMING_SAMPLE_EVERY", "1"))
+
+HISTOGRAM_BUCKETS: int = 24     # bucket b holds samples in [2^(b-1), 2^b) microseconds
+
+
+class TimingHistogram:
+    def __init__(self) -> None:
+        self.count: int = 0
+        self.total: float = 0.0
+        self.buckets: List[int] = [0] * HISTOGRAM_BUCKETS
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        bucket = min(int(seconds * 1e6).bit_length(), HISTOGRAM_BUCKETS - 1)
+        self.buckets[bucket] += 1
+
+    def merge(self, other: "TimingHistogram") -> None:
+        self.count += other.count
+        self.total += other.total
+        self.buckets = [a + b for a, b in zip(self.buckets, other.buckets)]
+
+    def mean_us(self) -> float:
+        return 1e6 * self.total / self.count if self.count else 0.0
+
+    def percentile_us(self, q: float) -> int:
+        """Upper bound (in microseconds) of the bucket holding the q-th percentile."""
+        seen, rank = 0, q * self.count
+        for bucket, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= rank:
+                return 1 << bucket
+        return 0
+
+    def sparkline(self) -> str:
+        used = [i for i, c in enumerate(self.buckets) if c]
+        if not used:
+            return ""
+        peak = max(self.buckets)
+        ticks = " .:-=+*#%@"
+        return "".join(ticks[min(9, (9 * c + peak - 1) // peak)] for c in self.buckets[used[0]:used[-1] + 1])
+
+
+class _Section:
+    __slots__ = ("_timer", "_name", "_start")
+
+    def __init__(self, timer: "HotPathTimer", name: str) -> None:
+        self._timer = timer
+        self._name = name
+        self._start = 0.0
+
+    def __enter__(self) -> None:
+        if self._timer.active:
+            self._start = time.perf_counter()
+
+    def __exit__(self, *exc: object) -> None:
+        if self._timer.active:
+            self._timer.add(self._name, time.perf_counter() - self._start)
+
+
+class HotPathTimer:
+    def __init__(self, mind: str, sample_every: Optional[int] = None) -> None:
+        self.mind = mind
+        self.sample_every: int = DEFAULT_SAMPLE_EVERY if sample_every is None else sample_every
+        self.active: bool = False
+        self.cycle: int = 0
+        self.histograms: Dict[str, TimingHistogram] = {}
+
+    def start_cycle(self) -> None:
+        self.active = self.sample_every > 0 and self.cycle % self.sample_every == 0
+        self.cycle += 1
+
+    def add(self, name: str, seconds: float) -> None:
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = TimingHistogram()
+        histogram.add(seconds)
+
+    def section(self, name: str) -> _Section:
+        return _Section(self, name)
+
+    def merge(self, other: "HotPathTimer") -> None:
+        for name, histogram in other.histograms.items():
+            if name not in self.histograms:
+                self.histograms[name] = TimingHistogram()
+            self.histograms[name].merge(histogram)
+
+    def report(self) -> str:
+        lines = [f"[{self.mind.upper()}] sampled every {self.sample_every} cycle(s)"]
+        for name, h in sorted(self.histograms.items(), key=lambda kv: -kv[1].total):
+            lines.append(f"  {name:<18} n={h.count:<7} mean={h.mean_us():8.1f}us "
+                         f"p50<={h.percentile_us(0.5):>5}us p99<={h.percentile_us(0.99):>6}us |{h.sparkline()}|")
+        return "\n".join(lines)
+
+
+def aggregate_timers(timers: Iterable[HotPathTimer]) -> Dict[str, HotPathTimer]:
+    merged: Dict[str, HotPathTimer] = {}
+    for timer in timers:
+        if timer.mind not in merged:
+            merged[timer.mind] = HotPathTimer(timer.mind, timer.sample_every)
+        merged[timer.mind].merge(timer)
+    return merged
+
+
+def timed(name: str) -> Callable:
+    """
+    Decorator for revise()/decide(). Timing "revise" also opens the sampling
+    window for the cycle, so it must decorate revise() of every timed mind.
+    """
+    def decorator(method: Callable) -> Callable:
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            timer = self.timings
+            if name == "revise":
+                timer.start_cycle()
+            if not timer.active:
+                return method(self, *args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                timer.add(name, time.perf_counter() - start)
+        return wrapper
+    return decorator
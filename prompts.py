@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+
+# ----------------------------
+# Static LLM instructions and per-cycle state for the part B minds
+# ----------------------------
+# The rules of every part B prompt (how to get unblocked, how to zigzag, how
+# to reach dirt) never change during a run; only the agent's state does. Each
+# mind builds its instructions once, in __init__ (the cleaners' name their
+# colour), and every LLM call sends one of them with a compact state block:
+#   STATE
+#   position: (2, 3)
+#   orientation: east
+#   ...
+# The calls are stateless, so the state block is complete every cycle, but it
+# holds only what changes: the rules refer to its fields by name instead of
+# repeating the values.
+#
+# How the instruction reaches the model is decided once per LLM callable by
+# ask(): if decide_physical_with_ai() takes a system_instruction keyword, the
+# instruction is passed there and the prompt is the state block alone;
+# otherwise the prompt is instruction + state, with the instruction as a
+# byte-identical prefix on every call, which is what prompt caching matches on.
+#
+# VacuumWorld's LLM surrogate takes the prompt alone, so a part B run against
+# a real model takes the second path. There the only saving made here is the
+# shorter prompt, about 8% of the tokens per call (`benchmarks.py prompts`:
+# 355/481/540 at n=5/10/25, against 385/526/583 for the prompts this module
+# replaced). Anything more depends on the provider caching the repeated prefix
+# on its own (implicit prefix caching). The system-instruction path, at
+# 61/89/136 tokens per call, is taken by the LLMs of this repository that
+# accept the keyword: vwsim's mock LLM, the router and the local model.
+# Each call site also names the difficulty of its request (TIERS), passed on
+# as a tier keyword to an LLM that takes one (routing.TieredRouter).
+
+import inspect
+from typing import Callable, Dict, Optional, Tuple
+
+BLOCKED_INSTRUCTION = """You are blocked by an agent or wall directly ahead.
+The STATE below says whether each side is free and leads to an unvisited cell.
+
+Rules (FOLLOW EXACTLY):
+1. IF right cell is FREE and UNVISITED then TURN_RIGHT
+2. If left cell is FREE and UNVISITED then TURN_LEFT
+3. If neither left nor right lead to unvisited cells, but one is free → TURN towards the free cell.
+4. If all blocked → TURN_LEFT
+5. Do not move forward while an agent or wall is ahead.
+
+Output EXACTLY ONE action: MOVE_FORWARD, TURN_LEFT, or TURN_RIGHT
+Do NOT include text, punctuation, or explanation.
+"""
+
+ZIGZAG_INSTRUCTION = """You are controlling a vacuum agent exploring a grid row by row (zigzag).
+The STATE below gives the grid size, your position and orientation, the adjacent
+squares (walls + other agents), the zigzag flags and the cells seen so far.
+
+Additional instructions:
+- If the square in your last row direction is blocked by a wall, first attempt to move north.
+- If north is also blocked (by wall or actor), choose the next free direction clockwise (east → south → west).
+- Always avoid moving into walls or other agents.
+- Prioritize moving into unvisited cells if available.
+
+Rules for zigzag (FOLLOW EXACTLY):
+1. IF moving up a row = True:
+- Output ONLY MOVE_FORWARD to move north one cell.
+2. ELSE IF at row end = True:
+- Begin moving up to the next row (set moving up a row = True).
+- Output the action needed to move one cell north.
+3. ELSE:
+- Move forward if the square ahead is unvisited and free.
+- TURN_LEFT or TURN_RIGHT only if needed to avoid walls or continue zigzag in last row direction.
+4. Avoid already visited cells unless no unvisited square is reachable.
+5. Avoid squares occupied by other agents.
+6. Do not move outside the grid.
+7. After moving up, TURN to face next row direction to continue zigzag.
+
+Output:
+- Provide EXACTLY ONE action: MOVE_FORWARD, TURN_LEFT, or TURN_RIGHT.
+- DO NOT include explanations, punctuation, code, or extra text.
+- Output only the move name.
+"""
+
+WHITE_CLEANING_INSTRUCTION = """You are the WHITE cleaning agent in a grid.
+
+MISSION: Navigate to and clean ALL remaining dirt (any colour) in the grid.
+The STATE below gives your position and orientation, the nearest dirt (target),
+the remaining dirt and the adjacent cells (ahead, left, right: free or blocked,
+then the cell, whether a wall or an actor blocks it and its dirt).
+
+NAVIGATION RULES (FOLLOW EXACTLY):
+1. You clean ALL colours of dirt (orange, green, or any other).
+
+2. If standing on dirt: (Handled automatically - you won't see this)
+
+3. Priority navigation:
+   - If adjacent cell has dirt: Turn to face it, then move to it
+   - Otherwise: Navigate to the target
+
+4. Movement logic:
+   - If facing desired orientation AND ahead is FREE: MOVE_FORWARD
+   - If facing desired orientation BUT ahead is BLOCKED: Turn to find alternate path
+   - If NOT facing desired orientation: Turn towards it
+
+5. When blocked, choose turn direction based on:
+   - Which direction has dirt visible
+   - Which direction is free and moves closer to target
+   - If both blocked, turn towards less-blocked side
+
+6. CRITICAL: NEVER output MOVE_FORWARD when ahead is blocked (wall or other agent).
+
+7. If surrounded by orange/green agents cleaning their dirt:
+   - Be patient, turn to face free directions
+   - Wait for them to move, then proceed to your target
+
+DECISION STRATEGY:
+Step 1: Check if adjacent cells have dirt → prioritize moving to them
+Step 2: Check alignment with desired orientation
+Step 3: Check if ahead is clear
+Step 4: Decide: MOVE_FORWARD (if aligned & clear) OR TURN (if blocked or misaligned)
+
+OUTPUT ONE ACTION ONLY:
+- MOVE_FORWARD (only if ahead is clear and brings you closer to dirt)
+- TURN_LEFT (to avoid obstacles or reorient towards target)
+- TURN_RIGHT (to avoid obstacles or reorient towards target)
+
+Output EXACTLY ONE action name. NO explanations, punctuation, or extra text.
+"""
+
+CLEANER_CLEANING_INSTRUCTION = """You are the {COLOUR} cleaning agent in a grid world.
+
+MISSION: Navigate to and clean ONLY {COLOUR} dirt. You must IGNORE {other} dirt (that's for the {other} agent).
+
+YOUR COLOUR: {COLOUR}
+OTHER AGENT'S COLOUR: {OTHER} (IGNORE THIS)
+
+The STATE below gives your position and orientation, the nearest {colour} dirt
+(target), the remaining dirt and the adjacent cells (ahead, left, right: free or
+blocked, then the cell, whether a wall or an actor blocks it and its dirt,
+marked "yours" if it is {colour}).
+
+NAVIGATION RULES (FOLLOW EXACTLY):
+1. CRITICAL: You ONLY clean {COLOUR} dirt. DO NOT go towards {other} dirt.
+
+2. If standing on {colour} dirt:
+   - (Handled automatically - you won't see this scenario)
+
+3. Priority navigation:
+   - If adjacent cell has {colour} dirt: Turn to face it, then move to it
+   - Otherwise: Navigate to the target
+
+4. Movement logic:
+   - If facing desired orientation AND ahead is FREE: MOVE_FORWARD
+   - If facing desired orientation BUT ahead is BLOCKED: Turn to find alternate path
+   - If NOT facing desired orientation: Turn towards it (TURN_LEFT or TURN_RIGHT)
+
+5. When choosing turn direction:
+   - Prefer turning towards cells with {colour} dirt
+   - Prefer turning towards free cells that move closer to target
+   - Avoid turning towards {other} dirt (not your job)
+
+6. CRITICAL: NEVER output MOVE_FORWARD when ahead is blocked (wall or other agent).
+
+7. If blocked by other agents:
+   - Be patient, turn to find alternate path
+   - Don't compete with the {other} agent if they're near {other} dirt
+   - Wait if necessary by turning or idling
+
+8. Coordination:
+   - White agent explores and broadcasts the map first
+   - You and {other} agent work in parallel to clean your respective colours
+   - Stay out of each other's way when possible
+
+DECISION STRATEGY:
+Step 1: Check if adjacent cells have {colour} dirt → move towards it
+Step 2: Check alignment with desired orientation
+Step 3: Check if ahead is clear
+Step 4: Decide:
+   - MOVE_FORWARD if aligned, clear, and moving towards {colour} dirt
+   - TURN_LEFT or TURN_RIGHT if blocked or need to reorient
+
+OUTPUT ONE ACTION ONLY:
+- MOVE_FORWARD (only if ahead is clear and brings you closer to {colour} dirt)
+- TURN_LEFT (to avoid obstacles or reorient towards {colour} target)
+- TURN_RIGHT (to avoid obstacles or reorient towards {colour} target)
+
+Output EXACTLY ONE action name. NO explanations, punctuation, or extra text.
+"""
+
+
+# Difficulty of a request, named by its call site (routing.py)
+TIERS: Tuple[str, ...] = ("easy", "normal", "hard")
+
+
+def instructions_for(colour: str) -> Dict[str, str]:
+    """Situation -> static instruction for one agent, built once when the mind is created."""
+    if colour == "white":
+        return {"blocked": BLOCKED_INSTRUCTION, "zigzag": ZIGZAG_INSTRUCTION, "cleaning": WHITE_CLEANING_INSTRUCTION}
+    other = "orange" if colour == "green" else "green"
+    cleaning = CLEANER_CLEANING_INSTRUCTION.format(colour=colour, COLOUR=colour.upper(), other=other,
+                                                   OTHER=other.upper())
+    return {"blocked": BLOCKED_INSTRUCTION, "cleaning": cleaning}
+
+
+# ----------------------------
+# State block and delivery
+# ----------------------------
+def state_block(state: Dict[str, object]) -> str:
+    return "STATE\n" + "\n".join(f"{key}: {value}" for key, value in state.items()) + "\n"
+
+
+def split_request(prompt: str, system_instruction: object = None) -> Tuple[str, str]:
+    """(instruction, state block) of a request as sent by ask(), with either delivery."""
+    if system_instruction is not None:
+        return str(system_instruction), prompt
+    start = prompt.rfind("STATE\n")
+    return (prompt[:start].rstrip("\n"), prompt[start:]) if start >= 0 else ("", prompt)
+
+
+def parse_state(prompt: str) -> Dict[str, str]:
+    """The STATE block of a request as key -> first word of the value, the part the rules test."""
+    state: Dict[str, str] = {}
+    start = prompt.rfind("STATE\n")
+    for line in prompt[start + len("STATE\n") if start >= 0 else 0:].splitlines():
+        key, _, value = line.partition(": ")
+        state[key] = value.strip().split(" ")[0].rstrip(",")
+    return state
+
+
+def cell_line(blocked: bool, pos: object, wall: bool, actor: bool, dirt: object, own_colour: str = "") -> str:
+    """One adjacent cell for the state block, free/blocked first."""
+    mark = " (yours)" if own_colour and dirt == own_colour else ""
+    return (f"{'blocked' if blocked else 'free'}, cell {pos if pos else 'wall/unknown'}, wall {wall}, "
+            f"actor {actor}, dirt {dirt or 'none'}{mark}")
+
+
+_KEYWORD_SUPPORT: Dict[Tuple[object, str], bool] = {}
+
+
+def takes_keyword(llm: Callable, keyword: str) -> bool:
+    """Whether llm accepts keyword (checked once per function or callable type)."""
+    target = getattr(llm, "__func__", llm)
+    key = (target if inspect.isfunction(target) else type(target), keyword)
+    supported = _KEYWORD_SUPPORT.get(key)
+    if supported is None:
+        try:
+            supported = keyword in inspect.signature(llm).parameters
+        except (TypeError, ValueError):
+            supported = False
+        _KEYWORD_SUPPORT[key] = supported
+    return supported
+
+
+def send(llm: Callable, instruction: str, block: str, tier: Optional[str] = None) -> object:
+    """Call llm with an instruction and a state block, as a system instruction and with the tier if it takes them."""
+    kwargs = {"tier": tier} if tier is not None and takes_keyword(llm, "tier") else {}
+    if takes_keyword(llm, "system_instruction"):
+        return llm(block, system_instruction=instruction, **kwargs)
+    return llm(instruction + "\n" + block, **kwargs)
+
+
+def ask(mind: object, instruction: str, state: Dict[str, object], tier: str = "hard") -> object:
+    """One LLM request from mind: a static instruction, this cycle's state and its tier. Returns the raw response."""
+    return send(mind.decide_physical_with_ai, instruction, state_block(state), tier)
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+
+# ----------------------------
+# Tiered routing of the part B LLM requests
+# ----------------------------
+# Every call site in partB.py names a difficulty tier (prompts.TIERS):
+#   easy:    the blocked phase and the zigzag, whose rules are mechanical
+#   normal:  cleaning with no other agent next to the mind
+#   hard:    cleaning with an agent ahead, left or right
+# TieredRouter stands in for decide_physical_with_ai() and sends each tier to
+# one of its backends, ordered cheapest first (e.g. the rules, a distilled
+# local model (distill.py), the main model). Per tier and backend it keeps the
+# calls, the time they took and how many answers it rejects, and moves a tier
+#   up:    when its backend's rejection rate exceeds max_rejection_rate, after
+#          min_calls answers
+#   down:  when the next cheaper backend, tried on every probe_every-th call of
+#          the tier, has answered min_calls times within that rate and faster
+#          on average
+# An answer is rejected when the mind has to override it (no valid action, or
+# MOVE_FORWARD with the way ahead blocked) or when it moves off the heading the
+# state asks for (MOVE_FORWARD while not facing the desired orientation). Turns
+# are not judged: the instructions let a mind turn towards dirt or away from an
+# agent, so a turn the long way round, or a turn where moving on was better,
+# still counts as a good answer.
+# RuleBackend is the cheapest backend: it applies the rules the instruction
+# states to the STATE block, as vwsim's mock LLM does.
+#
+# The part B minds install a router when they are created if VW_ROUTING is
+# set, to "tier=backend,..." for the starting routes or to anything else for
+# DEFAULT_ROUTES; the backends are the rules, the local model if VW_LOCAL_MODEL
+# is set, and the surrogate's model. As without routing, the local model asks
+# the surrogate's model whenever it is less sure than VW_LOCAL_MIN_CONFIDENCE
+# (0: never). Compared with: python benchmarks.py routing.
+
+import os
+import time
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from distill import DistilledLLM, action_name, load_local_model, local_min_confidence
+from prompts import TIERS, parse_state, send, split_request
+
+ORIENTATION_NAMES: Tuple[str, ...] = ("north", "east", "south", "west")
+DEFAULT_ROUTES: Dict[str, str] = {"easy": "rules", "normal": "main", "hard": "main"}
+DEFAULT_MAX_REJECTION_RATE: float = 0.05
+DEFAULT_MIN_CALLS: int = 20
+DEFAULT_PROBE_EVERY: int = 25
+
+
+# ----------------------------
+# Rules backend
+# ----------------------------
+class RuleBackend:
+    """Answers a request by applying the rules its instruction states to its STATE block."""
+
+    @staticmethod
+    def _turn_towards(current: Optional[str], desired: Optional[str]) -> str:
+        if current not in ORIENTATION_NAMES or desired not in ORIENTATION_NAMES:
+            return "TURN_RIGHT"
+        diff = (ORIENTATION_NAMES.index(desired) - ORIENTATION_NAMES.index(current)) % 4
+        if diff == 0:
+            return "MOVE_FORWARD"
+        return "TURN_LEFT" if diff == 3 else "TURN_RIGHT"
+
+    def answer(self, instruction: str, state: Dict[str, str]) -> str:
+        if "You are blocked" in instruction:
+            left_free = state.get("left") == "free"
+            right_free = state.get("right") == "free"
+            if right_free and state.get("right unvisited") == "True":
+                return "TURN_RIGHT"
+            if left_free and state.get("left unvisited") == "True":
+                return "TURN_LEFT"
+            if right_free:
+                return "TURN_RIGHT"
+            return "TURN_LEFT"
+
+        current = state.get("orientation")
+        desired = state.get("desired orientation")
+        current = current.lower() if current else None
+        desired = desired.lower() if desired else current
+        action = self._turn_towards(current, desired)
+        if action == "MOVE_FORWARD" and state.get("ahead") == "blocked":
+            return "TURN_LEFT"
+        return action
+
+    def __call__(self, prompt: str, system_instruction: Optional[str] = None) -> str:
+        instruction, block = split_request(prompt, system_instruction)
+        return self.answer(instruction, parse_state(block))
+
+
+# ----------------------------
+# Router
+# ----------------------------
+class BackendStats:
+    def __init__(self) -> None:
+        self.calls: int = 0
+        self.seconds: float = 0.0
+        self.rejections: int = 0
+
+    @property
+    def mean_latency(self) -> float:
+        return self.seconds / self.calls if self.calls else 0.0
+
+    @property
+    def rejection_rate(self) -> float:
+        return self.rejections / self.calls if self.calls else 0.0
+
+
+def overridden(state: Dict[str, str], response: object) -> bool:
+    """Whether the mind has to override the answer: no valid action, or moving into a blocked cell."""
+    action = action_name(response)
+    return action is None or (action == "MOVE_FORWARD" and state.get("ahead") == "blocked")
+
+
+def off_heading(state: Dict[str, str], response: object) -> bool:
+    """Whether the answer moves forward while the state asks for another orientation."""
+    desired = state.get("desired orientation")
+    return (action_name(response) == "MOVE_FORWARD" and desired is not None
+            and desired.lower() != str(state.get("orientation")).lower())
+
+
+def rejected(state: Dict[str, str], response: object) -> bool:
+    return overridden(state, response) or off_heading(state, response)
+
+
+class TieredRouter:
+    """
+    Stands in for decide_physical_with_ai(), with a tier keyword: sends each
+    request to the backend its tier is routed to, and re-routes tiers from
+    the latency and rejection statistics of their backends.
+    """
+
+    def __init__(self, backends: Sequence[Tuple[str, Callable]], routes: Optional[Dict[str, str]] = None,
+                 max_rejection_rate: float = DEFAULT_MAX_REJECTION_RATE, min_calls: int = DEFAULT_MIN_CALLS,
+                 probe_every: int = DEFAULT_PROBE_EVERY, owner: str = "router") -> None:
+        self.names: List[str] = [name for name, _ in backends]
+        self.backends: Dict[str, Callable] = dict(backends)
+        # Tiers routed to a backend that is not available go to the main (last) one
+        self.routes: Dict[str, str] = {tier: name if name in self.backends else self.names[-1]
+                                       for tier, name in dict(DEFAULT_ROUTES, **(routes or {})).items()}
+        self.max_rejection_rate = max_rejection_rate
+        self.min_calls = min_calls
+        self.probe_every = probe_every
+        self.owner = owner
+        self.stats: Dict[str, Dict[str, BackendStats]] = defaultdict(lambda: defaultdict(BackendStats))
+        self.tier_calls: Dict[str, int] = defaultdict(int)
+        self.changes: List[Tuple[str, str, str]] = []      # (tier, from, to)
+
+    def _reroute(self, tier: str, name: str, reason: str) -> None:
+        print(f"[{self.owner.upper()}] Routing {tier} requests from {self.routes[tier]} to {name} ({reason})")
+        self.changes.append((tier, self.routes[tier], name))
+        self.routes[tier] = name
+
+    def choose(self, tier: str) -> str:
+        """The backend for the next request of tier, re-routing the tier first if its statistics say so."""
+        current = self.routes.setdefault(tier, self.names[-1])
+        stats = self.stats[tier]
+        index = self.names.index(current)
+        used = stats[current]
+        if index + 1 < len(self.names) and used.calls >= self.min_calls and used.rejection_rate > self.max_rejection_rate:
+            self._reroute(tier, self.names[index + 1], f"{used.rejection_rate:.0%} rejected")
+            return self.routes[tier]
+        if index == 0:
+            return current
+
+        cheaper = self.names[index - 1]
+        tried = stats[cheaper]
+        if tried.calls >= self.min_calls:
+            if tried.rejection_rate > self.max_rejection_rate:
+                return current
+            if tried.mean_latency < used.mean_latency:
+                self._reroute(tier, cheaper, f"{1e3 * tried.mean_latency:.2f} ms vs "
+                                             f"{1e3 * used.mean_latency:.2f} ms, {tried.rejection_rate:.0%} rejected")
+                return cheaper
+            return current
+        return cheaper if self.tier_calls[tier] % self.probe_every == 0 else current
+
+    def __call__(self, prompt: str, system_instruction: Optional[str] = None, tier: str = "hard") -> object:
+        instruction, block = split_request(prompt, system_instruction)
+        self.tier_calls[tier] += 1
+        name = self.choose(tier)
+        start = time.perf_counter()
+        response = send(self.backends[name], instruction, block)
+        stats = self.stats[tier][name]
+        stats.seconds += time.perf_counter() - start
+        stats.calls += 1
+        stats.rejections += rejected(parse_state(block), response)
+        return response
+
+    def summary(self) -> List[Tuple[str, str, int, float, float]]:
+        """(tier, backend, calls, mean latency, rejection rate) for every backend a tier has used."""
+        return [(tier, name, s.calls, s.mean_latency, s.rejection_rate)
+                for tier in TIERS for name, s in self.stats.get(tier, {}).items() if s.calls]
+
+
+def parse_routes(text: str) -> Dict[str, str]:
+    """"easy=rules,hard=main" -> routes; anything without "=" -> DEFAULT_ROUTES."""
+    if "=" not in text:
+        return dict(DEFAULT_ROUTES)
+    return dict(item.strip().split("=", 1) for item in text.split(",") if "=" in item)
+
+
+def bind_router(mind: object, routes: Optional[Dict[str, str]] = None,
+                extra: Sequence[Tuple[str, Callable]] = (), **kwargs: object) -> TieredRouter:
+    """Route the mind's requests between the rules, extra backends and its current LLM ("main")."""
+    backends = [("rules", RuleBackend())] + list(extra) + [("main", mind.decide_physical_with_ai)]
+    router = TieredRouter(backends, routes, owner=getattr(mind, "colour_name", "router"), **kwargs)
+    mind.decide_physical_with_ai = router
+    return router
+
+
+def router_from_env(mind: object) -> Optional[TieredRouter]:
+    """
+    bind_router() with the routes named by VW_ROUTING, if set, and the local
+    model if VW_LOCAL_MODEL is, deferring to the main model as bind_local_model() does.
+    """
+    text = os.environ.get("VW_ROUTING")
+    if not text:
+        return None
+    model = load_local_model()
+    extra: List[Tuple[str, Callable]] = []
+    if model is not None:
+        min_confidence = local_min_confidence()
+        remote = None if min_confidence <= 0 else mind.decide_physical_with_ai
+        extra.append(("local", DistilledLLM(model, remote, min_confidence)))
+    return bind_router(mind, parse_routes(text), extra)
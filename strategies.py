@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+
+# ----------------------------
+# Strategy registry and selector for WhiteMind
+# ----------------------------
+# An exploration strategy is the order of WhiteMind's exploration phases; the
+# zigzag starts as soon as the grid size is inferred (dimensions.py):
+#   width_first:   find_width (walk east) -> find_height (walk south) -> zigzag
+#   height_first:  find_height (walk south) -> find_width (walk east) -> zigzag
+#   frontier:      zigzag at once, over bounds that grow until n is known;
+#                  until then straight along the longer axis to the nearer
+#                  wall, so corner starts walk out like width_first
+# A cleaning strategy picks the next dirt target from the remaining dirt:
+#   nearest:       closest dirt (greedy)
+#   lookahead:     among the closest few, the one minimising the distance to
+#                  it plus the distance from it to the next dirt
+#
+# StrategySelector chooses an exploration strategy on the first cycle, from
+# the start position and orientation, and a cleaning strategy once the grid
+# has been mapped, from n and the amount of dirt. Its tables are learned
+# offline from batch simulations (benchmarks.py tune -> learn()) and can be
+# loaded from a JSON file named by VW_STRATEGY_TABLE; keys missing from the
+# tables fall back to the defaults.
+
+import json
+import os
+from statistics import median
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from target_index import DirtIndex, manhattan
+
+Cell = Tuple[int, int]
+CleaningStrategy = Callable[[DirtIndex, int, int], Optional[Cell]]
+
+
+# ----------------------------
+# Registries
+# ----------------------------
+EXPLORATION_STRATEGIES: Dict[str, Tuple[str, ...]] = {}
+CLEANING_STRATEGIES: Dict[str, CleaningStrategy] = {}
+
+DEFAULT_EXPLORATION = "frontier"
+DEFAULT_CLEANING = "nearest"
+
+LOOKAHEAD_CANDIDATES: int = 4
+
+
+def register_exploration(name: str, phases: Iterable[str]) -> None:
+    phases = tuple(phases)
+    if not phases or phases[-1] != "zigzag":
+        raise ValueError(f"exploration {name!r} must end with the zigzag phase")
+    EXPLORATION_STRATEGIES[name] = phases
+
+
+def register_cleaning(name: str) -> Callable[[CleaningStrategy], CleaningStrategy]:
+    def decorator(strategy: CleaningStrategy) -> CleaningStrategy:
+        CLEANING_STRATEGIES[name] = strategy
+        return strategy
+    return decorator
+
+
+register_exploration("width_first", ("find_width", "find_height", "zigzag"))
+register_exploration("height_first", ("find_height", "find_width", "zigzag"))
+register_exploration("frontier", ("zigzag",))
+
+
+@register_cleaning("nearest")
+def clean_nearest(dirt: DirtIndex, x: int, y: int) -> Optional[Cell]:
+    return dirt.nearest(x, y)
+
+
+@register_cleaning("lookahead")
+def clean_lookahead(dirt: DirtIndex, x: int, y: int) -> Optional[Cell]:
+    candidates = dirt.all.nearest_k([(x, y)], LOOKAHEAD_CANDIDATES)[0]
+    if len(candidates) <= 1:
+        return candidates[0] if candidates else None
+    best, best_cost = None, None
+    for cell in candidates:
+        onward = dirt.all.nearest_k([cell], 2)[0]
+        cost = manhattan((x, y), cell) + (manhattan(cell, onward[1]) if len(onward) > 1 else 0)
+        if best_cost is None or cost < best_cost:
+            best, best_cost = cell, cost
+    return best
+
+
+# ----------------------------
+# Selector
+# ----------------------------
+def exploration_key(position: Cell, orientation: object) -> str:
+    """Which wall the start is (probably) nearer to, and the start orientation."""
+    x, y = position
+    axis = "east" if x > y else "south" if y > x else "diagonal"
+    return f"{axis}/{getattr(orientation, 'name', orientation)}"
+
+
+def cleaning_key(n: int, dirt_count: int) -> str:
+    size = "small" if n <= 5 else "medium" if n <= 15 else "large"
+    density = dirt_count / float(n * n) if n else 0.0
+    amount = "sparse" if density < 0.05 else "dense" if density > 0.2 else "medium"
+    return f"{size}/{amount}"
+
+
+class StrategySelector:
+    def __init__(self, exploration: Optional[Dict[str, str]] = None, cleaning: Optional[Dict[str, str]] = None) -> None:
+        self.exploration: Dict[str, str] = dict(exploration or {})
+        self.cleaning: Dict[str, str] = dict(cleaning or {})
+
+    def select_exploration(self, position: Cell, orientation: object) -> str:
+        name = self.exploration.get(exploration_key(position, orientation), DEFAULT_EXPLORATION)
+        return name if name in EXPLORATION_STRATEGIES else DEFAULT_EXPLORATION
+
+    def select_cleaning(self, n: int, dirt_count: int) -> str:
+        name = self.cleaning.get(cleaning_key(n, dirt_count), DEFAULT_CLEANING)
+        return name if name in CLEANING_STRATEGIES else DEFAULT_CLEANING
+
+    def to_dict(self) -> Dict[str, Dict[str, str]]:
+        return {"exploration": dict(sorted(self.exploration.items())), "cleaning": dict(sorted(self.cleaning.items()))}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Dict[str, str]]) -> "StrategySelector":
+        return cls(data.get("exploration"), data.get("cleaning"))
+
+    def save(self, path: str) -> None:
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    @classmethod
+    def load(cls, path: str) -> "StrategySelector":
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+
+# Learned with: python benchmarks.py tune. Empty: on held-out scenarios no
+# learned table has yet beaten the default strategies everywhere.
+DEFAULT_TABLE: Dict[str, Dict[str, str]] = {"exploration": {}, "cleaning": {}}
+
+
+def default_selector() -> StrategySelector:
+    path = os.environ.get("VW_STRATEGY_TABLE")
+    return StrategySelector.load(path) if path else StrategySelector.from_dict(DEFAULT_TABLE)
+
+
+# ----------------------------
+# Offline tuning
+# ----------------------------
+def learn(records: Iterable[Dict[str, object]], margin: float = 0.05, min_runs: int = 5) -> StrategySelector:
+    """
+    Build a selector from batch-simulation records, each with exploration_key,
+    cleaning_key, exploration, cleaning and cycles (runs that did not finish
+    count with the cycle limit they hit). Exploration and cleaning are learned
+    separately: for every key, the strategy with the lowest median cycles
+    (runs that stall make the mean useless) replaces the default only if it
+    has at least min_runs runs and beats the default's median by more than
+    margin (relative), so noise keeps the default.
+    """
+    cycles: Dict[Tuple[str, str, str], List[int]] = {}
+    for record in records:
+        for kind in ("exploration", "cleaning"):
+            cycles.setdefault((kind, str(record[f"{kind}_key"]), str(record[kind])), []).append(int(record["cycles"]))
+
+    defaults = {"exploration": DEFAULT_EXPLORATION, "cleaning": DEFAULT_CLEANING}
+    selector = StrategySelector()
+    for kind, key in sorted({(kind, key) for kind, key, _ in cycles}):
+        medians = {name: median(runs) for (k, ky, name), runs in cycles.items()
+                   if (k, ky) == (kind, key) and len(runs) >= min_runs}
+        default = defaults[kind]
+        if default not in medians:
+            continue
+        best = min(medians, key=lambda name: (medians[name], name != default))
+        if best != default and medians[best] < (1.0 - margin) * medians[default]:
+            getattr(selector, kind)[key] = best
+    return selector
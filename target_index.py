@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+
+# ----------------------------
+# Target index: nearest-target queries over a changing set of grid cells
+# ----------------------------
+# Holds the cells an agent still has to reach (dirt to clean, cells to
+# observe) and answers Manhattan-distance queries against them:
+#   - nearest(x, y):            the closest cell, ties to the earliest added
+#   - nearest_k(queries, k):    the k closest cells for each query position
+#   - cost_matrix(queries):     distance from every query to every cell, the
+#                               input of an agent-to-dirt assignment
+# Cells are removed as they are cleaned/observed, without rebuilding.
+#
+# With NumPy available the coordinates are kept in arrays and each query is a
+# single vectorised pass; removal clears an "alive" flag and the arrays are
+# compacted once half of the slots are dead. NumPy is optional (it is not a
+# VacuumWorld requirement): without it the same queries run in pure Python.
+# Small indexes always use the pure-Python path, where NumPy's per-call
+# overhead would dominate. NumPy is imported by the first index that keeps
+# arrays, not by this module: the minds only build SpatialIndex, so importing
+# them does not load it.
+#
+# SpatialIndex is the pure-Python index plus a bucketed grid: cells are also
+# filed in BUCKET_SIZE x BUCKET_SIZE buckets and nearest() searches rings of
+# buckets outwards from the query, stopping as soon as no unvisited ring can
+# hold a closer cell. Queries then cost about the number of cells near the
+# answer rather than the number of cells in the index, so it keeps no arrays.
+# Each agent keeps its own index of the cells it is responsible for (a
+# cleaner: dirt of its colour).
+
+import importlib.util
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+np = None   # numpy once numpy_module() has imported it
+
+Cell = Tuple[int, int]
+
+NUMPY_AVAILABLE: bool = importlib.util.find_spec("numpy") is not None
+NUMPY_MIN_SIZE: int = 64        # below this many live cells, pure Python is faster
+DEAD_DISTANCE: int = 1 << 32    # distance reported for removed slots
+BUCKET_SIZE: int = 8            # side of a SpatialIndex bucket, in cells
+
+
+def manhattan(a: Cell, b: Cell) -> int:
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+
+def numpy_module():
+    """NumPy, imported on first use."""
+    global np
+    if np is None:
+        import numpy
+        np = numpy
+    return np
+
+
+class TargetIndex:
+    def __init__(self, cells: Iterable[Cell] = (), use_numpy: Optional[bool] = None) -> None:
+        self.use_numpy: bool = NUMPY_AVAILABLE if use_numpy is None else (use_numpy and NUMPY_AVAILABLE)
+        # Live cells in insertion order (dict keys), mapped to their slot: the
+        # array index with NumPy, else just an increasing number for tie-breaks
+        self._slots: Dict[Cell, int] = {}
+        self._added: int = 0
+        if self.use_numpy:
+            numpy_module()
+            self._cells: List[Cell] = []
+            self._xs = np.zeros(16, dtype=np.int64)
+            self._ys = np.zeros(16, dtype=np.int64)
+            self._alive = np.zeros(16, dtype=bool)
+        for cell in cells:
+            self.add(cell)
+
+    # --- container protocol ---
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __bool__(self) -> bool:
+        return bool(self._slots)
+
+    def __contains__(self, cell: object) -> bool:
+        return cell in self._slots
+
+    def __iter__(self) -> Iterator[Cell]:
+        return iter(self._slots)
+
+    # --- updates ---
+    def add(self, cell: Cell) -> None:
+        cell = (int(cell[0]), int(cell[1]))
+        if cell in self._slots:
+            return
+        slot = self._added
+        self._added += 1
+        self._slots[cell] = slot
+        if self.use_numpy:
+            self._cells.append(cell)
+            if slot == len(self._xs):
+                self._xs = np.concatenate([self._xs, np.zeros_like(self._xs)])
+                self._ys = np.concatenate([self._ys, np.zeros_like(self._ys)])
+                self._alive = np.concatenate([self._alive, np.zeros_like(self._alive)])
+            self._xs[slot], self._ys[slot] = cell
+            self._alive[slot] = True
+
+    def discard(self, cell: Cell) -> None:
+        slot = self._slots.pop(cell, None)
+        if slot is None or not self.use_numpy:
+            return
+        self._alive[slot] = False
+        if self._added > 2 * len(self._slots) + NUMPY_MIN_SIZE:
+            self._compact()
+
+    def remove(self, cell: Cell) -> None:
+        if cell not in self._slots:
+            raise KeyError(cell)
+        self.discard(cell)
+
+    def _compact(self) -> None:
+        self._cells = list(self._slots)
+        self._slots = {cell: slot for slot, cell in enumerate(self._cells)}
+        self._added = len(self._cells)
+        size = max(16, len(self._cells))
+        self._xs = np.zeros(size, dtype=np.int64)
+        self._ys = np.zeros(size, dtype=np.int64)
+        self._alive = np.zeros(size, dtype=bool)
+        if self._cells:
+            coords = np.array(self._cells, dtype=np.int64)
+            self._xs[:len(self._cells)] = coords[:, 0]
+            self._ys[:len(self._cells)] = coords[:, 1]
+            self._alive[:len(self._cells)] = True
+
+    # --- queries ---
+    def _vectorised(self) -> bool:
+        return self.use_numpy and len(self._slots) >= NUMPY_MIN_SIZE
+
+    def _distances(self, x: int, y: int) -> "np.ndarray":
+        used = len(self._cells)
+        d = np.abs(self._xs[:used] - x) + np.abs(self._ys[:used] - y)
+        # Dead slots can never win: push them past any in-grid distance
+        d[~self._alive[:used]] = DEAD_DISTANCE
+        return d
+
+    def nearest(self, x: int, y: int) -> Optional[Cell]:
+        if not self._slots:
+            return None
+        if self._vectorised():
+            # argmin returns the first minimum, i.e. the earliest added cell
+            return self._cells[int(np.argmin(self._distances(x, y)))]
+        return min(self._slots, key=lambda c: abs(c[0] - x) + abs(c[1] - y))
+
+    def nearest_k(self, queries: Sequence[Cell], k: int) -> List[List[Cell]]:
+        """The k nearest live cells (closest first) for each query position."""
+        k = min(k, len(self._slots))
+        if k <= 0:
+            return [[] for _ in queries]
+        if self._vectorised():
+            result = []
+            used = len(self._cells)
+            slots = np.arange(used, dtype=np.int64)
+            for qx, qy in queries:
+                # Rank by (distance, slot) so ties go to the earliest added cell
+                key = self._distances(qx, qy) * used + slots
+                best = np.argpartition(key, k - 1)[:k]
+                result.append([self._cells[int(i)] for i in best[np.argsort(key[best])]])
+            return result
+        cells = list(self._slots)
+        return [sorted(cells, key=lambda c: abs(c[0] - qx) + abs(c[1] - qy))[:k] for qx, qy in queries]
+
+    def cost_matrix(self, queries: Sequence[Cell]) -> "List[List[int]] | np.ndarray":
+        """
+        Manhattan distance from each query (row) to each live cell (column,
+        in iteration order). An ndarray when the queries are vectorised (NumPy
+        and at least NUMPY_MIN_SIZE cells), else nested lists.
+        """
+        if self._vectorised():
+            live = np.fromiter(self._slots.values(), dtype=np.int64, count=len(self._slots))
+            q = np.asarray(queries, dtype=np.int64).reshape(-1, 2)
+            return (np.abs(q[:, 0:1] - self._xs[live][None, :]) +
+                    np.abs(q[:, 1:2] - self._ys[live][None, :]))
+        return [[abs(c[0] - qx) + abs(c[1] - qy) for c in self._slots] for qx, qy in queries]
+
+
+class SpatialIndex(TargetIndex):
+    def __init__(self, cells: Iterable[Cell] = (), bucket_size: int = BUCKET_SIZE) -> None:
+        self.bucket_size: int = bucket_size
+        self._buckets: Dict[Cell, Set[Cell]] = {}
+        # Bounding box of every bucket ever used, in bucket coordinates
+        self._bmin: Optional[Cell] = None
+        self._bmax: Optional[Cell] = None
+        super().__init__(cells, use_numpy=False)
+
+    def _bucket_of(self, cell: Cell) -> Cell:
+        return cell[0] // self.bucket_size, cell[1] // self.bucket_size
+
+    def add(self, cell: Cell) -> None:
+        cell = (int(cell[0]), int(cell[1]))
+        if cell in self._slots:
+            return
+        super().add(cell)
+        key = self._bucket_of(cell)
+        self._buckets.setdefault(key, set()).add(cell)
+        if self._bmin is None:
+            self._bmin = self._bmax = key
+        else:
+            self._bmin = (min(self._bmin[0], key[0]), min(self._bmin[1], key[1]))
+            self._bmax = (max(self._bmax[0], key[0]), max(self._bmax[1], key[1]))
+
+    def discard(self, cell: Cell) -> None:
+        if cell not in self._slots:
+            return
+        super().discard(cell)
+        key = self._bucket_of(cell)
+        bucket = self._buckets[key]
+        bucket.discard(cell)
+        if not bucket:
+            del self._buckets[key]
+
+    def _ring(self, bx: int, by: int, r: int) -> Iterator[Cell]:
+        """Bucket keys at Chebyshev distance exactly r from (bx, by)."""
+        if r == 0:
+            yield bx, by
+            return
+        for i in range(bx - r, bx + r + 1):
+            yield i, by - r
+            yield i, by + r
+        for j in range(by - r + 1, by + r):
+            yield bx - r, j
+            yield bx + r, j
+
+    def nearest(self, x: int, y: int) -> Optional[Cell]:
+        if not self._slots:
+            return None
+        size = self.bucket_size
+        bx, by = x // size, y // size
+        max_r = max(bx - self._bmin[0], self._bmax[0] - bx, by - self._bmin[1], self._bmax[1] - by, 0)
+        slots = self._slots
+        best: Optional[Cell] = None
+        best_key: Tuple[int, int] = (DEAD_DISTANCE, 0)
+
+        for r in range(max_r + 1):
+            # Every cell in ring r is at least (r-1)*size+1 away along one axis
+            if best is not None and best_key[0] < (r - 1) * size + 1:
+                break
+            if 8 * r > len(self._buckets):
+                # Fewer buckets left than ring positions: scan the rest directly
+                keys: Iterable[Cell] = [k for k in self._buckets if max(abs(k[0] - bx), abs(k[1] - by)) >= r]
+            else:
+                keys = self._ring(bx, by, r)
+            for key in keys:
+                bucket = self._buckets.get(key)
+                if not bucket:
+                    continue
+                for cell in bucket:
+                    # Ties go to the earliest added cell, as in TargetIndex
+                    candidate = (abs(cell[0] - x) + abs(cell[1] - y), slots[cell])
+                    if candidate < best_key:
+                        best, best_key = cell, candidate
+            if 8 * r > len(self._buckets):
+                break
+        return best
+
+
+class DirtIndex:
+    """
+    Remaining dirt, indexed both as a whole and per colour: nearest(), count()
+    and iteration can be restricted to one colour without filtering.
+    Iteration follows the order in which dirt was added.
+    """
+    def __init__(self, dirt: Iterable[Tuple[Cell, str]] = (), bucket_size: int = BUCKET_SIZE) -> None:
+        self.bucket_size: int = bucket_size
+        self.colours: Dict[Cell, str] = {}
+        self.all: SpatialIndex = SpatialIndex(bucket_size=bucket_size)
+        self.by_colour: Dict[str, SpatialIndex] = {}
+        for cell, colour in dirt:
+            self.add(cell, colour)
+
+    def __len__(self) -> int:
+        return len(self.all)
+
+    def __bool__(self) -> bool:
+        return bool(self.all)
+
+    def __contains__(self, cell: object) -> bool:
+        return cell in self.all
+
+    def __iter__(self) -> Iterator[Cell]:
+        return iter(self.all)
+
+    def _index(self, colour: Optional[str]) -> Optional[SpatialIndex]:
+        return self.all if colour is None else self.by_colour.get(colour.lower())
+
+    def add(self, cell: Cell, colour: str) -> None:
+        cell = (int(cell[0]), int(cell[1]))
+        colour = colour.lower()
+        if self.colours.get(cell) == colour:
+            return
+        self.discard(cell)
+        self.colours[cell] = colour
+        self.all.add(cell)
+        if colour not in self.by_colour:
+            self.by_colour[colour] = SpatialIndex(bucket_size=self.bucket_size)
+        self.by_colour[colour].add(cell)
+
+    def discard(self, cell: Cell) -> None:
+        colour = self.colours.pop(cell, None)
+        if colour is None:
+            return
+        self.all.discard(cell)
+        self.by_colour[colour].discard(cell)
+
+    def colour_of(self, cell: Cell) -> Optional[str]:
+        return self.colours.get(cell)
+
+    def nearest(self, x: int, y: int, colour: Optional[str] = None) -> Optional[Cell]:
+        index = self._index(colour)
+        return index.nearest(x, y) if index is not None else None
+
+    def count(self, colour: Optional[str] = None) -> int:
+        index = self._index(colour)
+        return len(index) if index is not None else 0
+
+    def cells(self, colour: Optional[str] = None) -> Iterator[Cell]:
+        index = self._index(colour)
+        return iter(index) if index is not None else iter(())
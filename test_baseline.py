@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+
+# ----------------------------
+# The standard suite at n=5 and 10 against benchmark_baseline.json
+# ----------------------------
+# The same check as `benchmarks.py suite --sizes 5 10`, on cycles only: they
+# are deterministic, so they hold on any machine. The stored cpu_us_per_cycle
+# values are not compared: they are specific to the machine that recorded
+# the baseline and must be regenerated on each machine that compares them
+# (`benchmarks.py suite --update-baseline`, then --cpu-threshold).
+
+import json
+
+import pytest
+
+from benchmarks import DEFAULT_BASELINE, DEFAULT_THRESHOLD, MIND_FACTORIES, compare, run_config
+from vwsim import DIRT_LAYOUTS, START_LAYOUTS, random_scenario
+
+SIZES = (5, 10)
+
+with open(DEFAULT_BASELINE) as f:
+    BASELINE = json.load(f)
+
+CONFIGS = [(part, n, layout, start) for part in sorted(MIND_FACTORIES) for n in SIZES
+           for layout in DIRT_LAYOUTS for start in START_LAYOUTS]
+
+
+@pytest.mark.parametrize("part, n, layout, start", CONFIGS, ids=["{}/n={}/{}/{}".format(*c) for c in CONFIGS])
+def test_cycles_within_baseline(part, n, layout, start):
+    key = f"{part}/n={n}/{layout}/{start}/seed=0"
+    current = run_config(part, random_scenario(n, seed=0, layout=layout, start=start))
+    assert compare(key, current, BASELINE.get(key), DEFAULT_THRESHOLD) == []
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+
+# ----------------------------
+# batchsim.py against vwsim.py running the part A minds it models
+# ----------------------------
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from batchsim import BatchSimulator
+from benchmarks import max_cycles_for, partA_minds
+from partA import CLEANER_POLICY, WHITE_POLICY
+from vwsim import DIRT_LAYOUTS, START_LAYOUTS, VWSimulator, random_scenario
+
+
+def test_policy_tables_match_the_rules():
+    # The minds evaluate the rules; the batched model looks them up
+    WHITE_POLICY.check()
+    CLEANER_POLICY.check()
+
+
+@pytest.mark.parametrize("n", [5, 8])
+def test_batched_model_agrees_with_vwsim(n):
+    scenarios = [random_scenario(n, seed=seed, layout=layout, start=start)
+                 for layout in DIRT_LAYOUTS for start in START_LAYOUTS for seed in range(3)]
+    reference = [VWSimulator(s, partA_minds(yielding=False)).run(max_cycles_for(n)) for s in scenarios]
+    batched = BatchSimulator(scenarios, yielding=False).run(max_cycles_for(n))
+    assert [(r.cycles, r.completed) for r in batched] == [(r.cycles, r.completed) for r in reference]
+
+
+def test_clean_cost_sweep_matches_separate_batches():
+    scenarios = [random_scenario(6, seed=seed, layout="dense") for seed in range(3)]
+    swept = BatchSimulator(scenarios * 2, clean_cost=[0.5] * 3 + [4.0] * 3, yielding=False).run(max_cycles_for(6))
+    for i, cost in enumerate((0.5, 4.0)):
+        alone = BatchSimulator(scenarios, clean_cost=cost, yielding=False).run(max_cycles_for(6))
+        assert [r.cycles for r in swept[3 * i:3 * i + 3]] == [r.cycles for r in alone]
+
+
+@pytest.mark.parametrize("yielding", [None, True])
+def test_yielding_team_is_rejected(yielding):
+    with pytest.raises(ValueError):
+        BatchSimulator([random_scenario(5, seed=0)], yielding=yielding)
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+
+# ----------------------------
+# distill.py: transcripts, training, confidence and serving
+# ----------------------------
+
+import pytest
+
+from distill import DistilledLLM, DistilledModel, TranscriptRecorder, train
+from prompts import state_block
+
+INSTRUCTION = "You are blocked.\nRules follow."
+SITUATION = "You are blocked."
+FREE = {"ahead": "free", "left": "blocked"}
+BLOCKED = {"ahead": "blocked", "left": "free"}
+
+
+def scripted_llm(calls):
+    """An LLM that moves on when it can and turns left otherwise, noting the tier of every call."""
+    def llm(prompt, system_instruction=None, tier=None):
+        calls.append(tier)
+        return "MOVE_FORWARD" if "ahead: free" in prompt else "TURN_LEFT"
+    return llm
+
+
+def transcript():
+    """Three free and two blocked states answered by scripted_llm, plus one odd TURN_RIGHT when blocked."""
+    records, calls = [], []
+    recorder = TranscriptRecorder(scripted_llm(calls), records)
+    for state in [FREE] * 3 + [BLOCKED] * 2:
+        recorder(state_block(state), system_instruction=INSTRUCTION, tier="easy")
+    recorder(state_block(BLOCKED), system_instruction=INSTRUCTION)
+    records.append({"situation": SITUATION, "state": dict(BLOCKED), "action": "TURN_RIGHT"})
+    return records, calls
+
+
+def test_recorder_records_valid_answers_and_passes_the_tier_on():
+    records, calls = transcript()
+    assert calls == ["easy"] * 5 + [None]
+    assert records[0] == {"situation": SITUATION, "state": FREE, "action": "MOVE_FORWARD"}
+    # An answer that names no action is passed back but not recorded
+    recorder = TranscriptRecorder(lambda prompt, system_instruction=None: "sing", records)
+    assert recorder(state_block(FREE), system_instruction=INSTRUCTION) == "sing"
+    assert len(records) == 7
+
+
+def test_predictions_and_confidence():
+    model = train(transcript()[0])
+    # count / (records at the leaf + 1): rare states are never fully trusted
+    assert model.predict(SITUATION, FREE) == ("MOVE_FORWARD", pytest.approx(3 / 4))
+    assert model.predict(SITUATION, BLOCKED) == ("TURN_LEFT", pytest.approx(3 / 5))
+    assert model.predict("Unknown situation", FREE) == (None, 0.0)
+
+
+def test_distilled_llm_defers_below_min_confidence():
+    remote_calls = []
+    remote = lambda prompt, system_instruction=None: remote_calls.append(prompt) or "TURN_RIGHT"
+    local = DistilledLLM(train(transcript()[0]), remote, min_confidence=0.7)
+    assert local(state_block(FREE), system_instruction=INSTRUCTION) == "MOVE_FORWARD"
+    assert local(state_block(BLOCKED), system_instruction=INSTRUCTION) == "TURN_RIGHT"
+    assert (local.local_calls, local.remote_calls, len(remote_calls)) == (1, 1, 1)
+
+
+def test_offline_distilled_llm_answers_everything_locally():
+    local = DistilledLLM(train(transcript()[0]), None, min_confidence=0.99)
+    assert local(state_block(BLOCKED), system_instruction=INSTRUCTION) == "TURN_LEFT"
+    assert local(state_block(FREE), system_instruction="Something else entirely") == "IDLE"
+    assert (local.local_calls, local.remote_calls) == (2, 0)
+
+
+def test_save_load_round_trip(tmp_path):
+    model = train(transcript()[0])
+    path = str(tmp_path / "model.json")
+    model.save(path)
+    loaded = DistilledModel.load(path)
+    assert loaded.trees == model.trees
+    for state in (FREE, BLOCKED):
+        assert loaded.predict(SITUATION, state) == model.predict(SITUATION, state)
@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+
+# ----------------------------
+# What importing the minds loads (benchmarks.py imports)
+# ----------------------------
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from benchmarks import LAZY_PACKAGES
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+@pytest.mark.parametrize("module", ["partA", "partB", "vwsim"])
+def test_importing_the_minds_loads_no_lazy_package(module):
+    # A fresh interpreter: this one has already imported whatever the other tests needed
+    packages = [pkg for names in LAZY_PACKAGES.values() for pkg in names]
+    code = f"import sys, {module}; print(','.join(p for p in {packages!r} if p in sys.modules))"
+    proc = subprocess.run([sys.executable, "-c", code], cwd=HERE, capture_output=True, text=True)
+    assert proc.returncode == 0, proc.stderr
+    assert proc.stdout.strip() == ""
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+
+# ----------------------------
+# routing.py: which answers count against a backend, and the env set-up
+# ----------------------------
+
+from types import SimpleNamespace
+
+import pytest
+
+from distill import DistilledModel
+from prompts import state_block
+from routing import rejected, router_from_env
+
+CLEANING = {"orientation": "east", "desired orientation": "east", "ahead": "free"}
+
+
+@pytest.mark.parametrize("state, answer, expected", [
+    (CLEANING, "MOVE_FORWARD", False),
+    (CLEANING, "sing", True),
+    (dict(CLEANING, ahead="blocked"), "MOVE_FORWARD", True),
+    # Moving on while the state asks for another heading
+    (dict(CLEANING, orientation="north"), "MOVE_FORWARD", True),
+    (dict(CLEANING, orientation="north"), "TURN_LEFT", False),
+    # No desired orientation (zigzag, blocked): only overrides count
+    ({"orientation": "north", "ahead": "free"}, "MOVE_FORWARD", False),
+])
+def test_rejected_answers(state, answer, expected):
+    assert rejected(state, answer) == expected
+
+
+@pytest.mark.parametrize("min_confidence, main_calls", [("0.9", 1), ("0", 0)])
+def test_routed_local_model_honours_min_confidence(min_confidence, main_calls, tmp_path, monkeypatch):
+    # One leaf with a single TURN_LEFT record: confidence 1/2
+    path = str(tmp_path / "model.json")
+    DistilledModel({"Clean": {"counts": {"TURN_LEFT": 1}}}).save(path)
+    monkeypatch.setenv("VW_ROUTING", "normal=local")
+    monkeypatch.setenv("VW_LOCAL_MODEL", path)
+    monkeypatch.setenv("VW_LOCAL_MIN_CONFIDENCE", min_confidence)
+
+    calls = []
+    mind = SimpleNamespace(colour_name="orange",
+                           decide_physical_with_ai=lambda prompt, system_instruction=None: calls.append(prompt) or "TURN_RIGHT")
+    router = router_from_env(mind)
+    answer = router(state_block(CLEANING), system_instruction="Clean", tier="normal")
+    assert len(calls) == main_calls
+    assert answer == ("TURN_RIGHT" if main_calls else "TURN_LEFT")
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+
+# ----------------------------
+# target_index.py against brute force, ties included
+# ----------------------------
+
+import random
+
+import pytest
+
+from target_index import NUMPY_AVAILABLE, NUMPY_MIN_SIZE, SpatialIndex, TargetIndex, manhattan
+
+
+def brute_nearest(cells, x, y):
+    """First of the closest cells in insertion order (min() keeps the first minimum)."""
+    return min(cells, key=lambda c: manhattan(c, (x, y)), default=None)
+
+
+def churn(index, rng, side, steps):
+    """Random adds, removals and re-adds on a small grid, so that most queries have ties."""
+    for _ in range(steps):
+        cell = (rng.randrange(side), rng.randrange(side))
+        if cell in index and rng.random() < 0.6:
+            index.discard(cell)
+        else:
+            index.add(cell)
+        yield cell
+
+
+USE_NUMPY = [False, True] if NUMPY_AVAILABLE else [False]
+
+
+@pytest.mark.parametrize("bucket_size", [1, 3, 8])
+@pytest.mark.parametrize("seed", range(5))
+def test_spatial_nearest_matches_brute_force(bucket_size, seed):
+    rng = random.Random(seed)
+    side = rng.choice([6, 20, 60])
+    index = SpatialIndex(bucket_size=bucket_size)
+    for _ in churn(index, rng, side, 600):
+        x, y = rng.randrange(-2, side + 2), rng.randrange(-2, side + 2)
+        assert index.nearest(x, y) == brute_nearest(list(index), x, y)
+
+
+@pytest.mark.parametrize("use_numpy", USE_NUMPY)
+def test_target_nearest_matches_brute_force(use_numpy):
+    rng = random.Random(7)
+    index = TargetIndex(use_numpy=use_numpy)
+    for _ in churn(index, rng, 30, 800):
+        x, y = rng.randrange(30), rng.randrange(30)
+        assert index.nearest(x, y) == brute_nearest(list(index), x, y)
+        k = rng.randrange(1, 5)
+        expected = sorted(index, key=lambda c: manhattan(c, (x, y)))[:k]
+        assert index.nearest_k([(x, y)], k) == [expected]
+
+
+def test_ties_go_to_the_earliest_added_cell():
+    index = SpatialIndex([(2, 0), (0, 2), (1, 1)], bucket_size=1)
+    assert index.nearest(0, 0) == (2, 0)
+    index.discard((2, 0))
+    assert index.nearest(0, 0) == (0, 2)
+    # Re-added cells go to the back of the order
+    index.add((2, 0))
+    assert index.nearest(0, 0) == (0, 2)
+
+
+def test_empty_index():
+    index = SpatialIndex()
+    assert index.nearest(0, 0) is None
+    index.add((3, 3))
+    index.discard((3, 3))
+    assert index.nearest(0, 0) is None and not index
+
+
+@pytest.mark.parametrize("use_numpy", USE_NUMPY)
+@pytest.mark.parametrize("count", [5, NUMPY_MIN_SIZE + 10])
+def test_cost_matrix_is_vectorised_only_from_numpy_min_size(use_numpy, count):
+    rng = random.Random(count)
+    index = TargetIndex(use_numpy=use_numpy)
+    for _ in churn(index, rng, 40, 4 * count):
+        pass
+    queries = [(0, 0), (7, 3)]
+    matrix = index.cost_matrix(queries)
+    assert index._vectorised() == (use_numpy and count > NUMPY_MIN_SIZE)
+    assert isinstance(matrix, list) == (not index._vectorised())
+    assert [list(row) for row in matrix] == [[manhattan(c, q) for c in index] for q in queries]
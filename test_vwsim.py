@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+
+# ----------------------------
+# The part A and part B minds on the headless stand-in (vwsim.py)
+# ----------------------------
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+import checkpoint
+from benchmarks import MIND_FACTORIES, MindPool, max_cycles_for, partA_minds
+from messages import termination_cycle
+from vwsim import Scenario, VWSimulator, random_scenario, termination_observer
+
+# Runs both parts complete (part B does not on every layout)
+FIXED = [(5, "sparse", "random", 0), (5, "dense", "adversarial", 0), (6, "clustered", "random", 1),
+         (8, "sparse", "adversarial", 0), (8, "clustered", "adversarial", 1)]
+PARTS = sorted(MIND_FACTORIES)
+
+
+def fixed_scenario(n, layout, start, seed):
+    return random_scenario(n, seed=seed, layout=layout, start=start)
+
+
+def hand_scenario():
+    return Scenario(5, {(1, 1): "orange", (3, 2): "green", (4, 4): "orange", (0, 3): "green"},
+                    {"white": (0, 0, "east"), "orange": (4, 0, "south"), "green": (0, 4, "north")})
+
+
+def run(scenario, minds):
+    return VWSimulator(scenario, minds).run(max_cycles_for(scenario.n))
+
+
+def state(data):
+    """An encoded checkpoint payload with sets sorted, so that their iteration order does not matter."""
+    if isinstance(data, list):
+        return [state(v) for v in data]
+    if not isinstance(data, dict):
+        return data
+    if set(data) == {"s"}:
+        return {"s": sorted((state(v) for v in data["s"]), key=json.dumps)}
+    return {key: state(value) for key, value in data.items()}
+
+
+# --- completion ---
+@pytest.mark.parametrize("part", PARTS)
+@pytest.mark.parametrize("config", FIXED, ids="n={0[0]}/{0[1]}/{0[2]}/seed={0[3]}".format)
+def test_fixed_scenarios_complete(part, config):
+    result = run(fixed_scenario(*config), MIND_FACTORIES[part]())
+    assert result.completed and result.dirt_left == 0
+
+
+@pytest.mark.parametrize("config", FIXED, ids="n={0[0]}/{0[1]}/{0[2]}/seed={0[3]}".format)
+def test_relay_completes(config):
+    # White stops exploring on reported cells, so the map must still cover all the dirt
+    result = run(fixed_scenario(*config), partA_minds(cooperative="relay"))
+    assert result.completed and result.dirt_left == 0
+
+
+def test_hand_scenario_completes_partA():
+    result = run(hand_scenario(), partA_minds())
+    assert result.completed and result.dirt_left == 0
+
+
+# --- checkpoint / restore ---
+@pytest.mark.parametrize("part", PARTS)
+@pytest.mark.parametrize("config", FIXED[:3], ids="n={0[0]}/{0[1]}/{0[2]}/seed={0[3]}".format)
+def test_checkpoint_round_trip(part, config, tmp_path):
+    scenario = fixed_scenario(*config)
+    full = run(scenario, MIND_FACTORIES[part]())
+
+    first = VWSimulator(scenario, MIND_FACTORIES[part]())
+    first.run(full.cycles // 2)
+    path = str(tmp_path / "run.ckpt")
+    first.save(path)
+
+    second = VWSimulator(scenario, MIND_FACTORIES[part]())
+    second.load(path)
+    assert state(second.checkpoint()) == state(first.checkpoint())
+    resumed = second.run(max_cycles_for(scenario.n))
+    assert (resumed.cycles, resumed.completed) == (full.cycles, full.completed)
+
+
+def test_checkpoint_for_another_size_is_rejected():
+    saved = VWSimulator(random_scenario(5, seed=0), partA_minds())
+    saved.run(3)
+    other = VWSimulator(random_scenario(6, seed=0), partA_minds())
+    with pytest.raises(checkpoint.CheckpointError):
+        other.restore(saved.checkpoint())
+
+
+# --- reset() ---
+@pytest.mark.parametrize("part", PARTS)
+def test_reset_minds_match_new_minds(part):
+    pool = MindPool(MIND_FACTORIES[part])
+    run(fixed_scenario(*FIXED[1]), pool.acquire())
+    reused = pool.acquire()
+    fresh = MIND_FACTORIES[part]()
+    assert state(checkpoint.checkpoint_minds(reused)) == state(checkpoint.checkpoint_minds(fresh))
+
+    scenario = fixed_scenario(*FIXED[2])
+    again = run(scenario, reused)
+    expected = run(scenario, fresh)
+    assert (again.cycles, again.completed) == (expected.cycles, expected.completed)
+
+
+# --- termination protocol ---
+@pytest.mark.parametrize("part", PARTS)
+@pytest.mark.parametrize("config", FIXED, ids="n={0[0]}/{0[1]}/{0[2]}/seed={0[3]}".format)
+def test_reported_termination_is_the_completion_cycle(part, config):
+    scenario = fixed_scenario(*config)
+    sim = VWSimulator(scenario, MIND_FACTORIES[part](), stop_on_completion=False)
+    sim.add_observer(termination_observer)
+    result = sim.run(max_cycles_for(scenario.n))
+    assert sim.completed_cycle is not None
+    assert result.terminated_cycle == sim.completed_cycle
+    # The agents only learn it after the fact, from the others' statuses
+    assert result.simulated >= sim.completed_cycle
+
+
+def status_mind(colour, done, cycle, statuses):
+    return SimpleNamespace(colour_name=colour, work_done=lambda: done, last_work_cycle=cycle, statuses=statuses)
+
+
+def test_termination_needs_every_agent_done():
+    done = {"from": "orange", "done": True, "remaining": 0, "cycle": 12}
+    busy = {"from": "green", "done": False, "remaining": 2, "cycle": 9}
+    assert termination_cycle(status_mind("white", False, 5, {"orange": done})) is None
+    assert termination_cycle(status_mind("white", True, 5, {"orange": done})) is None
+    assert termination_cycle(status_mind("white", True, 5, {"orange": done, "green": busy})) is None
+    finished = dict(busy, done=True, remaining=0, cycle=17)
+    assert termination_cycle(status_mind("white", True, 5, {"orange": done, "green": finished})) == 17
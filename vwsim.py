@@ -0,0 +1,500 @@
+#!/usr/bin/env python3
+
+# ----------------------------
+# Headless local stand-in for the VacuumWorld environment
+# ----------------------------
+# Used by the benchmarks to count environment cycles exactly without the GUI.
+# It follows the VacuumWorld rules the minds rely on: an n x n grid, a 2x3
+# perception window (center/left/right/forward/forwardleft/forwardright),
+# broadcasts delivered on the next cycle, at most one physical and one
+# communicative action per actor per cycle, and white cleaning any dirt while
+# orange/green only clean their own colour.
+#
+# Perceptions are fed to a mind by shadowing the surrogate getters on the
+# instance, so the minds in partA.py/partB.py run unmodified.
+
+import os
+import random
+from contextlib import redirect_stdout
+from typing import Callable, Dict, List, Optional, Set, Tuple, Iterable
+
+from vacuumworld.model.actions.vwactions import VWAction
+from vacuumworld.model.actions.vwmove_action import VWMoveAction
+from vacuumworld.model.actions.vwturn_action import VWTurnAction
+from vacuumworld.model.actions.vwclean_action import VWCleanAction
+from vacuumworld.model.actions.vwidle_action import VWIdleAction
+from vacuumworld.model.actions.vwbroadcast_action import VWBroadcastAction
+from vacuumworld.common.vwdirection import VWDirection
+from vacuumworld.common.vworientation import VWOrientation
+from vacuumworld.common.vwcolour import VWColour
+
+import checkpoint
+from prompts import parse_state
+from routing import RuleBackend
+
+
+Coord = Tuple[int, int]
+
+ACTOR_COLOURS: Tuple[str, ...] = ("white", "orange", "green")
+DIRT_COLOURS: Tuple[str, ...] = ("orange", "green")
+ORIENTATIONS: Tuple[str, ...] = ("north", "east", "south", "west")
+_DELTAS: Dict[str, Coord] = {"north": (0, -1), "east": (1, 0), "south": (0, 1), "west": (-1, 0)}
+
+
+# ----------------------------
+# Perception objects (duck-typed to the VacuumWorld observation API)
+# ----------------------------
+class _Optional:
+    __slots__ = ("_value",)
+
+    def __init__(self, value: object = None) -> None:
+        self._value = value
+
+    def is_empty(self) -> bool:
+        return self._value is None
+
+    def or_else_raise(self) -> object:
+        if self._value is None:
+            raise ValueError("empty optional")
+        return self._value
+
+
+_EMPTY = _Optional()
+
+
+class _Coord:
+    __slots__ = ("_x", "_y")
+
+    def __init__(self, x: int, y: int) -> None:
+        self._x = x
+        self._y = y
+
+    def get_x(self) -> int:
+        return self._x
+
+    def get_y(self) -> int:
+        return self._y
+
+
+class _Appearance:
+    __slots__ = ("_colour", "_orientation")
+
+    def __init__(self, colour: VWColour, orientation: Optional[VWOrientation] = None) -> None:
+        self._colour = colour
+        self._orientation = orientation
+
+    def get_colour(self) -> VWColour:
+        return self._colour
+
+    def get_orientation(self) -> Optional[VWOrientation]:
+        return self._orientation
+
+
+class _Location:
+    __slots__ = ("_coord", "_actor", "_dirt")
+
+    def __init__(self, coord: _Coord, actor: Optional[_Appearance], dirt: Optional[_Appearance]) -> None:
+        self._coord = coord
+        self._actor = actor
+        self._dirt = dirt
+
+    def get_coord(self) -> _Coord:
+        return self._coord
+
+    def has_actor(self) -> bool:
+        return self._actor is not None
+
+    def has_dirt(self) -> bool:
+        return self._dirt is not None
+
+    def get_actor_appearance(self) -> _Optional:
+        return _Optional(self._actor)
+
+    def get_dirt_appearance(self) -> _Optional:
+        return _Optional(self._dirt)
+
+
+class _Observation:
+    __slots__ = ("_cells", "_wall_ahead")
+
+    def __init__(self, cells: Dict[str, _Optional], wall_ahead: bool) -> None:
+        self._cells = cells
+        self._wall_ahead = wall_ahead
+
+    def get_center(self) -> _Optional:
+        return self._cells["center"]
+
+    def get_forward(self) -> _Optional:
+        return self._cells["forward"]
+
+    def get_left(self) -> _Optional:
+        return self._cells["left"]
+
+    def get_right(self) -> _Optional:
+        return self._cells["right"]
+
+    def get_forwardleft(self) -> _Optional:
+        return self._cells["forwardleft"]
+
+    def get_forwardright(self) -> _Optional:
+        return self._cells["forwardright"]
+
+    def is_wall_immediately_ahead(self) -> bool:
+        return self._wall_ahead
+
+
+class _Message:
+    __slots__ = ("_content", "_sender_id")
+
+    def __init__(self, content: object, sender_id: str) -> None:
+        self._content = content
+        self._sender_id = sender_id
+
+    def get_content(self) -> object:
+        return self._content
+
+    def get_sender_id(self) -> str:
+        return self._sender_id
+
+
+# ----------------------------
+# Scenarios
+# ----------------------------
+class Scenario:
+    """A starting configuration: grid size, dirt and actor placements."""
+
+    def __init__(self, n: int, dirt: Dict[Coord, str], actors: Dict[str, Tuple[int, int, str]]) -> None:
+        self.n = n
+        self.dirt = dict(dirt)
+        self.actors = dict(actors)
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "n": self.n,
+            "dirt": [{"x": x, "y": y, "colour": colour} for (x, y), colour in sorted(self.dirt.items())],
+            "actors": {colour: {"x": x, "y": y, "orientation": o} for colour, (x, y, o) in self.actors.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, object]) -> "Scenario":
+        dirt = {(int(d["x"]), int(d["y"])): str(d["colour"]) for d in data["dirt"]}
+        actors = {colour: (int(a["x"]), int(a["y"]), str(a["orientation"])) for colour, a in data["actors"].items()}
+        return cls(int(data["n"]), dirt, actors)
+
+
+DIRT_LAYOUTS: Dict[str, float] = {"sparse": 0.02, "dense": 0.3, "clustered": 0.1}
+START_LAYOUTS: Tuple[str, ...] = ("random", "adversarial")
+
+
+def _clustered_cells(n: int, count: int, rng: random.Random) -> List[Coord]:
+    centres = [(rng.randrange(n), rng.randrange(n)) for _ in range(max(1, count // 8))]
+    spread = max(1.0, n / 10)
+    chosen: Dict[Coord, None] = {}
+    while len(chosen) < count:
+        cx, cy = rng.choice(centres)
+        x = min(n - 1, max(0, int(round(rng.gauss(cx, spread)))))
+        y = min(n - 1, max(0, int(round(rng.gauss(cy, spread)))))
+        chosen[(x, y)] = None
+    return list(chosen)
+
+
+def random_scenario(n: int, dirt_density: float = 0.1, seed: Optional[int] = None,
+                    layout: str = "uniform", start: str = "random") -> Scenario:
+    """
+    layout: "uniform" (dirt_density of the cells), or one of DIRT_LAYOUTS,
+            which sets its own density.
+    start:  "random", or "adversarial": white in the north-west corner facing
+            west (longest turn-and-walk to find the width) and the cleaners
+            packed in the south-west corner, far from the east side.
+    """
+    rng = random.Random(seed)
+    cells = [(x, y) for x in range(n) for y in range(n)]
+    rng.shuffle(cells)
+
+    actors: Dict[str, Tuple[int, int, str]] = {}
+    if start == "adversarial" and n >= 3:
+        actors = {"white": (0, 0, "west"), "orange": (0, n - 1, "north"), "green": (1, n - 1, "west")}
+    else:
+        for colour, (x, y) in zip(ACTOR_COLOURS, cells):
+            actors[colour] = (x, y, rng.choice(ORIENTATIONS))
+
+    density = DIRT_LAYOUTS.get(layout, dirt_density)
+    dirt_count = int(round(density * n * n))
+    dirt_cells = _clustered_cells(n, dirt_count, rng) if layout == "clustered" else cells[:dirt_count]
+    dirt = {pos: rng.choice(DIRT_COLOURS) for pos in dirt_cells}
+    return Scenario(n, dirt, actors)
+
+
+# ----------------------------
+# Mock LLM for the part B minds
+# ----------------------------
+class MockLLM(RuleBackend):
+    """
+    Stands in for decide_physical_with_ai(): answers each request by applying
+    the rules its instruction states to the STATE block (routing.RuleBackend),
+    so part B runs are deterministic and offline. Takes the instruction as a
+    system instruction, and counts what is sent.
+    """
+
+    def __init__(self) -> None:
+        self.calls: int = 0
+        self.prompt_chars: int = 0          # state blocks, summed over calls
+        self.instruction_chars: int = 0     # instructions, summed over calls (sent every time without caching)
+        self.instructions: Set[str] = set() # distinct instructions: what has to be registered once
+
+    def __call__(self, prompt: str, system_instruction: Optional[str] = None) -> str:
+        self.calls += 1
+        self.prompt_chars += len(prompt)
+        if system_instruction is not None:
+            self.instruction_chars += len(system_instruction)
+            self.instructions.add(system_instruction)
+        return self.answer(system_instruction or prompt, parse_state(prompt))
+
+
+def bind_mock_llm(mind: object, llm: Optional[MockLLM] = None) -> MockLLM:
+    llm = llm or MockLLM()
+    mind.decide_physical_with_ai = llm
+    return llm
+
+
+# ----------------------------
+# Simulator
+# ----------------------------
+class SimActor:
+    def __init__(self, colour: str, x: int, y: int, orientation: str, mind: object) -> None:
+        self.colour = colour
+        self.actor_id = f"{colour}-actor"
+        self.x = x
+        self.y = y
+        self.orientation = orientation
+        self.mind = mind
+        self.observation: Optional[_Observation] = None
+        self.inbox: List[_Message] = []
+
+
+class SimResult:
+    def __init__(self, n: int, cycles: int, completed: bool, dirt_left: int,
+                 terminated_cycle: Optional[int] = None, simulated: Optional[int] = None) -> None:
+        self.n = n
+        self.cycles = cycles
+        self.completed = completed
+        self.dirt_left = dirt_left
+        self.terminated_cycle = terminated_cycle    # completion cycle as reported by the agents, if they did
+        self.simulated = cycles if simulated is None else simulated
+
+    def __repr__(self) -> str:
+        return (f"SimResult(n={self.n}, cycles={self.cycles}, completed={self.completed}, dirt_left={self.dirt_left}, "
+                f"terminated_cycle={self.terminated_cycle}, simulated={self.simulated})")
+
+
+# ----------------------------
+# Observers
+# ----------------------------
+# Called with the simulator after every cycle; returning True stops the run.
+Observer = Callable[["VWSimulator"], bool]
+
+
+def termination_observer(sim: "VWSimulator") -> bool:
+    """
+    Stop once any agent has detected that the whole team is done (the
+    termination protocol in messages.py), recording the completion cycle the
+    agents report.
+    Uses nothing but the minds, so it works without access to the world.
+    """
+    for actor in sim.actors:
+        report = getattr(actor.mind, "termination_cycle", None)
+        cycle = report() if report is not None else None
+        if cycle is not None:
+            sim.terminated_cycle = cycle
+            return True
+    return False
+
+
+class VWSimulator:
+    """
+    Advances one environment cycle at a time. The task counts as complete on
+    the first cycle after which no dirt is left and the map has been broadcast.
+    """
+
+    def __init__(self, scenario: Scenario, minds: Dict[str, object], stop_on_completion: bool = True) -> None:
+        self.n = scenario.n
+        self.dirt: Dict[Coord, str] = dict(scenario.dirt)
+        self.actors: List[SimActor] = []
+        for colour in ACTOR_COLOURS:
+            x, y, orientation = scenario.actors[colour]
+            actor = SimActor(colour, x, y, orientation, minds[colour])
+            self._bind(actor)
+            self.actors.append(actor)
+
+        self.cycle: int = 0
+        self.map_broadcast: bool = False
+        self.completed_cycle: Optional[int] = None
+        # With stop_on_completion=False only observers (or max_cycles) end a run,
+        # as in an environment whose state the runner cannot inspect
+        self.stop_on_completion: bool = stop_on_completion
+        self.observers: List[Observer] = []
+        self.terminated_cycle: Optional[int] = None
+
+    # --- perception ---
+    def _bind(self, actor: SimActor) -> None:
+        mind = actor.mind
+        mind.get_own_id = lambda: actor.actor_id
+        mind.get_own_position = lambda: _Coord(actor.x, actor.y)
+        mind.get_own_orientation = lambda: VWOrientation[actor.orientation]
+        mind.get_latest_observation = lambda: actor.observation
+        mind.get_latest_received_messages = lambda: actor.inbox
+
+    def _in_bounds(self, pos: Coord) -> bool:
+        return 0 <= pos[0] < self.n and 0 <= pos[1] < self.n
+
+    def _actor_at(self, pos: Coord) -> Optional[SimActor]:
+        for actor in self.actors:
+            if (actor.x, actor.y) == pos:
+                return actor
+        return None
+
+    def _location(self, pos: Coord) -> _Optional:
+        if not self._in_bounds(pos):
+            return _EMPTY
+        actor = self._actor_at(pos)
+        actor_app = _Appearance(VWColour[actor.colour], VWOrientation[actor.orientation]) if actor else None
+        dirt_colour = self.dirt.get(pos)
+        dirt_app = _Appearance(VWColour[dirt_colour]) if dirt_colour else None
+        return _Optional(_Location(_Coord(pos[0], pos[1]), actor_app, dirt_app))
+
+    def _observe(self, actor: SimActor) -> _Observation:
+        idx = ORIENTATIONS.index(actor.orientation)
+        fx, fy = _DELTAS[actor.orientation]
+        lx, ly = _DELTAS[ORIENTATIONS[(idx - 1) % 4]]
+        rx, ry = _DELTAS[ORIENTATIONS[(idx + 1) % 4]]
+        x, y = actor.x, actor.y
+        cells = {
+            "center": self._location((x, y)),
+            "forward": self._location((x + fx, y + fy)),
+            "left": self._location((x + lx, y + ly)),
+            "right": self._location((x + rx, y + ry)),
+            "forwardleft": self._location((x + fx + lx, y + fy + ly)),
+            "forwardright": self._location((x + fx + rx, y + fy + ry)),
+        }
+        return _Observation(cells, not self._in_bounds((x + fx, y + fy)))
+
+    # --- actions ---
+    def _split_actions(self, actor: SimActor, actions: Iterable[VWAction]) -> Tuple[Optional[VWAction], Optional[VWBroadcastAction]]:
+        physical: Optional[VWAction] = None
+        communicative: Optional[VWBroadcastAction] = None
+        for action in actions:
+            if isinstance(action, VWBroadcastAction):
+                if communicative is not None:
+                    raise ValueError(f"{actor.colour}: more than one communicative action in a cycle")
+                communicative = action
+            else:
+                if physical is not None:
+                    raise ValueError(f"{actor.colour}: more than one physical action in a cycle")
+                physical = action
+        return physical, communicative
+
+    def _execute(self, actor: SimActor, action: Optional[VWAction]) -> None:
+        if action is None or isinstance(action, VWIdleAction):
+            return
+        if isinstance(action, VWTurnAction):
+            step = -1 if action.get_turning_direction() == VWDirection.left else 1
+            actor.orientation = ORIENTATIONS[(ORIENTATIONS.index(actor.orientation) + step) % 4]
+        elif isinstance(action, VWMoveAction):
+            dx, dy = _DELTAS[actor.orientation]
+            target = (actor.x + dx, actor.y + dy)
+            if self._in_bounds(target) and self._actor_at(target) is None:
+                actor.x, actor.y = target
+        elif isinstance(action, VWCleanAction):
+            pos = (actor.x, actor.y)
+            colour = self.dirt.get(pos)
+            if colour is not None and actor.colour in ("white", colour):
+                del self.dirt[pos]
+
+    def step(self) -> None:
+        for actor in self.actors:
+            actor.observation = self._observe(actor)
+
+        decisions = []
+        for actor in self.actors:
+            actor.mind.revise()
+            decisions.append((actor, self._split_actions(actor, actor.mind.decide())))
+
+        outbox: List[Tuple[SimActor, _Message]] = []
+        for actor, (physical, communicative) in decisions:
+            self._execute(actor, physical)
+            if communicative is not None:
+                content = communicative.get_message()
+                if isinstance(content, dict) and "dirt" in content:
+                    self.map_broadcast = True
+                outbox.append((actor, _Message(content, actor.actor_id)))
+
+        for actor in self.actors:
+            actor.inbox = [msg for sender, msg in outbox if sender is not actor]
+
+        self.cycle += 1
+        if self.completed_cycle is None and self.map_broadcast and not self.dirt:
+            self.completed_cycle = self.cycle
+
+    # --- checkpoint / resume ---
+    def checkpoint(self) -> Dict[str, object]:
+        """World state and every mind's CHECKPOINT_FIELDS, as one checkpoint payload."""
+        world = {
+            "n": self.n,
+            "dirt": [[x, y, colour] for (x, y), colour in self.dirt.items()],
+            "actors": {a.colour: {"x": a.x, "y": a.y, "orientation": a.orientation,
+                                  "inbox": [[checkpoint.encode(m.get_content()), m.get_sender_id()] for m in a.inbox]}
+                       for a in self.actors},
+            "cycle": self.cycle,
+            "map_broadcast": self.map_broadcast,
+            "completed_cycle": self.completed_cycle,
+        }
+        return checkpoint.checkpoint_minds({a.colour: a.mind for a in self.actors}, world=world)
+
+    def restore(self, payload: Dict[str, object]) -> None:
+        """Continue from a checkpoint() payload; the minds must be freshly constructed of the same classes."""
+        checkpoint.restore_minds({a.colour: a.mind for a in self.actors}, payload)
+        world = payload["world"]
+        if world["n"] != self.n:
+            raise checkpoint.CheckpointError(f"checkpoint is for n={world['n']}, not n={self.n}")
+        self.dirt = {(int(x), int(y)): colour for x, y, colour in world["dirt"]}
+        for actor in self.actors:
+            state = world["actors"][actor.colour]
+            actor.x, actor.y, actor.orientation = int(state["x"]), int(state["y"]), state["orientation"]
+            actor.inbox = [_Message(checkpoint.decode(content), sender) for content, sender in state["inbox"]]
+        self.cycle = int(world["cycle"])
+        self.map_broadcast = bool(world["map_broadcast"])
+        self.completed_cycle = world["completed_cycle"]
+
+    def save(self, path: str) -> int:
+        return checkpoint.write_checkpoint(path, self.checkpoint())
+
+    def load(self, path: str) -> None:
+        self.restore(checkpoint.read_checkpoint(path))
+
+    # --- running ---
+    def add_observer(self, observer: Observer) -> None:
+        self.observers.append(observer)
+
+    def run(self, max_cycles: int, quiet: bool = True, checkpoint_path: Optional[str] = None,
+            checkpoint_every: int = 0) -> SimResult:
+        """
+        Step until completion (if stop_on_completion), an observer asks to stop
+        or max_cycles. With checkpoint_path and checkpoint_every > 0, the state
+        is saved every checkpoint_every cycles.
+        """
+        if quiet:
+            with open(os.devnull, "w") as sink, redirect_stdout(sink):
+                self._run(max_cycles, checkpoint_path, checkpoint_every)
+        else:
+            self._run(max_cycles, checkpoint_path, checkpoint_every)
+        completed = self.completed_cycle is not None
+        cycles = self.completed_cycle if completed else self.cycle
+        return SimResult(self.n, cycles, completed, len(self.dirt), self.terminated_cycle, self.cycle)
+
+    def _run(self, max_cycles: int, checkpoint_path: Optional[str] = None, checkpoint_every: int = 0) -> None:
+        while self.cycle < max_cycles and not (self.stop_on_completion and self.completed_cycle is not None):
+            self.step()
+            if checkpoint_path and checkpoint_every > 0 and self.cycle % checkpoint_every == 0:
+                self.save(checkpoint_path)
+            if any(observer(self) for observer in self.observers):
+                break